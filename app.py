@@ -1,5 +1,9 @@
+import io
 import os
+import hashlib
 import sys
+import json
+from functools import partial
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
@@ -7,13 +11,29 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from dotenv import load_dotenv
 load_dotenv()
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 
+from backend.batch import iter_csv, iter_csv_rows, iter_ndjson, iter_xlsx_rows, run_batch
+from backend.jobs import TERMINAL_STAGES, JobManager
 from backend.pipeline import run_pipeline
+from backend.result_cache import RESULT_CACHE_ENABLED, cached_lookup, get_result_cache
+from backend.search_client import search_cache_stats
+from backend.search_providers import provider_stats
+from backend.extractor import llm_cache_stats
+from backend.http_transport import pool_stats
+from backend.singleflight import singleflight_stats
+from backend.metrics import collect_timings, inc, observe_span, render_prometheus, span
+from backend.admission import ADMISSION_MAX_BATCH_ROWS, AdmissionController, AdmissionRejected
+from backend.entity_index import entity_index_stats
+from backend.deadline import deadline_scope, parse_deadline, time_left
+from backend.resilience import breaker_stats
 
 app = Flask(__name__, static_folder="frontend", static_url_path="")
 CORS(app)
+jobs = JobManager()
+admission = AdmissionController()
+SSE_HEARTBEAT = 15.0
 
 
 def _use_agentic_crew():
@@ -24,6 +44,25 @@ def _groq_configured():
     return bool(os.getenv("GROQ_API_KEY", "").strip())
 
 
+def _run_lookup(company, designation, on_event=None):
+    if _use_agentic_crew():
+        try:
+            from backend.crew_pipeline import run_crew_pipeline
+            return run_crew_pipeline(company, designation, on_event=on_event)
+        except Exception as e:
+            return {
+                "first_name": "",
+                "last_name": "",
+                "current_title": designation,
+                "source_url": "",
+                "confidence_score": 0.0,
+                "sources_checked": [],
+                "found": False,
+                "error": str(e),
+            }
+    return run_pipeline(company, designation, on_event=on_event)
+
+
 @app.route("/")
 def index():
     return send_from_directory(app.static_folder, "index.html")
@@ -45,41 +84,211 @@ def search():
             "confidence_score": 0.0,
             "sources_checked": [],
         }), 400
-    if _use_agentic_crew():
-        try:
-            from backend.crew_pipeline import run_crew_pipeline
-            result = run_crew_pipeline(company, designation)
-        except Exception as e:
-            result = {
-                "first_name": "",
-                "last_name": "",
-                "current_title": designation,
-                "source_url": "",
-                "confidence_score": 0.0,
-                "sources_checked": [],
-                "found": False,
-                "error": str(e),
-            }
-    else:
-        result = run_pipeline(company, designation)
+    try:
+        with collect_timings() as timings, deadline_scope(_request_deadline(data)):
+            with span("lookup"):
+                result = _cached_run_lookup(company, designation, client=_client_id())
+    except AdmissionRejected as e:
+        return _rejected(e, designation)
+    if _wants_timings(data):
+        result["timings"] = timings.summary()
     status = 200 if result.get("found") or not result.get("error") else 404
     return jsonify(result), status
 
 
+def _wants_timings(data):
+    flag = request.args.get("timings") or data.get("timings") or ""
+    return str(flag).strip().lower() in ("1", "true", "yes")
+
+
+def _request_deadline(data):
+    return parse_deadline(request.args.get("deadline_ms") or data.get("deadline_ms"))
+
+
+def _client_id():
+    key = (request.headers.get("X-API-Key") or "").strip()
+    auth = request.headers.get("Authorization") or ""
+    if not key and auth.lower().startswith("bearer "):
+        key = auth[7:].strip()
+    if key:
+        return "key:" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return "ip:" + (request.remote_addr or "")
+
+
+def _rejected(e, designation=""):
+    inc("admission_rejected_total", status=e.status)
+    response = jsonify({
+        "found": False,
+        "error": e.reason,
+        "first_name": "",
+        "last_name": "",
+        "current_title": designation,
+        "source_url": "",
+        "confidence_score": 0.0,
+        "sources_checked": [],
+    })
+    response.status_code = e.status
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response
+
+
+def _admitted_lookup(company, designation, on_event=None, client="", bounded=True):
+    timeout = time_left(admission.queue_timeout) if bounded else None
+    with admission.slot(client, bounded, timeout) as waited:
+        observe_span("admission_wait", waited)
+        return _run_lookup(company, designation, on_event)
+
+
+def _cached_run_lookup(company, designation, on_event=None, client="", bounded=True):
+    compute = partial(_admitted_lookup, on_event=on_event, client=client, bounded=bounded)
+    result, hit = cached_lookup(company, designation, compute)
+    result["cache"] = "hit" if hit else "miss"
+    inc("lookups_total", cache=result["cache"], found="true" if result.get("found") else "false")
+    return result
+
+
+def _batch_rows():
+    upload = request.files.get("file")
+    if upload is not None:
+        if (upload.filename or "").lower().endswith((".xlsx", ".xlsm")):
+            return iter_xlsx_rows(io.BytesIO(upload.read()))
+        return iter_csv_rows(io.TextIOWrapper(upload.stream, encoding="utf-8-sig", newline=""))
+    data = request.get_json(silent=True) or {}
+    rows = data.get("rows") or []
+    return (
+        (i, str(r.get("company") or "").strip(), str(r.get("designation") or "").strip())
+        for i, r in enumerate(rows, 1)
+        if isinstance(r, dict)
+    )
+
+
+@app.route("/api/search/batch", methods=["POST"])
+def search_batch():
+    fmt = (request.args.get("format") or request.form.get("format") or "ndjson").lower()
+    client = _client_id()
+    try:
+        admission.acquire_batch(client)
+    except AdmissionRejected as e:
+        return _rejected(e)
+    try:
+        rows = _batch_rows()
+        records = run_batch(
+            rows,
+            lookup=partial(_cached_run_lookup, client=client, bounded=False),
+            max_rows=ADMISSION_MAX_BATCH_ROWS,
+        )
+        chunks = iter_csv(records) if fmt == "csv" else iter_ndjson(records)
+        first = next(chunks, "")
+    except ValueError as e:
+        admission.release_batch(client)
+        return jsonify({"error": str(e)}), 400
+    except BaseException:
+        admission.release_batch(client)
+        raise
+
+    def generate():
+        yield first
+        yield from chunks
+
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.call_on_close(partial(admission.release_batch, client))
+    return response
+
+
+@app.route("/api/jobs", methods=["POST"])
+def create_job():
+    data = request.get_json() or {}
+    company = data.get("company", "").strip()
+    designation = data.get("designation", "").strip()
+    if not company or not designation:
+        return jsonify({"error": "Missing company or designation"}), 400
+    client = _client_id()
+    try:
+        job = jobs.submit(company, designation, partial(_cached_run_lookup, client=client, bounded=False), client=client)
+    except AdmissionRejected as e:
+        return _rejected(e, designation)
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.id}",
+        "events_url": f"/api/jobs/{job.id}/events",
+    }), 202
+
+
+@app.route("/api/jobs/<job_id>")
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.snapshot())
+
+
+@app.route("/api/jobs/<job_id>/events")
+def job_events(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("after") or "0"
+    after = int(last_id) if last_id.isdigit() else 0
+
+    def generate():
+        seq = after
+        while True:
+            events = job.wait_events(seq, SSE_HEARTBEAT)
+            if not events:
+                if not job.finished:
+                    yield ": keep-alive\n\n"
+                    continue
+                # Resumed past the end: repeat the terminal event so the stream still ends on one.
+                events = job.events[-1:]
+            for event in events:
+                seq = event["seq"]
+                yield f"id: {seq}\nevent: {event['stage']}\ndata: {json.dumps(event['data'])}\n\n"
+                if event["stage"] in TERMINAL_STAGES:
+                    return
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/api/health")
 def health():
     return jsonify({
         "status": "ok",
         "groq_configured": _groq_configured(),
         "agentic_crew": _use_agentic_crew(),
+        "crew_mode": os.getenv("CREW_MODE", "full").strip().lower() if _use_agentic_crew() else None,
+        "result_cache": get_result_cache().stats() if RESULT_CACHE_ENABLED else None,
+        "search_providers": provider_stats(),
+        "search_cache": search_cache_stats(),
+        "llm_cache": llm_cache_stats(),
+        "http_pools": pool_stats(),
+        "jobs": jobs.stats(),
+        "coalesced": singleflight_stats(),
+        "admission": admission.stats(),
+        "entity_index": entity_index_stats(),
+        "breakers": breaker_stats(),
     })
 
 
+@app.route("/metrics")
+def metrics():
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     if _groq_configured():
         print("Groq API key: configured (name extraction enabled)")
     else:
         print("WARNING: GROQ_API_KEY not set in .env - name extraction will fail.")
     if _use_agentic_crew():
-        print("Bonus: Agentic CrewAI pipeline enabled (Researcher, Validator, Reporter)")
-    app.run(host="0.0.0.0", port=5000, debug=True)
+        if os.getenv("CREW_MODE", "").strip().lower() == "hybrid":
+            print("Bonus: Hybrid CrewAI mode enabled (pipeline first, Validator/Reporter review when unsure)")
+        else:
+            print("Bonus: Agentic CrewAI pipeline enabled (Researcher, Validator, Reporter)")
+    debug = os.getenv("FLASK_DEBUG", "").strip().lower() in ("1", "true", "yes")
+    app.run(host="0.0.0.0", port=5000, debug=debug, threaded=True)
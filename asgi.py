@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import hashlib
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from backend.admission import AdmissionController, AdmissionRejected
+from backend.async_pipeline import run_pipeline_async
+from backend.blocking import run_blocking
+from backend.deadline import deadline_scope, parse_deadline, time_left
+from backend.metrics import inc, observe_span
+from backend.result_cache import cached_lookup_async
+
+MAX_BODY_BYTES = 64 * 1024
+admission = AdmissionController()
+
+
+def _use_agentic_crew():
+    return os.getenv("USE_AGENTIC_CREW", "").strip().lower() in ("1", "true", "yes")
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+async def _read_json(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise _BodyTooLarge(f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        if not message.get("more_body"):
+            break
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def _send_json(send, status, payload, headers=()):
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _client_id(scope):
+    headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers") or []}
+    key = (headers.get("x-api-key") or "").strip()
+    auth = headers.get("authorization") or ""
+    if not key and auth.lower().startswith("bearer "):
+        key = auth[7:].strip()
+    if key:
+        return "key:" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return "ip:" + ((scope.get("client") or [""])[0] or "")
+
+
+async def _run_lookup(company, designation):
+    if _use_agentic_crew():
+        from backend.crew_pipeline import run_crew_pipeline
+        return await run_blocking(run_crew_pipeline, company, designation)
+    return await run_pipeline_async(company, designation)
+
+
+async def _admitted_lookup(company, designation, client=""):
+    async with admission.slot_async(client, True, time_left(admission.queue_timeout)) as waited:
+        observe_span("admission_wait", waited)
+        return await _run_lookup(company, designation)
+
+
+def _error_result(error, designation=""):
+    return {
+        "found": False,
+        "error": error,
+        "first_name": "",
+        "last_name": "",
+        "current_title": designation,
+        "source_url": "",
+        "confidence_score": 0.0,
+        "sources_checked": [],
+    }
+
+
+async def _search(scope, receive, send):
+    try:
+        data = await _read_json(receive) or {}
+    except _BodyTooLarge as e:
+        await _send_json(send, 413, _error_result(str(e)))
+        return
+    company = str(data.get("company") or "").strip()
+    designation = str(data.get("designation") or "").strip()
+    if not company or not designation:
+        await _send_json(send, 400, _error_result("Missing company or designation", designation))
+        return
+    try:
+        with deadline_scope(parse_deadline(data.get("deadline_ms"))):
+            result, hit = await cached_lookup_async(company, designation, partial(_admitted_lookup, client=_client_id(scope)))
+    except AdmissionRejected as e:
+        inc("admission_rejected_total", status=e.status)
+        await _send_json(send, e.status, _error_result(e.reason, designation), [(b"retry-after", str(e.retry_after).encode())])
+        return
+    result["cache"] = "hit" if hit else "miss"
+    status = 200 if result.get("found") or not result.get("error") else 404
+    await _send_json(send, status, result)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+    path = scope.get("path", "")
+    method = scope.get("method", "GET")
+    if path == "/api/search" and method == "POST":
+        await _search(scope, receive, send)
+    elif path == "/api/health" and method == "GET":
+        await _send_json(send, 200, {
+            "status": "ok",
+            "groq_configured": bool(os.getenv("GROQ_API_KEY", "").strip()),
+            "agentic_crew": _use_agentic_crew(),
+            "async": True,
+            "admission": admission.stats(),
+        })
+    else:
+        await _send_json(send, 404, {"error": "Not found"})
@@ -0,0 +1,250 @@
+import os
+import math
+import time
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+ADMISSION_MAX_ACTIVE = int(os.getenv("ADMISSION_MAX_ACTIVE", "4"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+ADMISSION_MAX_QUEUE_PER_CLIENT = int(os.getenv("ADMISSION_MAX_QUEUE_PER_CLIENT", "8"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "30"))
+ADMISSION_MAX_BATCHES = int(os.getenv("ADMISSION_MAX_BATCHES", "8"))
+ADMISSION_MAX_BATCHES_PER_CLIENT = int(os.getenv("ADMISSION_MAX_BATCHES_PER_CLIENT", "2"))
+ADMISSION_MAX_BATCH_ROWS = int(os.getenv("ADMISSION_MAX_BATCH_ROWS", "10000"))
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    def __init__(self, client: str, bounded: bool, future: "Optional[asyncio.Future[None]]" = None):
+        self.client = client
+        self.bounded = bounded
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdmissionController:
+    """At most max_active lookups run at once; the rest wait in per-client queues served round-robin."""
+
+    def __init__(
+        self,
+        max_active: int = ADMISSION_MAX_ACTIVE,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        max_queue_per_client: int = ADMISSION_MAX_QUEUE_PER_CLIENT,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        max_batches: int = ADMISSION_MAX_BATCHES,
+        max_batches_per_client: int = ADMISSION_MAX_BATCHES_PER_CLIENT,
+    ):
+        self.max_active = max(1, max_active)
+        self.max_queue = max(0, max_queue)
+        self.max_queue_per_client = max(1, max_queue_per_client)
+        self.queue_timeout = queue_timeout
+        self.max_batches = max(1, max_batches)
+        self.max_batches_per_client = max(1, max_batches_per_client)
+        self._batches: Dict[str, int] = {}
+        self.active = 0
+        self.admitted = 0
+        self.rejected = {429: 0, 503: 0}
+        self.timeouts = 0
+        self._queues: "OrderedDict[str, Deque[_Ticket]]" = OrderedDict()
+        self._queued = 0
+        self._bounded_queued = 0
+        self._waits: Deque[float] = deque(maxlen=500)
+        self._service: Deque[float] = deque(maxlen=100)
+        self._cond = threading.Condition()
+
+    def _retry_after(self) -> int:
+        service = sum(self._service) / len(self._service) if self._service else 5.0
+        return max(1, math.ceil(service * (self._queued + 1) / self.max_active))
+
+    def _dequeued(self, ticket: _Ticket) -> None:
+        self._queued -= 1
+        if ticket.bounded:
+            self._bounded_queued -= 1
+
+    def _grant_next(self) -> None:
+        while self.active < self.max_active and self._queues:
+            client, queue = next(iter(self._queues.items()))
+            ticket = queue.popleft()
+            self._dequeued(ticket)
+            del self._queues[client]
+            if queue:
+                self._queues[client] = queue
+            if ticket.future is not None:
+                try:
+                    ticket.future.get_loop().call_soon_threadsafe(_wake, ticket.future)
+                except RuntimeError:
+                    continue  # the waiter's event loop is gone; nobody will use this slot
+            ticket.granted = True
+            self.active += 1
+        self._cond.notify_all()
+
+    def _enqueue(self, client: str, bounded: bool, future: "Optional[asyncio.Future[None]]" = None) -> Optional[_Ticket]:
+        """Take a free slot (None) or queue a ticket for one; the caller holds _cond."""
+        if self.active < self.max_active and not self._queued:
+            self.active += 1
+            self.admitted += 1
+            self._waits.append(0.0)
+            return None
+        queue = self._queues.get(client)
+        if bounded and self._bounded_queued >= self.max_queue:
+            self.rejected[503] += 1
+            raise AdmissionRejected(503, "Server is busy, try again shortly", self._retry_after())
+        if bounded and queue is not None and len(queue) >= self.max_queue_per_client:
+            self.rejected[429] += 1
+            raise AdmissionRejected(429, "Too many queued requests for this client", self._retry_after())
+        ticket = _Ticket(client, bounded, future)
+        if queue is None:
+            queue = self._queues[client] = deque()
+        queue.append(ticket)
+        self._queued += 1
+        self._bounded_queued += bounded
+        return ticket
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        queue = self._queues[ticket.client]
+        queue.remove(ticket)
+        self._dequeued(ticket)
+        if not queue:
+            del self._queues[ticket.client]
+
+    def _timed_out(self, ticket: _Ticket) -> AdmissionRejected:
+        self._abandon(ticket)
+        self.timeouts += 1
+        self.rejected[503] += 1
+        return AdmissionRejected(503, "Timed out waiting for a free worker", self._retry_after())
+
+    def _admitted(self, ticket: _Ticket) -> float:
+        waited = time.monotonic() - ticket.enqueued_at
+        self.admitted += 1
+        self._waits.append(waited)
+        return waited
+
+    def acquire(self, client: str = "", bounded: bool = True, timeout: Optional[float] = None) -> float:
+        """Wait for a slot and return the seconds spent queued.
+
+        Bounded callers (interactive requests) are turned away with 503 when max_queue of them
+        are already waiting, 429 when their own client already has too many queued, and 503
+        after queue_timeout. Unbounded callers (batch rows, background jobs) always queue and
+        wait; they do not count towards max_queue, and round-robin keeps them from starving
+        interactive clients.
+        """
+        timeout = self.queue_timeout if timeout is None else timeout
+        with self._cond:
+            ticket = self._enqueue(client, bounded)
+            if ticket is None:
+                return 0.0
+            deadline = ticket.enqueued_at + timeout if bounded else None
+            while not ticket.granted:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise self._timed_out(ticket)
+                self._cond.wait(remaining)
+            return self._admitted(ticket)
+
+    async def acquire_async(self, client: str = "", bounded: bool = True, timeout: Optional[float] = None) -> float:
+        """acquire() for the event loop: queued callers wait on a future, not on a thread."""
+        timeout = self.queue_timeout if timeout is None else timeout
+        with self._cond:
+            ticket = self._enqueue(client, bounded, asyncio.get_running_loop().create_future())
+        if ticket is None:
+            return 0.0
+        try:
+            if bounded:
+                await asyncio.wait_for(ticket.future, max(0.0, ticket.enqueued_at + timeout - time.monotonic()))
+            else:
+                await ticket.future
+        except asyncio.TimeoutError:
+            with self._cond:
+                if not ticket.granted:
+                    raise self._timed_out(ticket)
+        except asyncio.CancelledError:
+            with self._cond:
+                if ticket.granted:
+                    self.active -= 1
+                    self._grant_next()
+                else:
+                    self._abandon(ticket)
+            raise
+        with self._cond:
+            return self._admitted(ticket)
+
+    def release(self, service_seconds: Optional[float] = None) -> None:
+        with self._cond:
+            self.active -= 1
+            if service_seconds is not None:
+                self._service.append(service_seconds)
+            self._grant_next()
+
+    @contextmanager
+    def slot(self, client: str = "", bounded: bool = True, timeout: Optional[float] = None) -> Iterator[float]:
+        waited = self.acquire(client, bounded, timeout)
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(time.monotonic() - started)
+
+    @asynccontextmanager
+    async def slot_async(self, client: str = "", bounded: bool = True, timeout: Optional[float] = None) -> AsyncIterator[float]:
+        waited = await self.acquire_async(client, bounded, timeout)
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(time.monotonic() - started)
+
+    def acquire_batch(self, client: str = "") -> None:
+        """Reserve one of the streams a client may run batches on: 429 past max_batches_per_client,
+        503 once max_batches are running in total. Rows inside a batch then queue as unbounded callers."""
+        with self._cond:
+            if sum(self._batches.values()) >= self.max_batches:
+                self.rejected[503] += 1
+                raise AdmissionRejected(503, "Too many batches running, try again shortly", self._retry_after())
+            if self._batches.get(client, 0) >= self.max_batches_per_client:
+                self.rejected[429] += 1
+                raise AdmissionRejected(429, "Too many batches running for this client", self._retry_after())
+            self._batches[client] = self._batches.get(client, 0) + 1
+
+    def release_batch(self, client: str = "") -> None:
+        with self._cond:
+            left = self._batches.get(client, 0) - 1
+            if left > 0:
+                self._batches[client] = left
+            else:
+                self._batches.pop(client, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            waits = sorted(self._waits)
+            return {
+                "active": self.active,
+                "max_active": self.max_active,
+                "queued": self._queued,
+                "max_queue": self.max_queue,
+                "clients_waiting": len(self._queues),
+                "batches": sum(self._batches.values()),
+                "admitted": self.admitted,
+                "rejected": {str(k): v for k, v in self.rejected.items()},
+                "timeouts": self.timeouts,
+                "wait_ms": {
+                    "avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+                    "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+                    "max": round(waits[-1] * 1000, 1) if waits else 0.0,
+                },
+            }
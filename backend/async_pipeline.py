@@ -0,0 +1,161 @@
+import os
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+from backend.query_builder import iter_query_tiers
+from backend.search_client import recording_search_failures
+from backend.search_providers import search_multiple_queries_async
+from backend.extractor import extract_from_page_async, extract_from_snippets_async
+from backend.deadline import Deadline, current_deadline, deadline_expired, deadline_scope, stage_budget, time_left
+from backend.dedup import DedupIndex
+from backend.metrics import span
+from backend.pipeline import (
+    EXTRACTION_WORKERS,
+    EventCallback,
+    build_result,
+    emit_event,
+    empty_result,
+    has_enough_extractions,
+    local_extractions,
+    next_query_tier,
+    no_results_error,
+    page_urls,
+    rank_candidates,
+    should_escalate,
+    snippet_batches,
+    unique_results,
+)
+
+logger = logging.getLogger(__name__)
+
+SEARCH_STAGE_TIMEOUT = float(os.getenv("SEARCH_STAGE_TIMEOUT", "15"))
+SNIPPET_STAGE_TIMEOUT = float(os.getenv("SNIPPET_STAGE_TIMEOUT", "20"))
+PAGE_STAGE_TIMEOUT = float(os.getenv("PAGE_STAGE_TIMEOUT", "20"))
+
+ExtractionBatch = List[Tuple[str, Optional[Dict[str, Any]]]]
+
+
+async def _snippet_task(company: str, designation: str, items: List[Dict[str, Any]]) -> ExtractionBatch:
+    urls = [(item.get("href") or "").strip() for item in items]
+    return list(zip(urls, await extract_from_snippets_async(company, designation, items)))
+
+
+async def _page_task(company: str, designation: str, url: str, slots: asyncio.Semaphore, dedup: DedupIndex) -> ExtractionBatch:
+    async with slots:
+        return [(url, await extract_from_page_async(company, designation, url, dedup=dedup))]
+
+
+async def _extract_in_order(
+    stage: str,
+    tasks: List[Awaitable[ExtractionBatch]],
+    extractions: List[Dict[str, Any]],
+    sources_checked: List[str],
+    timeout: float,
+    on_event: Optional[EventCallback] = None,
+) -> bool:
+    """Collect extractions in task order; True if the stage ran out of time."""
+    timeout = time_left(timeout)
+    futures = [asyncio.ensure_future(t) for t in tasks]
+
+    async def consume() -> None:
+        for future in futures:
+            for url, out in await future:
+                sources_checked.append(url)
+                if out:
+                    extractions.append(out)
+                    emit_event(on_event, "extraction", out)
+                    if has_enough_extractions(extractions):
+                        return
+
+    try:
+        if futures and not has_enough_extractions(extractions):
+            await asyncio.wait_for(consume(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("%s extraction stage timed out after %.1fs", stage, timeout)
+        return True
+    finally:
+        for future in futures:
+            if not future.done():
+                future.cancel()
+    return False
+
+
+async def run_pipeline_async(
+    company: str,
+    designation: str,
+    on_event: Optional[EventCallback] = None,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
+    with deadline_scope(deadline or current_deadline()), recording_search_failures() as failed_searches:
+        return await _run_pipeline_async(company, designation, on_event, failed_searches)
+
+
+async def _run_pipeline_async(
+    company: str,
+    designation: str,
+    on_event: Optional[EventCallback],
+    failed_searches: List[str],
+) -> Dict[str, Any]:
+    company = (company or "").strip()
+    designation = (designation or "").strip()
+    if not company or not designation:
+        return empty_result(designation, "Company and designation are required")
+    try:
+        results: List[Dict[str, Any]] = []
+        extractions: List[Dict[str, Any]] = []
+        sources_checked: List[str] = []
+        candidates: List[Dict[str, Any]] = []
+        dedup = DedupIndex()
+        built_queries = False
+        timed_out = False
+        tiers = iter_query_tiers(company, designation)
+        while not built_queries or should_escalate(extractions):
+            if deadline_expired():
+                timed_out = True
+                break
+            next_tier = next_query_tier(tiers)
+            if next_tier is None:
+                break
+            tier, queries = next_tier
+            built_queries = True
+            emit_event(on_event, "queries", {"queries": queries, "tier": tier})
+            with stage_budget("search"):
+                timeout = time_left(SEARCH_STAGE_TIMEOUT)
+                try:
+                    found = await asyncio.wait_for(search_multiple_queries_async(queries), timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("Search stage timed out after %.1fs", timeout)
+                    found = []
+                    failed_searches.extend(queries)
+                    timed_out = timed_out or deadline_expired()
+            new_items = unique_results(found, dedup, tier, on_event)
+            results.extend(new_items)
+            emit_event(on_event, "search_results", {"count": len(results), "tier": tier})
+            if not new_items:
+                continue
+            if not extractions:
+                local = local_extractions(company, designation, results, on_event)
+                if local:
+                    return build_result(designation, *local, timed_out)
+            kept = rank_candidates(company, designation, new_items, tier, on_event)
+            candidates.extend(kept)
+            snippet_tasks = [_snippet_task(company, designation, batch) for batch in snippet_batches(kept)]
+            with span("snippet_extraction"), stage_budget("snippet_extraction"):
+                cut = await _extract_in_order("Snippet", snippet_tasks, extractions, sources_checked, SNIPPET_STAGE_TIMEOUT, on_event)
+                timed_out = timed_out or (cut and deadline_expired())
+        if not built_queries and not timed_out:
+            return empty_result(designation, "Could not build search queries")
+        if not results and not timed_out:
+            return empty_result(designation, no_results_error(failed_searches))
+        slots = asyncio.Semaphore(EXTRACTION_WORKERS)
+        page_tasks = [_page_task(company, designation, url, slots, dedup) for url in page_urls(candidates, extractions, sources_checked)]
+        with span("page_extraction"), stage_budget("page_extraction"):
+            cut = await _extract_in_order("Page", page_tasks, extractions, sources_checked, PAGE_STAGE_TIMEOUT, on_event)
+            timed_out = timed_out or (cut and deadline_expired())
+        if timed_out:
+            emit_event(on_event, "deadline", {"extractions": len(extractions)})
+        return build_result(designation, extractions, sources_checked, timed_out)
+    except Exception as e:
+        logger.exception("Async pipeline error")
+        return empty_result(designation, str(e))
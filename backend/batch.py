@@ -0,0 +1,233 @@
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from backend.result_cache import cached_lookup, is_definitive, lookup_key
+
+logger = logging.getLogger(__name__)
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+COMPANY_COLUMNS = ("company", "company name", "company_name", "organization", "organisation")
+DESIGNATION_COLUMNS = ("designation", "title", "job title", "job_title", "role", "position")
+OUTPUT_FIELDS = [
+    "row",
+    "company",
+    "designation",
+    "first_name",
+    "last_name",
+    "current_title",
+    "source_url",
+    "confidence_score",
+    "found",
+    "error",
+    "cache",
+]
+
+Row = Tuple[int, str, str]
+
+
+def _find_column(header: List[str], candidates: Tuple[str, ...]) -> int:
+    normalized = [(h or "").strip().lower() for h in header]
+    for name in candidates:
+        if name in normalized:
+            return normalized.index(name)
+    raise ValueError(f"Input needs one of these columns: {', '.join(candidates)}")
+
+
+def _iter_table(table: Iterable[Iterable[Any]]) -> Iterator[Row]:
+    header = None
+    for row_no, values in enumerate(table, 1):
+        values = ["" if v is None else str(v) for v in values]
+        if header is None:
+            if not any(v.strip() for v in values):
+                continue
+            header = values
+            company_idx = _find_column(header, COMPANY_COLUMNS)
+            designation_idx = _find_column(header, DESIGNATION_COLUMNS)
+            continue
+        company = values[company_idx].strip() if company_idx < len(values) else ""
+        designation = values[designation_idx].strip() if designation_idx < len(values) else ""
+        if company or designation:
+            yield row_no, company, designation
+
+
+def iter_csv_rows(fp: TextIO) -> Iterator[Row]:
+    return _iter_table(csv.reader(fp))
+
+
+def iter_xlsx_rows(fp) -> Iterator[Row]:
+    from openpyxl import load_workbook
+    workbook = load_workbook(fp, read_only=True, data_only=True)
+    try:
+        yield from _iter_table(workbook.active.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def iter_input_rows(path: str) -> Iterator[Row]:
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        yield from iter_xlsx_rows(path)
+        return
+    with open(path, newline="", encoding="utf-8-sig") as fp:
+        yield from iter_csv_rows(fp)
+
+
+def load_checkpoint(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    done: Dict[str, Dict[str, Any]] = {}
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as fp:
+        for line in fp:
+            try:
+                entry = json.loads(line)
+                if is_definitive(entry["result"]):
+                    done[entry["key"]] = entry["result"]
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+    return done
+
+
+def default_lookup(company: str, designation: str) -> Dict[str, Any]:
+    from backend.pipeline import run_pipeline
+    result, hit = cached_lookup(company, designation, run_pipeline)
+    result["cache"] = "hit" if hit else "miss"
+    return result
+
+
+def _record(row: Row, result: Dict[str, Any]) -> Dict[str, Any]:
+    row_no, company, designation = row
+    record = {"row": row_no, "company": company, "designation": designation}
+    record.update(result)
+    return record
+
+
+def _error_result(designation: str, error: str) -> Dict[str, Any]:
+    return {
+        "first_name": "",
+        "last_name": "",
+        "current_title": designation,
+        "source_url": "",
+        "confidence_score": 0.0,
+        "sources_checked": [],
+        "found": False,
+        "error": error,
+    }
+
+
+def run_batch(
+    rows: Iterable[Row],
+    lookup: Callable[[str, str], Dict[str, Any]] = default_lookup,
+    workers: int = BATCH_WORKERS,
+    checkpoint_path: Optional[str] = None,
+    max_rows: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    done = load_checkpoint(checkpoint_path)
+    checkpoint = open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    inflight: Dict[str, Future] = {}
+    waiting: Dict[Future, Tuple[str, List[Row]]] = {}
+
+    def finish(future: Future) -> Iterator[Dict[str, Any]]:
+        key, attached = waiting.pop(future)
+        inflight.pop(key, None)
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.exception("Batch lookup failed")
+            result = _error_result(attached[0][2], str(e))
+        else:
+            # Partial and transient results are left out so a resumed run looks them up again.
+            if is_definitive(result):
+                done[key] = result
+                if checkpoint is not None:
+                    checkpoint.write(json.dumps({"key": key, "result": result}) + "\n")
+                    checkpoint.flush()
+        for row in attached:
+            yield _record(row, result)
+
+    def drain(limit: int) -> Iterator[Dict[str, Any]]:
+        while len(waiting) > limit:
+            finished, _ = wait(list(waiting), return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield from finish(future)
+
+    try:
+        for n, row in enumerate(rows):
+            _, company, designation = row
+            if max_rows is not None and n >= max_rows:
+                yield from drain(0)
+                yield _record(row, _error_result(designation, f"Batch limit of {max_rows} rows reached; remaining rows were not processed"))
+                return
+            if not company or not designation:
+                yield _record(row, _error_result(designation, "Missing company or designation"))
+                continue
+            key = lookup_key(company, designation)
+            if key in done:
+                yield _record(row, dict(done[key], cache="checkpoint"))
+                continue
+            future = inflight.get(key)
+            if future is not None:
+                waiting[future][1].append(row)
+                continue
+            future = executor.submit(lookup, company, designation)
+            inflight[key] = future
+            waiting[future] = (key, [row])
+            yield from drain(max(1, workers) * 2)
+        yield from drain(0)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if checkpoint is not None:
+            checkpoint.close()
+
+
+def iter_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+
+def iter_csv(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.getvalue():
+        yield buf.getvalue()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run person lookups for every row of a CSV or XLSX file.")
+    parser.add_argument("input", help="CSV or XLSX file with company and designation/title columns")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("-w", "--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint when --output is set)")
+    args = parser.parse_args(argv)
+    checkpoint_path = args.checkpoint or (f"{args.output}.checkpoint" if args.output else None)
+    records = run_batch(iter_input_rows(args.input), workers=args.workers, checkpoint_path=checkpoint_path)
+    chunks = iter_csv(records) if args.format == "csv" else iter_ndjson(records)
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
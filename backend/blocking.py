@@ -0,0 +1,34 @@
+import os
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+ASYNC_BLOCKING_WORKERS = int(os.getenv("ASYNC_BLOCKING_WORKERS", "64"))
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, ASYNC_BLOCKING_WORKERS), thread_name_prefix="async-blocking")
+        return _executor
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """asyncio.to_thread on a pool sized for the async server instead of the loop's small default one.
+
+    SQLite cache reads/writes and DuckDuckGo searches go through here, so
+    ASYNC_BLOCKING_WORKERS bounds how many of them can be in flight while lookups are awaiting.
+    Context variables (deadline, timings) are carried into the worker like to_thread does.
+    """
+    ctx = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_blocking_executor(), partial(ctx.run, fn, *args, **kwargs))
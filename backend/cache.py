@@ -0,0 +1,80 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from backend.metrics import inc
+
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(Path(__file__).resolve().parent.parent / ".cache")))
+
+
+class SQLiteCache:
+    def __init__(self, path: str, table: str = "cache", max_entries: int = 10000):
+        self.path = str(path)
+        self.table = table
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_access ON {table} (last_access)")
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.misses += 1
+                inc("cache_requests_total", cache=self.table, result="miss")
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        inc("cache_requests_total", cache=self.table, result="hit")
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        now = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, now + ttl, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "max_entries": self.max_entries}
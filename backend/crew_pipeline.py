@@ -1,7 +1,13 @@
+import os
 import json
 import re
+import queue
 import logging
-from typing import Dict, Any
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import partial
+from typing import Dict, Any, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -10,10 +16,36 @@ try:
 except ImportError:
     Agent = Task = Crew = Process = LLM = None
 
-from backend.crew_tools import PersonSearchTool, ExtractNameFromTextTool
+from backend.crew_tools import PersonSearchTool, ExtractNameFromTextTool, reporting_tool_events
+from backend.deadline import DEADLINE_ERROR, PARTIAL_CONFIDENCE_FACTOR, DeadlineExceeded, deadline_expired, time_left
+from backend.metrics import inc, span
+from backend.pipeline import EventCallback, emit_event, normalize_name, run_pipeline
 
+CREW_MODEL = "groq/llama-3.3-70b-versatile"
+CREW_MODE = os.getenv("CREW_MODE", "full").strip().lower()
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "").strip().lower() in ("1", "true", "yes")
+CREW_POOL_SIZE = int(os.getenv("CREW_POOL_SIZE", "4"))
+CREW_POOL_TIMEOUT = float(os.getenv("CREW_POOL_TIMEOUT", "30"))
+CREW_BUSY_ERROR = "All agent crews are busy, try again shortly"
+HYBRID_CONFIDENCE = float(os.getenv("HYBRID_CONFIDENCE", "0.8"))
 
-def _make_crew(company: str, designation: str):
+_AgentSet = namedtuple("_AgentSet", "researcher validator reporter")
+_agent_pool: "queue.LifoQueue[_AgentSet]" = queue.LifoQueue()
+_agents_created = 0
+_agents_lock = threading.Lock()
+_llm = None
+_llm_lock = threading.Lock()
+
+
+def _shared_llm():
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = LLM(model=CREW_MODEL, temperature=0.2)
+        return _llm
+
+
+def _build_agents() -> _AgentSet:
     if not all([Agent, Task, Crew, Process, LLM]):
         raise RuntimeError("CrewAI not installed. pip install crewai")
     tools = []
@@ -21,14 +53,14 @@ def _make_crew(company: str, designation: str):
         tools.append(PersonSearchTool())
     if ExtractNameFromTextTool is not None:
         tools.append(ExtractNameFromTextTool())
-    llm = LLM(model="groq/llama-3.3-70b-versatile", temperature=0.2)
+    llm = _shared_llm()
     researcher = Agent(
         role="Researcher",
         goal="Find the full name of the person who holds a specific role at a given company by searching the web and extracting names from search results.",
         backstory="You are an expert at gathering information from public sources. You use search to find relevant pages, then extract the person's name from snippets. If the first search returns weak or irrelevant results, you refine the query (e.g. add 'LinkedIn' or rephrase) and search again.",
         llm=llm,
         tools=tools,
-        verbose=True,
+        verbose=CREW_VERBOSE,
         allow_delegation=False,
     )
     validator = Agent(
@@ -36,7 +68,7 @@ def _make_crew(company: str, designation: str):
         goal="Cross-validate the extracted name across multiple sources and assign a confidence score (0.0 to 1.0).",
         backstory="You receive the Researcher's findings: multiple sources with candidate names. You determine which name appears in more than one source, pick the most credible source, and assign high confidence when multiple sources agree, lower when only one source.",
         llm=llm,
-        verbose=True,
+        verbose=CREW_VERBOSE,
         allow_delegation=False,
     )
     reporter = Agent(
@@ -44,33 +76,68 @@ def _make_crew(company: str, designation: str):
         goal="Produce the final structured result as a single JSON object.",
         backstory="You turn the Validator's conclusion into a strict JSON object with keys: first_name, last_name, current_title, source_url, confidence_score. No extra text, only valid JSON.",
         llm=llm,
-        verbose=True,
+        verbose=CREW_VERBOSE,
         allow_delegation=False,
     )
-    research_task = Task(
-        description=f"""Search for the person who holds the role "{designation}" at the company "{company}".
-Use the person_search tool with company="{company}" and designation="{designation}".
-For each search result (title, URL, snippet), use extract_name_from_text to get the person's name from that snippet.
-If the first search gives few or irrelevant results, use person_search again with refined_query set to something like "{company} {designation} LinkedIn" or "{company} CEO name".
-Produce a clear summary: for each source URL, list the name extracted (or NONE). Example format:
-- Source: [URL1] -> Name: John Doe
-- Source: [URL2] -> Name: John Doe
-- Source: [URL3] -> Name: NONE
-List all sources you checked and the name (or NONE) for each.""",
-        expected_output="A summary listing each source URL and the full name extracted from that source (or NONE). If you refined the query and searched again, mention that.",
-        agent=researcher,
-    )
-    validation_task = Task(
-        description="""You receive the Researcher's summary: multiple sources with extracted names.
+    return _AgentSet(researcher, validator, reporter)
+
+
+class CrewBusy(Exception):
+    pass
+
+
+@contextmanager
+def _checkout_agents() -> Iterator[_AgentSet]:
+    """Borrow a prebuilt agent set; at most CREW_POOL_SIZE sets exist and each serves one crew at a time.
+
+    Waits up to CREW_POOL_TIMEOUT (or the request deadline) for a set to come back, then raises
+    CrewBusy, or DeadlineExceeded when the deadline is what ran out."""
+    global _agents_created
+    try:
+        agents = _agent_pool.get_nowait()
+    except queue.Empty:
+        agents = None
+    if agents is None:
+        with _agents_lock:
+            build = _agents_created < max(1, CREW_POOL_SIZE)
+            if build:
+                _agents_created += 1
+        if build:
+            try:
+                with span("crew_setup"):
+                    agents = _build_agents()
+            except Exception:
+                with _agents_lock:
+                    _agents_created -= 1
+                raise
+        else:
+            try:
+                agents = _agent_pool.get(timeout=max(0.0, time_left(CREW_POOL_TIMEOUT)))
+            except queue.Empty:
+                if deadline_expired():
+                    raise DeadlineExceeded("no time left waiting for an agent crew") from None
+                raise CrewBusy(CREW_BUSY_ERROR) from None
+    try:
+        yield agents
+    finally:
+        _agent_pool.put(agents)
+
+
+def _validation_task(agents: _AgentSet, evidence: str = "", context=None):
+    return Task(
+        description=(evidence + "\n\n" if evidence else "") + """You receive the Researcher's summary: multiple sources with extracted names.
 Decide which person name is correct (the one that appears in multiple sources, or the one from the most credible source if only one).
 Assign a confidence_score between 0.0 and 1.0: use 0.7-0.95 when the same name appears in 2+ sources, 0.5-0.6 when only one source.
 Pick one source_url as the primary source (prefer linkedin.com, wikipedia.org, company official sites, then news).
 Output: the chosen first_name, last_name, source_url, and confidence_score.""",
         expected_output="The verified first name, last name, primary source URL, and confidence score (0.0-1.0). Short paragraph or bullet points.",
-        agent=validator,
-        context=[research_task],
+        agent=agents.validator,
+        context=context or [],
     )
-    reporting_task = Task(
+
+
+def _reporting_task(agents: _AgentSet, designation: str, validation_task):
+    return Task(
         description="""Turn the Validator's output into a single JSON object. Use exactly these keys:
 - first_name (string)
 - last_name (string)
@@ -80,14 +147,54 @@ Output: the chosen first_name, last_name, source_url, and confidence_score.""",
 If no person was found, use first_name: "", last_name: "", confidence_score: 0.
 Output ONLY the JSON object, no markdown code block, no explanation.""",
         expected_output="A single line or block of valid JSON with keys first_name, last_name, current_title, source_url, confidence_score.",
-        agent=reporter,
+        agent=agents.reporter,
         context=[validation_task],
     )
+
+
+def _task_done(on_event: Optional[EventCallback], output) -> None:
+    emit_event(on_event, "crew_task", {
+        "agent": str(getattr(output, "agent", "") or ""),
+        "summary": str(getattr(output, "summary", "") or "")[:200],
+    })
+
+
+def _make_crew(company: str, designation: str, agents: _AgentSet, on_event: Optional[EventCallback] = None):
+    research_task = Task(
+        description=f"""Search for the person who holds the role "{designation}" at the company "{company}".
+Use the person_search tool with company="{company}" and designation="{designation}".
+For the search results (title, URL, snippet), use extract_name_from_text to get the person's name from each snippet. Pass all snippets in one call using the sources argument (a list of {{"text": ..., "source_url": ...}}) instead of calling the tool once per snippet.
+If the first search gives few or irrelevant results, use person_search again with refined_query set to something like "{company} {designation} LinkedIn" or "{company} CEO name".
+Produce a clear summary: for each source URL, list the name extracted (or NONE). Example format:
+- Source: [URL1] -> Name: John Doe
+- Source: [URL2] -> Name: John Doe
+- Source: [URL3] -> Name: NONE
+List all sources you checked and the name (or NONE) for each.""",
+        expected_output="A summary listing each source URL and the full name extracted from that source (or NONE). If you refined the query and searched again, mention that.",
+        agent=agents.researcher,
+    )
+    validation_task = _validation_task(agents, context=[research_task])
+    reporting_task = _reporting_task(agents, designation, validation_task)
     return Crew(
-        agents=[researcher, validator, reporter],
+        agents=[agents.researcher, agents.validator, agents.reporter],
         tasks=[research_task, validation_task, reporting_task],
         process=Process.sequential,
-        verbose=True,
+        verbose=CREW_VERBOSE,
+        task_callback=partial(_task_done, on_event),
+    )
+
+
+def _make_review_crew(company: str, designation: str, evidence: List[Dict[str, Any]], agents: _AgentSet):
+    lines = [f"- Source: [{e.get('source_url', '')}] -> Name: {e.get('first_name', '')} {e.get('last_name', '')}".rstrip() for e in evidence]
+    summary = f"""Researcher's summary for the role "{designation}" at the company "{company}":
+""" + "\n".join(lines)
+    validation_task = _validation_task(agents, evidence=summary)
+    reporting_task = _reporting_task(agents, designation, validation_task)
+    return Crew(
+        agents=[agents.validator, agents.reporter],
+        tasks=[validation_task, reporting_task],
+        process=Process.sequential,
+        verbose=CREW_VERBOSE,
     )
 
 
@@ -147,7 +254,72 @@ def _parse_reporter_output(text: str, designation: str) -> Dict[str, Any]:
         return empty
 
 
-def run_crew_pipeline(company: str, designation: str) -> Dict[str, Any]:
+def _record_crew_usage(result) -> None:
+    usage = getattr(result, "token_usage", None)
+    if usage is None:
+        return
+    inc("llm_calls_total", getattr(usage, "successful_requests", 0) or 0, kind="crew")
+    inc("llm_tokens_total", getattr(usage, "prompt_tokens", 0) or 0, type="prompt")
+    inc("llm_tokens_total", getattr(usage, "completion_tokens", 0) or 0, type="completion")
+
+
+def _kickoff(crew, designation: str) -> Dict[str, Any]:
+    with span("crew"):
+        result = crew.kickoff()
+    _record_crew_usage(result)
+    output = str(result)
+    if hasattr(result, "raw") and result.raw:
+        output = str(result.raw)
+    if hasattr(result, "tasks_output") and result.tasks_output:
+        last_out = result.tasks_output[-1]
+        output = last_out if isinstance(last_out, str) else str(last_out)
+    parsed = _parse_reporter_output(output, designation)
+    if not parsed.get("sources_checked"):
+        parsed["sources_checked"] = []
+    return parsed
+
+
+def _needs_review(result: Dict[str, Any], evidence: List[Dict[str, Any]]) -> bool:
+    names = {normalize_name(e.get("first_name", ""), e.get("last_name", "")) for e in evidence} - {""}
+    return len(names) > 1 or float(result.get("confidence_score") or 0) < HYBRID_CONFIDENCE
+
+
+def run_hybrid_pipeline(company: str, designation: str, on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
+    """Deterministic pipeline first; the Validator/Reporter agents only review disagreeing or weak evidence."""
+    evidence: List[Dict[str, Any]] = []
+
+    def collect(stage: str, data: Dict[str, Any]) -> None:
+        if stage == "extraction":
+            evidence.append(data)
+        emit_event(on_event, stage, data)
+
+    result = run_pipeline(company, designation, on_event=collect)
+    if not evidence or not _needs_review(result, evidence):
+        return result
+    emit_event(on_event, "review", {"sources": len(evidence)})
+    try:
+        with _checkout_agents() as agents:
+            reviewed = _kickoff(_make_review_crew(company, designation, evidence, agents), designation)
+    except Exception:
+        logger.exception("Crew review failed; keeping the pipeline result")
+        return result
+    names = {normalize_name(e.get("first_name", ""), e.get("last_name", "")) for e in evidence}
+    if not reviewed.get("found") or normalize_name(reviewed["first_name"], reviewed["last_name"]) not in names:
+        return result
+    reviewed["sources_checked"] = result.get("sources_checked", [])
+    if result.get("partial"):
+        # The agents only saw what the deadline-limited run collected; keep that visible.
+        reviewed["confidence_score"] = round(float(reviewed.get("confidence_score") or 0.0) * PARTIAL_CONFIDENCE_FACTOR, 2)
+        reviewed["partial"] = True
+    return reviewed
+
+
+def run_crew_pipeline(
+    company: str,
+    designation: str,
+    on_event: Optional[EventCallback] = None,
+    mode: Optional[str] = None,
+) -> Dict[str, Any]:
     company = (company or "").strip()
     designation = (designation or "").strip()
     empty_result = {
@@ -163,19 +335,19 @@ def run_crew_pipeline(company: str, designation: str) -> Dict[str, Any]:
     if not company or not designation:
         empty_result["error"] = "Company and designation are required"
         return empty_result
+    if (mode or CREW_MODE) == "hybrid":
+        return run_hybrid_pipeline(company, designation, on_event)
     try:
-        crew = _make_crew(company, designation)
-        result = crew.kickoff()
-        output = str(result)
-        if hasattr(result, "raw") and result.raw:
-            output = str(result.raw)
-        if hasattr(result, "tasks_output") and result.tasks_output:
-            last_out = result.tasks_output[-1]
-            output = last_out if isinstance(last_out, str) else str(last_out)
-        parsed = _parse_reporter_output(output, designation)
-        if not parsed.get("sources_checked"):
-            parsed["sources_checked"] = []
-        return parsed
+        with _checkout_agents() as agents, reporting_tool_events(on_event):
+            return _kickoff(_make_crew(company, designation, agents, on_event), designation)
+    except DeadlineExceeded:
+        empty_result["error"] = DEADLINE_ERROR
+        empty_result["partial"] = True
+        return empty_result
+    except CrewBusy as e:
+        logger.warning("Crew pipeline: %s", e)
+        empty_result["error"] = str(e)
+        return empty_result
     except Exception as e:
         logger.exception("Crew pipeline error")
         empty_result["error"] = str(e)
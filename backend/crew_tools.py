@@ -1,18 +1,44 @@
-from typing import Type, Optional
+import contextvars
+from contextlib import contextmanager
+from typing import Type, Optional, List, Dict, Any, Callable, Iterator
 
 from pydantic import BaseModel, Field
 
+_on_event: contextvars.ContextVar[Optional[Callable[[str, Dict[str, Any]], None]]] = contextvars.ContextVar("crew_tool_events", default=None)
+
+
+@contextmanager
+def reporting_tool_events(on_event: Optional[Callable[[str, Dict[str, Any]], None]]) -> Iterator[None]:
+    """Send the tools' queries, search results and extracted names to on_event while the crew runs."""
+    token = _on_event.set(on_event)
+    try:
+        yield
+    finally:
+        _on_event.reset(token)
+
+
+def _report(stage: str, data: Dict[str, Any]) -> None:
+    from backend.pipeline import emit_event
+    emit_event(_on_event.get(), stage, data)
+
+
+def _report_name(name, source_url: str) -> None:
+    if name:
+        _report("extraction", {"first_name": name[0], "last_name": name[1] or "", "source_url": source_url, "from_snippet": True})
+
 
 def _search_impl(company: str, designation: str, refined_query: Optional[str] = None) -> str:
     from backend.query_builder import build_queries
-    from backend.search_client import search_multiple_queries
+    from backend.search_providers import search_multiple_queries
     if refined_query and refined_query.strip():
         queries = [refined_query.strip()]
     else:
         queries = build_queries(company, designation)
     if not queries:
         return "Error: Could not build search queries."
+    _report("queries", {"queries": queries, "tier": 0})
     results = search_multiple_queries(queries)
+    _report("search_results", {"count": len(results), "tier": 0})
     if not results:
         return "No search results found. Try a refined query or different terms."
     lines = []
@@ -29,11 +55,28 @@ def _extract_impl(company: str, designation: str, text: str, source_url: str = "
     if not text or len(text.strip()) < 10:
         return "NONE"
     result = extract_name_with_groq(company, designation, text, source_hint=source_url)
+    _report_name(result, source_url)
     if result:
         return f"{result[0]} {result[1]}".strip()
     return "NONE"
 
 
+def _extract_batch_impl(company: str, designation: str, sources: List[Dict[str, Any]]) -> str:
+    from backend.extractor import extract_names_batch
+    items = []
+    for s in sources:
+        items.append(((s.get("text") or "").strip(), (s.get("source_url") or "").strip()))
+    if not items:
+        return "NONE"
+    names = extract_names_batch(company, designation, items)
+    lines = []
+    for (_, url), name in zip(items, names):
+        _report_name(name, url)
+        label = f"{name[0]} {name[1]}".strip() if name else "NONE"
+        lines.append(f"- Source: [{url or 'unknown'}] -> Name: {label}")
+    return "\n".join(lines)
+
+
 try:
     from crewai.tools import BaseTool
     _HAS_CREWAI = True
@@ -57,18 +100,26 @@ if _HAS_CREWAI:
         def _run(self, company: str, designation: str, refined_query: Optional[str] = None) -> str:
             return _search_impl(company, designation, refined_query)
 
+    class SourceTextInput(BaseModel):
+        text: str = Field(..., description="Snippet text that may mention the person")
+        source_url: str = Field(default="", description="URL of the source")
+
     class ExtractNameInput(BaseModel):
         company: str = Field(..., description="Company name")
         designation: str = Field(..., description="Role or title")
-        text: str = Field(..., description="Snippet or page text that may mention the person")
+        text: str = Field(default="", description="Snippet or page text that may mention the person")
         source_url: str = Field(default="", description="URL of the source")
+        sources: Optional[List[SourceTextInput]] = Field(default=None, description="Several snippets to extract from in one call, each with text and source_url")
 
     class ExtractNameFromTextTool(BaseTool):
         name: str = "extract_name_from_text"
-        description: str = "Extract the full name (first and last) of the person in the given role at the company from the text. Returns 'FirstName LastName' or 'NONE'."
+        description: str = "Extract the full name (first and last) of the person in the given role at the company from the text. Returns 'FirstName LastName' or 'NONE'. Pass several snippets at once in sources to get one '- Source: [URL] -> Name: ...' line per snippet."
         args_schema: Type[BaseModel] = ExtractNameInput
 
-        def _run(self, company: str, designation: str, text: str, source_url: str = "") -> str:
+        def _run(self, company: str, designation: str, text: str = "", source_url: str = "", sources: Optional[List[Any]] = None) -> str:
+            if sources:
+                items = [s if isinstance(s, dict) else s.model_dump() for s in sources]
+                return _extract_batch_impl(company, designation, items)
             return _extract_impl(company, designation, text, source_url)
 
 else:
@@ -0,0 +1,98 @@
+import os
+import math
+import time
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+REQUEST_DEADLINE_MS = float(os.getenv("REQUEST_DEADLINE_MS", "0"))
+MAX_DEADLINE_MS = float(os.getenv("MAX_DEADLINE_MS", "120000"))
+PARTIAL_CONFIDENCE_FACTOR = float(os.getenv("PARTIAL_CONFIDENCE_FACTOR", "0.7"))
+DEADLINE_ERROR = "Deadline exceeded before a name was found"
+
+# Share of the time still left that each stage may use; later stages get what earlier ones leave.
+STAGE_BUDGETS: Dict[str, float] = {
+    "search": 0.5,
+    "snippet_extraction": 0.8,
+    "page_extraction": 1.0,
+}
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    def __init__(self, seconds: float, expires_at: Optional[float] = None):
+        self.expires_at = time.monotonic() + seconds if expires_at is None else expires_at
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def child(self, share: float) -> "Deadline":
+        """A deadline for one stage: share of the remaining time, never past this one."""
+        return Deadline(0.0, time.monotonic() + self.remaining() * max(0.0, min(1.0, share)))
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage_budget(stage: str) -> Iterator[Optional[Deadline]]:
+    """Narrow the current deadline to the stage's share for the duration of the block."""
+    deadline = _current.get()
+    if deadline is None:
+        yield None
+        return
+    with deadline_scope(deadline.child(STAGE_BUDGETS.get(stage, 1.0))) as budget:
+        yield budget
+
+
+def time_left(default: Optional[float] = None) -> Optional[float]:
+    """Seconds until the current deadline, capped at default; default itself when there is none."""
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    left = deadline.remaining()
+    return left if default is None else min(default, left)
+
+
+def deadline_expired() -> bool:
+    deadline = _current.get()
+    return deadline is not None and deadline.expired
+
+
+def check_deadline() -> None:
+    if deadline_expired():
+        raise DeadlineExceeded("request deadline exceeded")
+
+
+def parse_deadline(value: Any) -> Optional[Deadline]:
+    """Deadline from a client-supplied budget in milliseconds, else REQUEST_DEADLINE_MS (0 = none)."""
+    try:
+        ms = float(value) if value not in (None, "") else REQUEST_DEADLINE_MS
+    except (TypeError, ValueError):
+        ms = REQUEST_DEADLINE_MS
+    if not math.isfinite(ms):
+        # NaN never compares as expired and inf is no budget at all; treat both as unparseable.
+        ms = REQUEST_DEADLINE_MS
+    if ms <= 0:
+        return None
+    return Deadline(min(ms, MAX_DEADLINE_MS) / 1000.0)
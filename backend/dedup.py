@@ -0,0 +1,175 @@
+import os
+import re
+import hashlib
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+DEDUP_MAX_DISTANCE = int(os.getenv("DEDUP_MAX_DISTANCE", "3"))
+DEDUP_MIN_TOKENS = int(os.getenv("DEDUP_MIN_TOKENS", "8"))
+DEDUP_SNIPPET_SIMILARITY = float(os.getenv("DEDUP_SNIPPET_SIMILARITY", "0.8"))
+SHINGLE_SIZE = 3
+
+TRACKING_PARAM_RE = re.compile(
+    r"^(?:utm_\w+|gclid|dclid|fbclid|msclkid|yclid|mc_cid|mc_eid|_hs\w+|ref|ref_src|src|trk|trkinfo|"
+    r"originalsubdomain|amp|outputtype|share|cmpid|icid|igshid)$",
+    re.I,
+)
+_HOST_PREFIX_RE = re.compile(r"^(?:www\d*|m|mobile|amp)\.")
+_COUNTRY_HOST_RE = re.compile(r"^[a-z]{2}\.(linkedin\.com)$")
+_AMP_PATH_RE = re.compile(r"(?:/amp|\.amp)/?$", re.I)
+_GOOGLE_AMP_RE = re.compile(r"^/amp/s/(.+)$")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def canonical_url(url: str) -> str:
+    """Scheme-less URL key that ignores www./m./amp. hosts, AMP paths, tracking params and fragments."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url if "//" in url else f"//{url}")
+    host = (parts.hostname or "").lower()
+    path = parts.path or "/"
+    if host.endswith(".cdn.ampproject.org") or (host.endswith("google.com") and _GOOGLE_AMP_RE.match(path)):
+        inner = _GOOGLE_AMP_RE.match(path) or re.match(r"^/[a-z]/(?:s/)?(.+)$", path)
+        if inner:
+            return canonical_url(inner.group(1))
+    host = _HOST_PREFIX_RE.sub("", host)
+    host = _COUNTRY_HOST_RE.sub(r"\1", host)
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = _AMP_PATH_RE.sub("", re.sub(r"/{2,}", "/", path)).rstrip("/") or "/"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAM_RE.match(k))
+    return f"{host}{path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").casefold())
+
+
+def shingles(tokens: List[str]) -> List[str]:
+    if len(tokens) <= SHINGLE_SIZE:
+        return [" ".join(tokens)] if tokens else []
+    return [" ".join(tokens[i : i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+
+
+def simhash(text: str, tokens: Optional[List[str]] = None) -> int:
+    """64-bit SimHash over word shingles; near-identical texts differ in only a few bits."""
+    weights = [0] * 64
+    for feature in shingles(_tokens(text) if tokens is None else tokens):
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def containment(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Share of the smaller shingle set found in the other; a mirror with extra boilerplate still scores ~1."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def _result_text(item: Dict[str, Any]) -> str:
+    return f"{item.get('title') or ''}\n{item.get('body') or ''}"
+
+
+class DedupIndex:
+    """Sources seen during one lookup, keyed by canonical URL and by content fingerprint.
+
+    Texts shorter than min_tokens only collapse on an exact token match. Pages collapse when
+    their SimHash is within max_distance bits of an earlier page. Snippets are too short for
+    SimHash to tell a mirrored press release from two bios that differ only in the name, so they
+    are compared by shingle-set containment instead (there are only a few dozen per lookup).
+    """
+
+    def __init__(
+        self,
+        max_distance: int = DEDUP_MAX_DISTANCE,
+        min_tokens: int = DEDUP_MIN_TOKENS,
+        snippet_similarity: float = DEDUP_SNIPPET_SIMILARITY,
+    ):
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.snippet_similarity = snippet_similarity
+        self.duplicates: Dict[str, str] = {}
+        self._urls: Dict[str, str] = {}
+        self._exact: Dict[Tuple[str, str], str] = {}
+        self._pages: List[Tuple[int, str]] = []
+        self._snippets: List[Tuple[FrozenSet[str], str]] = []
+        self._lock = threading.Lock()
+
+    def _url_duplicate(self, url: str) -> Optional[str]:
+        key = canonical_url(url) if DEDUP_ENABLED else url
+        primary = self._urls.get(key)
+        if primary is None:
+            self._urls[key] = url
+        return primary
+
+    def _text_duplicate(self, url: str, text: str, kind: str) -> Optional[str]:
+        tokens = _tokens(text)
+        if not tokens:
+            return None
+        exact_key = (kind, hashlib.blake2b(" ".join(tokens).encode("utf-8"), digest_size=16).hexdigest())
+        primary = self._exact.get(exact_key)
+        if primary is not None:
+            return primary
+        if len(tokens) >= self.min_tokens:
+            primary = self._near_duplicate(url, tokens, kind)
+            if primary is not None:
+                return primary
+        self._exact[exact_key] = url
+        return None
+
+    def _near_duplicate(self, url: str, tokens: List[str], kind: str) -> Optional[str]:
+        if kind == "snippet":
+            shingle_set = frozenset(shingles(tokens))
+            for other, other_url in self._snippets:
+                if containment(shingle_set, other) >= self.snippet_similarity:
+                    return other_url
+            self._snippets.append((shingle_set, url))
+            return None
+        fingerprint = simhash("", tokens)
+        for other, other_url in self._pages:
+            if hamming(fingerprint, other) <= self.max_distance:
+                return other_url
+        self._pages.append((fingerprint, url))
+        return None
+
+    def _record(self, url: str, primary: Optional[str]) -> Optional[str]:
+        if primary is not None and primary != url:
+            self.duplicates[url] = primary
+        return primary
+
+    def seen_text(self, url: str, text: str, kind: str = "page") -> Optional[str]:
+        """Register the content fetched for url and return the earlier source it duplicates, if any."""
+        if not DEDUP_ENABLED:
+            return None
+        with self._lock:
+            return self._record(url, self._text_duplicate(url, text, kind))
+
+    def filter_results(self, results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Return (unique, dropped): results whose URL or snippet was not seen before, and how many
+        new mirrors were collapsed. Sources already seen in an earlier call are skipped without being counted."""
+        unique = []
+        dropped = 0
+        with self._lock:
+            for item in results:
+                url = (item.get("href") or "").strip()
+                if not url:
+                    continue
+                primary = self._url_duplicate(url)
+                if primary is not None:
+                    dropped += primary != url and url not in self.duplicates
+                    self._record(url, primary)
+                    continue
+                if DEDUP_ENABLED and self._record(url, self._text_duplicate(url, _result_text(item), "snippet")):
+                    dropped += 1
+                    continue
+                unique.append(item)
+        return unique, dropped
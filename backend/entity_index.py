@@ -0,0 +1,330 @@
+import os
+import sys
+import json
+import math
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from backend.cache import CACHE_DIR
+from backend.metrics import inc
+from backend.query_builder import normalize_company, normalize_designation
+
+logger = logging.getLogger(__name__)
+
+ENTITY_INDEX_ENABLED = os.getenv("ENTITY_INDEX_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+ENTITY_INDEX_PATH = os.getenv("ENTITY_INDEX_PATH", str(CACHE_DIR / "entities.sqlite3"))
+ENTITY_MATCH_THRESHOLD = float(os.getenv("ENTITY_MATCH_THRESHOLD", "0.8"))
+ENTITY_MIN_CONFIDENCE = float(os.getenv("ENTITY_MIN_CONFIDENCE", "0.6"))
+ENTITY_TTL = float(os.getenv("ENTITY_TTL", str(30 * 24 * 3600)))
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "llc", "llp", "lp",
+    "plc", "gmbh", "ag", "sa", "sas", "nv", "bv", "pty", "srl", "spa", "oy", "ab", "kk", "pte", "pvt",
+}
+RECORD_FIELDS = ("first_name", "last_name", "source_url", "confidence_score")
+
+
+def canonical_company(company: str) -> str:
+    tokens = normalize_company(company).split()
+    if tokens and tokens[0] == "the" and len(tokens) > 1:
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def canonical_role(designation: str) -> str:
+    return " ".join(normalize_designation(designation).casefold().split())
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    padded = f"  {key} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class EntityIndex:
+    """Resolved (company, role) -> person records with exact, alias and trigram (Dice) company matching."""
+
+    def __init__(self, path: str = ENTITY_INDEX_PATH, threshold: float = ENTITY_MATCH_THRESHOLD, ttl: float = ENTITY_TTL):
+        self.path = str(path)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._companies: List[str] = []
+        self._names: List[str] = []
+        self._grams: List[FrozenSet[str]] = []
+        self._sizes: List[int] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._records: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entities ("
+            "company_key TEXT NOT NULL, role_key TEXT NOT NULL, company TEXT NOT NULL, designation TEXT NOT NULL, "
+            "record TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (company_key, role_key))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS entity_aliases (alias_key TEXT PRIMARY KEY, company_key TEXT NOT NULL)")
+        self._load()
+
+    def _load(self) -> None:
+        rows = self._conn.execute("SELECT company_key, role_key, company, designation, record, updated_at FROM entities")
+        for company_key, role_key, company, designation, record, updated_at in rows:
+            self._put(company_key, company, role_key, self._entry(company, designation, json.loads(record), updated_at))
+        for alias_key, company_key in self._conn.execute("SELECT alias_key, company_key FROM entity_aliases"):
+            if company_key in self._ids:
+                self._ids.setdefault(alias_key, self._ids[company_key])
+
+    def _company_id(self, company_key: str, company: str) -> int:
+        cid = self._ids.get(company_key)
+        if cid is not None:
+            return cid
+        cid = len(self._companies)
+        grams = trigrams(company_key)
+        self._companies.append(company_key)
+        self._names.append(company)
+        self._grams.append(grams)
+        self._sizes.append(len(grams))
+        self._ids[company_key] = cid
+        return cid
+
+    def _put(self, company_key: str, company: str, role_key: str, entry: Dict[str, Any]) -> None:
+        cid = self._company_id(company_key, company)
+        if (cid, role_key) not in self._records:
+            postings = self._postings.setdefault(role_key, {})
+            for gram in self._grams[cid]:
+                postings.setdefault(gram, []).append(cid)
+        self._records[(cid, role_key)] = entry
+
+    @staticmethod
+    def _entry(company: str, designation: str, result: Dict[str, Any], updated_at: float) -> Dict[str, Any]:
+        entry = {k: result.get(k, "") for k in RECORD_FIELDS}
+        entry.update(company=company, designation=designation, updated_at=updated_at)
+        return entry
+
+    def add(self, company: str, designation: str, result: Dict[str, Any], updated_at: Optional[float] = None) -> bool:
+        company_key, role_key = canonical_company(company), canonical_role(designation)
+        if not company_key or not role_key or not (result.get("first_name") or result.get("last_name")):
+            return False
+        entry = self._entry(company.strip(), designation.strip(), result, time.time() if updated_at is None else updated_at)
+        with self._lock:
+            self._put(company_key, entry["company"], role_key, entry)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entities (company_key, role_key, company, designation, record, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (company_key, role_key, entry["company"], entry["designation"], json.dumps({k: entry[k] for k in RECORD_FIELDS}), entry["updated_at"]),
+            )
+        return True
+
+    def add_alias(self, alias: str, company: str) -> bool:
+        alias_key, company_key = canonical_company(alias), canonical_company(company)
+        with self._lock:
+            if not alias_key or company_key not in self._ids:
+                return False
+            self._ids[alias_key] = self._ids[company_key]
+            self._conn.execute("INSERT OR REPLACE INTO entity_aliases (alias_key, company_key) VALUES (?, ?)", (alias_key, company_key))
+        return True
+
+    def _candidates(self, grams: FrozenSet[str], role_key: str) -> Set[int]:
+        # Postings are kept per role, so only companies with a record for this role are considered.
+        # Prefix filter: any company with Dice >= threshold shares at least min_overlap trigrams with
+        # the query, so it must appear in one of the (len(grams) - min_overlap + 1) rarest postings.
+        postings = self._postings.get(role_key, {})
+        t = self.threshold
+        min_overlap = max(1, math.ceil(t / (2 - t) * len(grams)))
+        rare = sorted(grams, key=lambda g: len(postings.get(g, ())))
+        found: Set[int] = set()
+        for gram in rare[: len(grams) - min_overlap + 1]:
+            found.update(postings.get(gram, ()))
+        return found
+
+    def _match(self, key: str, role_key: str) -> Optional[Tuple[int, float]]:
+        cid = self._ids.get(key)
+        if cid is not None and (cid, role_key) in self._records:
+            return cid, 1.0
+        grams = trigrams(key)
+        n = len(grams)
+        min_len, max_len = n * self.threshold / (2 - self.threshold), n * (2 - self.threshold) / self.threshold
+        best: Optional[Tuple[int, float]] = None
+        sizes = self._sizes
+        for cid in self._candidates(grams, role_key):
+            size = sizes[cid]
+            if not min_len <= size <= max_len:
+                continue
+            score = 2 * len(grams & self._grams[cid]) / (n + size)
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (cid, score)
+        return best
+
+    def lookup(self, company: str, designation: str) -> Optional[Dict[str, Any]]:
+        key, role_key = canonical_company(company), canonical_role(designation)
+        if not key or not role_key:
+            return None
+        with self._lock:
+            match = self._match(key, role_key)
+            entry = self._records.get((match[0], role_key)) if match else None
+            if entry is not None and self.ttl > 0 and time.time() - entry["updated_at"] > self.ttl:
+                entry = None
+            if entry is None:
+                self.misses += 1
+                inc("entity_index_requests_total", result="miss")
+                return None
+            self.hits += 1
+            if match[1] < 1.0:
+                self.fuzzy_hits += 1
+            entry = dict(entry)
+        inc("entity_index_requests_total", result="exact" if match[1] >= 1.0 else "fuzzy")
+        return {
+            "first_name": entry["first_name"],
+            "last_name": entry["last_name"],
+            "current_title": designation,
+            "source_url": entry["source_url"],
+            "confidence_score": round(float(entry["confidence_score"] or 0) * match[1], 2),
+            "sources_checked": [entry["source_url"]] if entry["source_url"] else [],
+            "found": True,
+            "error": None,
+            "matched_company": entry["company"],
+            "match_score": round(match[1], 3),
+        }
+
+    _STATE = ("_companies", "_names", "_grams", "_sizes", "_ids", "_postings", "_records")
+
+    def _copy_state(self) -> Tuple[Any, ...]:
+        postings = {role: {gram: list(cids) for gram, cids in grams.items()} for role, grams in self._postings.items()}
+        return (
+            list(self._companies), list(self._names), list(self._grams), list(self._sizes),
+            dict(self._ids), postings, dict(self._records),
+        )
+
+    def _set_state(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self._STATE, state):
+            setattr(self, name, value)
+
+    def import_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Add records (and their aliases) in one transaction; on failure neither SQLite nor memory changes."""
+        count = 0
+        with self._lock:
+            # The import runs against copies of the in-memory index; they are kept only if the commit succeeds.
+            committed = tuple(getattr(self, name) for name in self._STATE)
+            self._set_state(self._copy_state())
+            self._conn.execute("BEGIN")
+            try:
+                for record in records:
+                    company = str(record.get("company") or "")
+                    if self.add(company, str(record.get("designation") or ""), record, record.get("updated_at")):
+                        count += 1
+                    for alias in record.get("aliases") or []:
+                        self.add_alias(str(alias), company)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._set_state(committed)
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+        return count
+
+    def export_records(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            aliases: Dict[int, List[str]] = {}
+            for alias_key, cid in self._ids.items():
+                if alias_key != self._companies[cid]:
+                    aliases.setdefault(cid, []).append(alias_key)
+            entries = [(cid, dict(entry)) for (cid, _), entry in self._records.items()]
+        for cid, entry in entries:
+            if aliases.get(cid):
+                entry["aliases"] = sorted(aliases[cid])
+            yield entry
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "companies": len(self._companies),
+                "records": len(self._records),
+                "hits": self.hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.misses,
+            }
+
+
+_index: Optional[EntityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_entity_index() -> EntityIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = EntityIndex()
+        return _index
+
+
+def remember(company: str, designation: str, result: Dict[str, Any]) -> None:
+    if not ENTITY_INDEX_ENABLED or not result.get("found") or result.get("matched_company") or result.get("partial"):
+        return
+    if float(result.get("confidence_score") or 0) < ENTITY_MIN_CONFIDENCE:
+        return
+    try:
+        get_entity_index().add(company, designation, result)
+    except Exception as e:
+        logger.warning("Entity index write failed: %s", e)
+
+
+def resolve(company: str, designation: str) -> Optional[Dict[str, Any]]:
+    if not ENTITY_INDEX_ENABLED:
+        return None
+    try:
+        return get_entity_index().lookup(company, designation)
+    except Exception as e:
+        logger.warning("Entity index read failed: %s", e)
+        return None
+
+
+def entity_index_stats() -> Optional[Dict[str, Any]]:
+    if not ENTITY_INDEX_ENABLED:
+        return None
+    return get_entity_index().stats()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import, export or query the company/role entity index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Load JSONL records (company, designation, first_name, last_name, ... , aliases)")
+    imp.add_argument("input")
+    exp = sub.add_parser("export", help="Write all records as JSONL")
+    exp.add_argument("-o", "--output", help="Output file (default: stdout)")
+    find = sub.add_parser("lookup", help="Resolve one company/designation pair")
+    find.add_argument("company")
+    find.add_argument("designation")
+    args = parser.parse_args(argv)
+
+    index = get_entity_index()
+    if args.command == "import":
+        with open(args.input, encoding="utf-8") as fp:
+            records = (json.loads(line) for line in fp if line.strip())
+            print(f"Imported {index.import_records(records)} records")
+    elif args.command == "export":
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            for record in index.export_records():
+                out.write(json.dumps(record) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    else:
+        print(json.dumps(index.lookup(args.company, args.designation), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
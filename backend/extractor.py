@@ -1,44 +1,404 @@
 import os
 import re
+import json
+import hashlib
 import logging
-from typing import Optional, Tuple, Dict, Any
+import time
+import codecs
+import threading
+from html.parser import HTMLParser
+from typing import Optional, Tuple, Dict, Any, List
+from urllib.parse import urlparse
 
-import requests
 from bs4 import BeautifulSoup
 
+from backend.blocking import run_blocking
+from backend.cache import CACHE_DIR, SQLiteCache
+from backend.deadline import DeadlineExceeded, check_deadline, deadline_expired, time_left
+from backend.dedup import DedupIndex
+from backend.http_transport import (
+    async_http_timeout,
+    get_async_groq_client,
+    get_async_http_client,
+    get_groq_client,
+    host_slot_async,
+    http_get,
+    http_stream,
+)
+from backend.metrics import inc, observe_span, span
+from backend.rate_limiter import get_rate_limiter
+from backend.resilience import CircuitOpen, get_breaker, get_host_breaker, guarded
+from backend.singleflight import get_singleflight
+from backend.text_compaction import compact_text
+
 logger = logging.getLogger(__name__)
 
-REQUEST_TIMEOUT = 10
 REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; rv:91.0) Gecko/20100101 Firefox/91.0",
     "Accept": "text/html,application/xhtml+xml",
     "Accept-Language": "en-US,en;q=0.5",
 }
 
+PAGE_STREAMING = os.getenv("PAGE_STREAMING", "1").strip().lower() in ("1", "true", "yes")
+MAX_PAGE_BYTES = int(os.getenv("MAX_PAGE_BYTES", str(1_500_000)))
+MAX_PAGE_DECLARED_BYTES = int(os.getenv("MAX_PAGE_DECLARED_BYTES", str(10_000_000)))
+STREAM_CHUNK_BYTES = 16384
+PAGE_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+SKIPPED_PAGE_TAGS = ("script", "style", "nav", "footer", "header")
+
 GROQ_BASE_URL = "https://api.groq.com/openai/v1"
 GROQ_MODEL = "llama-3.3-70b-versatile"
+SYSTEM_PROMPT = "You extract person names. Reply only with 'FirstName LastName' or 'NONE'."
+BATCH_SYSTEM_PROMPT = "You extract person names. Reply only with numbered lines of the form '[n] FirstName LastName' or '[n] NONE'."
+BATCH_MAX_ITEMS = 8
+BATCH_ITEM_CHARS = 600
 
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(CACHE_DIR / "llm.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
 
-def fetch_page_text(url: str, max_chars: int = 12000) -> str:
-    try:
-        r = requests.get(url, headers=REQUEST_HEADERS, timeout=REQUEST_TIMEOUT)
+_llm_cache: Optional[SQLiteCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+class _VisibleTextParser(HTMLParser):
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self._skip_depth = 0
+        self._parts: List[str] = []
+        self._length = 0
+
+    @property
+    def done(self) -> bool:
+        return self._length >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_PAGE_TAGS:
+            self._skip_depth += 1
+        if not self.done:
+            self._parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_PAGE_TAGS and self._skip_depth > 0:
+            self._skip_depth -= 1
+        if not self.done:
+            self._parts.append(" ")
+
+    def handle_data(self, data):
+        # A text run split across fed chunks arrives in pieces; tags, not pieces, separate words.
+        if self._skip_depth or self.done:
+            return
+        self._parts.append(data)
+        stripped = data.strip()
+        if stripped:
+            self._length += len(stripped) + 1
+
+    def text(self) -> str:
+        return re.sub(r"\s+", " ", "".join(self._parts)).strip()[: self.max_chars]
+
+
+def _response_charset(content_type: str) -> str:
+    m = re.search(r"charset=([\w\-]+)", content_type)
+    if m:
+        try:
+            return codecs.lookup(m.group(1)).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def _page_response_ok(url: str, headers) -> bool:
+    content_type = (headers.get("Content-Type") or "").lower()
+    if content_type and not any(t in content_type for t in PAGE_CONTENT_TYPES):
+        logger.info("Skipping %s: unsupported content type %s", url, content_type)
+        return False
+    declared = (headers.get("Content-Length") or "").strip()
+    if declared.isdigit() and int(declared) > MAX_PAGE_DECLARED_BYTES:
+        logger.info("Skipping %s: declared size %s bytes", url, declared)
+        return False
+    return True
+
+
+def _page_decoder(headers):
+    charset = _response_charset((headers.get("Content-Type") or "").lower())
+    return codecs.getincrementaldecoder(charset)(errors="replace")
+
+
+def _fetch_page_text_streaming(url: str, max_chars: int) -> str:
+    with http_stream(url, headers=REQUEST_HEADERS) as r:
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        for tag in soup(["script", "style", "nav", "footer", "header"]):
-            tag.decompose()
-        text = soup.get_text(separator=" ", strip=True)
-        text = re.sub(r"\s+", " ", text)
+        if not _page_response_ok(url, r.headers):
+            return ""
+        decoder = _page_decoder(r.headers)
+        parser = _VisibleTextParser(max_chars)
+        received = 0
+        parse_seconds = 0.0
+        for chunk in r.iter_content(STREAM_CHUNK_BYTES):
+            received += len(chunk)
+            started = time.perf_counter()
+            parser.feed(decoder.decode(chunk))
+            parse_seconds += time.perf_counter() - started
+            if parser.done or received >= MAX_PAGE_BYTES or deadline_expired():
+                break
+        else:
+            parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+        inc("fetch_bytes_total", received)
+        observe_span("html_parse", parse_seconds)
+        return parser.text()
+
+
+def fetch_page_text(url: str, max_chars: int = 12000, stream: Optional[bool] = None) -> str:
+    stream = PAGE_STREAMING if stream is None else stream
+    try:
+        text, _ = get_singleflight("page").do((url, max_chars, stream), lambda: _fetch_page_text(url, max_chars, stream))
+    except DeadlineExceeded:
+        return ""
+    return text
+
+
+def _fetch_page_text(url: str, max_chars: int, stream: bool) -> str:
+    host = urlparse(url).netloc.lower()
+    try:
+        check_deadline()
+        limiter = get_rate_limiter("page", host)
+        with guarded(get_host_breaker(host), limiter):
+            with span("rate_limit_wait", provider="page"):
+                if not limiter.acquire(timeout=time_left()):
+                    raise DeadlineExceeded("no time left to fetch the page")
+            with span("page_fetch"):
+                if stream:
+                    return _fetch_page_text_streaming(url, max_chars)
+                r = http_get(url, headers=REQUEST_HEADERS)
+                r.raise_for_status()
+        inc("fetch_bytes_total", len(r.content))
+        with span("html_parse"):
+            soup = BeautifulSoup(r.text, "html.parser")
+            for tag in soup(list(SKIPPED_PAGE_TAGS)):
+                tag.decompose()
+            text = soup.get_text(separator=" ", strip=True)
+            text = re.sub(r"\s+", " ", text)
         return text[:max_chars] if text else ""
+    except (CircuitOpen, DeadlineExceeded) as e:
+        logger.info("Skipping %s: %s", url, e)
+        return ""
     except Exception as e:
         logger.warning("Fetch failed for %s: %s", url, e)
         return ""
 
 
+_BATCH_LINE_RE = re.compile(r"^\s*\[?(\d+)\]?\s*(?:->|[.):\-])?\s*(.*)$")
+
+
+def _get_llm_cache() -> SQLiteCache:
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = SQLiteCache(LLM_CACHE_PATH, table="llm_responses", max_entries=LLM_CACHE_MAX_ENTRIES)
+        return _llm_cache
+
+
+def _llm_cache_key(company: str, designation: str, text: str) -> str:
+    payload = json.dumps([GROQ_MODEL, SYSTEM_PROMPT, _single_prompt(company, designation, ""), text.strip()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _batch_cache_key(company: str, designation: str, text: str) -> str:
+    """Key for one item's answer from a batch call; kept apart from single-prompt answers."""
+    payload = json.dumps(["batch", GROQ_MODEL, BATCH_SYSTEM_PROMPT, _batch_prompt(company, designation, 0), text.strip()[:BATCH_ITEM_CHARS]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _llm_cache_get(key: str) -> Optional[str]:
+    try:
+        return _get_llm_cache().get(key)
+    except Exception as e:
+        logger.warning("LLM cache read failed: %s", e)
+        return None
+
+
+def _llm_cache_set(key: str, content: str) -> None:
+    try:
+        _get_llm_cache().set(key, content, LLM_CACHE_TTL)
+    except Exception as e:
+        logger.warning("LLM cache write failed: %s", e)
+
+
+def llm_cache_stats() -> Optional[Dict[str, Any]]:
+    if not LLM_CACHE_ENABLED:
+        return None
+    return _get_llm_cache().stats()
+
+
+def _single_prompt(company: str, designation: str, source_hint: str) -> str:
+    return f"""You are given text that may mention a person who holds a specific role at a company.
+Company: {company}
+Role/Designation: {designation}
+Source context: {source_hint or "web search result"}
+
+Extract the full name of the person who holds this role at this company. Reply with exactly two words: first name and last name, separated by a space. If you cannot find a clear full name, reply with: NONE"""
+
+
+def _batch_prompt(company: str, designation: str, count: int) -> str:
+    return f"""You are given {count} numbered texts, each from a different source, that may mention a person who holds a specific role at a company.
+Company: {company}
+Role/Designation: {designation}
+
+For each text, extract the full name of the person who holds this role at this company, using only that text. Reply with exactly one line per text, in order, formatted as "[n] FirstName LastName". If a text has no clear full name, reply "[n] NONE" for it. Do not add any other text."""
+
+
+def _record_usage(response, kind: str) -> None:
+    inc("llm_calls_total", kind=kind)
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        inc("llm_tokens_total", getattr(usage, "prompt_tokens", 0) or 0, type="prompt")
+        inc("llm_tokens_total", getattr(usage, "completion_tokens", 0) or 0, type="completion")
+
+
+def _within_deadline(client):
+    """Bound the request (and skip client retries) when the caller has a deadline."""
+    left = time_left()
+    if left is None:
+        return client
+    if left <= 0:
+        raise DeadlineExceeded("no time left for the LLM call")
+    return client.with_options(timeout=left, max_retries=0)
+
+
+def llm_available() -> bool:
+    return get_breaker("groq").available
+
+
+def _chat(messages, max_tokens: int, kind: str = "single") -> str:
+    check_deadline()
+    limiter = get_rate_limiter("groq")
+    with guarded(get_breaker("groq"), limiter):
+        with span("rate_limit_wait", provider="groq"):
+            if not limiter.acquire(timeout=time_left()):
+                raise DeadlineExceeded("no time left for the LLM call")
+        with span("llm", kind=kind):
+            client = _within_deadline(get_groq_client(os.getenv("GROQ_API_KEY"), GROQ_BASE_URL))
+            response = client.chat.completions.create(
+                model=GROQ_MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0,
+            )
+    _record_usage(response, kind)
+    return (response.choices[0].message.content or "").strip()
+
+
+async def _chat_async(messages, max_tokens: int, kind: str = "single") -> str:
+    check_deadline()
+    limiter = get_rate_limiter("groq")
+    with guarded(get_breaker("groq"), limiter):
+        with span("rate_limit_wait", provider="groq"):
+            if not await limiter.acquire_async(timeout=time_left()):
+                raise DeadlineExceeded("no time left for the LLM call")
+        with span("llm", kind=kind):
+            client = _within_deadline(get_async_groq_client(os.getenv("GROQ_API_KEY"), GROQ_BASE_URL))
+            response = await client.chat.completions.create(
+                model=GROQ_MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0,
+            )
+    _record_usage(response, kind)
+    return (response.choices[0].message.content or "").strip()
+
+
+def _parse_name(content: str) -> Optional[Tuple[str, str]]:
+    content = (content or "").strip().strip("\"'`*").strip()
+    parts = content.split()
+    if not parts or parts[0].upper().rstrip(".") == "NONE":
+        return None
+    if len(parts) >= 2:
+        return (parts[0], " ".join(parts[1:]))
+    if len(parts) == 1 and len(parts[0]) > 1:
+        return (parts[0], "")
+    return None
+
+
+def _parse_batch_response(content: str, n: int) -> Dict[int, Optional[Tuple[str, str]]]:
+    answers: Dict[int, Optional[Tuple[str, str]]] = {}
+    for line in (content or "").splitlines():
+        m = _BATCH_LINE_RE.match(line)
+        if not m:
+            continue
+        idx = int(m.group(1))
+        if idx < 1 or idx > n or idx in answers:
+            continue
+        answer = m.group(2)
+        if "->" in answer:
+            answer = answer.rsplit("->", 1)[1]
+        answer = answer.strip()
+        if answer.lower().startswith("name:"):
+            answer = answer[5:]
+        answers[idx] = _parse_name(answer)
+    return answers
+
+
+def _single_messages(company: str, designation: str, text: str, source_hint: str) -> List[Dict[str, str]]:
+    prompt = _single_prompt(company, designation, source_hint)
+    user_content = f"Text to analyze:\n\n{text[:8000]}"
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt + "\n\n" + user_content},
+    ]
+
+
+def _batch_messages(company: str, designation: str, chunk: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+    blocks = []
+    for n, (text, source) in enumerate(chunk, 1):
+        blocks.append(f"[{n}] Source: {source or 'web search result'}\n{text.strip()[:BATCH_ITEM_CHARS]}")
+    prompt = _batch_prompt(company, designation, len(chunk))
+    return [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt + "\n\n" + "\n\n".join(blocks)},
+    ]
+
+
+def _single_cache_key(company: str, designation: str, text: str, use_cache: bool) -> Optional[str]:
+    if not use_cache or not LLM_CACHE_ENABLED:
+        return None
+    return _llm_cache_key(company, designation, text[:8000])
+
+
+def _batch_pending(
+    company: str,
+    designation: str,
+    items: List[Tuple[str, str]],
+    results: List[Optional[Tuple[str, str]]],
+    use_cache: bool,
+) -> Tuple[List[int], Dict[int, str]]:
+    pending = [i for i, (text, _) in enumerate(items) if text and len(text.strip()) >= 20]
+    cache_keys: Dict[int, str] = {}
+    if not use_cache:
+        return pending, cache_keys
+    misses = []
+    for i in pending:
+        cache_keys[i] = _batch_cache_key(company, designation, items[i][0])
+        cached = _llm_cache_get(cache_keys[i])
+        if cached is None:
+            misses.append(i)
+        else:
+            results[i] = _parse_name(cached)
+    return misses, cache_keys
+
+
+def _store_batch_answer(cache_keys: Dict[int, str], i: int, name: Optional[Tuple[str, str]]) -> None:
+    if i in cache_keys:
+        _llm_cache_set(cache_keys[i], f"{name[0]} {name[1]}".strip() if name else "NONE")
+
+
 def extract_name_with_groq(
     company: str,
     designation: str,
     text: str,
     source_hint: str = "",
+    use_cache: bool = True,
 ) -> Optional[Tuple[str, str]]:
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
@@ -46,37 +406,56 @@ def extract_name_with_groq(
         return None
     if not text or len(text.strip()) < 20:
         return None
-    prompt = f"""You are given text that may mention a person who holds a specific role at a company.
-Company: {company}
-Role/Designation: {designation}
-Source context: {source_hint or "web search result"}
-
-Extract the full name of the person who holds this role at this company. Reply with exactly two words: first name and last name, separated by a space. If you cannot find a clear full name, reply with: NONE"""
-    user_content = f"Text to analyze:\n\n{text[:8000]}"
+    text = compact_text(text, company, designation)
+    cache_key = _single_cache_key(company, designation, text, use_cache)
+    if cache_key:
+        cached = _llm_cache_get(cache_key)
+        if cached is not None:
+            return _parse_name(cached)
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key, base_url=GROQ_BASE_URL)
-        response = client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[
-                {"role": "system", "content": "You extract person names. Reply only with 'FirstName LastName' or 'NONE'."},
-                {"role": "user", "content": prompt + "\n\n" + user_content},
-            ],
-            max_tokens=50,
-            temperature=0,
-        )
-        content = (response.choices[0].message.content or "").strip()
-        if not content or content.upper() == "NONE":
-            return None
-        parts = content.split()
-        if len(parts) >= 2:
-            return (parts[0], " ".join(parts[1:]))
-        if len(parts) == 1 and len(parts[0]) > 1:
-            return (parts[0], "")
-        return None
+        content = _chat(_single_messages(company, designation, text, source_hint), max_tokens=50)
     except Exception as e:
         logger.warning("Groq extraction failed: %s", e)
         return None
+    if cache_key:
+        _llm_cache_set(cache_key, content)
+    return _parse_name(content)
+
+
+def extract_names_batch(
+    company: str,
+    designation: str,
+    items: List[Tuple[str, str]],
+    use_cache: bool = True,
+) -> List[Optional[Tuple[str, str]]]:
+    results: List[Optional[Tuple[str, str]]] = [None] * len(items)
+    if not os.getenv("GROQ_API_KEY"):
+        logger.warning("GROQ_API_KEY not set")
+        return results
+    use_cache = use_cache and LLM_CACHE_ENABLED
+    pending, cache_keys = _batch_pending(company, designation, items, results, use_cache)
+    for start in range(0, len(pending), BATCH_MAX_ITEMS):
+        chunk = pending[start : start + BATCH_MAX_ITEMS]
+        if len(chunk) == 1:
+            text, source = items[chunk[0]]
+            results[chunk[0]] = extract_name_with_groq(company, designation, text, source_hint=source, use_cache=use_cache)
+            continue
+        answers: Dict[int, Optional[Tuple[str, str]]] = {}
+        try:
+            content = _chat(_batch_messages(company, designation, [items[i] for i in chunk]), max_tokens=20 * len(chunk) + 20, kind="batch")
+            answers = _parse_batch_response(content, len(chunk))
+        except Exception as e:
+            logger.warning("Groq batch extraction failed: %s", e)
+        if len(answers) < len(chunk):
+            logger.info("Batch response covered %d of %d sources; falling back per item", len(answers), len(chunk))
+        for n, i in enumerate(chunk, 1):
+            if n in answers:
+                results[i] = answers[n]
+                _store_batch_answer(cache_keys, i, answers[n])
+            else:
+                text, source = items[i]
+                results[i] = extract_name_with_groq(company, designation, text, source_hint=source, use_cache=use_cache)
+    return results
 
 
 def extract_from_snippet(
@@ -100,13 +479,47 @@ def extract_from_snippet(
     return None
 
 
+def _snippet_item(r: Dict[str, Any]) -> Tuple[str, str]:
+    text = f"{r.get('title') or ''}\n{r.get('body') or ''}".strip()
+    return text, (r.get("href") or "").strip()
+
+
+def _extraction(url: str, name: Optional[Tuple[str, str]], from_snippet: bool) -> Optional[Dict[str, Any]]:
+    if not name:
+        return None
+    return {
+        "first_name": name[0],
+        "last_name": name[1] or "",
+        "source_url": url,
+        "from_snippet": from_snippet,
+    }
+
+
+def extract_from_snippets(
+    company: str,
+    designation: str,
+    results: List[Dict[str, Any]],
+) -> List[Optional[Dict[str, Any]]]:
+    items = [_snippet_item(r) for r in results]
+    names = extract_names_batch(company, designation, items)
+    return [_extraction(url, name, True) for (_, url), name in zip(items, names)]
+
+
+def _duplicate_page(url: str, text: str, dedup: Optional[DedupIndex]) -> bool:
+    if dedup is None or dedup.seen_text(url, text, "page") is None:
+        return False
+    inc("dedup_dropped_total", kind="page")
+    return True
+
+
 def extract_from_page(
     company: str,
     designation: str,
     url: str,
+    dedup: Optional[DedupIndex] = None,
 ) -> Optional[Dict[str, Any]]:
     text = fetch_page_text(url)
-    if not text:
+    if not text or _duplicate_page(url, text, dedup):
         return None
     name = extract_name_with_groq(company, designation, text, source_hint=url)
     if name:
@@ -117,3 +530,133 @@ def extract_from_page(
             "from_snippet": False,
         }
     return None
+
+
+async def fetch_page_text_async(url: str, max_chars: int = 12000) -> str:
+    try:
+        text, _ = await get_singleflight("page").do_async((url, max_chars, True), lambda: _fetch_page_text_async(url, max_chars))
+    except DeadlineExceeded:
+        return ""
+    return text
+
+
+async def _fetch_page_text_async(url: str, max_chars: int) -> str:
+    try:
+        check_deadline()
+        host = urlparse(url).netloc.lower()
+        limiter = get_rate_limiter("page", host)
+        with guarded(get_host_breaker(host), limiter):
+            with span("rate_limit_wait", provider="page"):
+                if not await limiter.acquire_async(timeout=time_left()):
+                    raise DeadlineExceeded("no time left to fetch the page")
+            client = get_async_http_client()
+            with span("page_fetch"):
+                async with host_slot_async(url):
+                    check_deadline()
+                    async with client.stream("GET", url, headers=REQUEST_HEADERS, timeout=async_http_timeout()) as r:
+                        r.raise_for_status()
+                        if not _page_response_ok(url, r.headers):
+                            return ""
+                        decoder = _page_decoder(r.headers)
+                        parser = _VisibleTextParser(max_chars)
+                        received = 0
+                        finished = True
+                        async for chunk in r.aiter_bytes(STREAM_CHUNK_BYTES):
+                            received += len(chunk)
+                            parser.feed(decoder.decode(chunk))
+                            if parser.done or received >= MAX_PAGE_BYTES or deadline_expired():
+                                finished = False
+                                break
+                        if finished:
+                            parser.feed(decoder.decode(b"", final=True))
+                        parser.close()
+                        inc("fetch_bytes_total", received)
+                        return parser.text()
+    except (CircuitOpen, DeadlineExceeded) as e:
+        logger.info("Skipping %s: %s", url, e)
+        return ""
+    except Exception as e:
+        logger.warning("Fetch failed for %s: %s", url, e)
+        return ""
+
+
+async def extract_name_with_groq_async(
+    company: str,
+    designation: str,
+    text: str,
+    source_hint: str = "",
+    use_cache: bool = True,
+) -> Optional[Tuple[str, str]]:
+    if not os.getenv("GROQ_API_KEY"):
+        logger.warning("GROQ_API_KEY not set")
+        return None
+    if not text or len(text.strip()) < 20:
+        return None
+    text = compact_text(text, company, designation)
+    cache_key = _single_cache_key(company, designation, text, use_cache)
+    if cache_key:
+        cached = await run_blocking(_llm_cache_get, cache_key)
+        if cached is not None:
+            return _parse_name(cached)
+    try:
+        content = await _chat_async(_single_messages(company, designation, text, source_hint), max_tokens=50)
+    except Exception as e:
+        logger.warning("Groq extraction failed: %s", e)
+        return None
+    if cache_key:
+        await run_blocking(_llm_cache_set, cache_key, content)
+    return _parse_name(content)
+
+
+async def extract_names_batch_async(
+    company: str,
+    designation: str,
+    items: List[Tuple[str, str]],
+    use_cache: bool = True,
+) -> List[Optional[Tuple[str, str]]]:
+    results: List[Optional[Tuple[str, str]]] = [None] * len(items)
+    if not os.getenv("GROQ_API_KEY"):
+        logger.warning("GROQ_API_KEY not set")
+        return results
+    use_cache = use_cache and LLM_CACHE_ENABLED
+    pending, cache_keys = await run_blocking(_batch_pending, company, designation, items, results, use_cache)
+    for start in range(0, len(pending), BATCH_MAX_ITEMS):
+        chunk = pending[start : start + BATCH_MAX_ITEMS]
+        answers: Dict[int, Optional[Tuple[str, str]]] = {}
+        if len(chunk) > 1:
+            try:
+                content = await _chat_async(_batch_messages(company, designation, [items[i] for i in chunk]), max_tokens=20 * len(chunk) + 20, kind="batch")
+                answers = _parse_batch_response(content, len(chunk))
+            except Exception as e:
+                logger.warning("Groq batch extraction failed: %s", e)
+        for n, i in enumerate(chunk, 1):
+            if n in answers:
+                results[i] = answers[n]
+                await run_blocking(_store_batch_answer, cache_keys, i, answers[n])
+            else:
+                text, source = items[i]
+                results[i] = await extract_name_with_groq_async(company, designation, text, source_hint=source, use_cache=use_cache)
+    return results
+
+
+async def extract_from_snippets_async(
+    company: str,
+    designation: str,
+    results: List[Dict[str, Any]],
+) -> List[Optional[Dict[str, Any]]]:
+    items = [_snippet_item(r) for r in results]
+    names = await extract_names_batch_async(company, designation, items)
+    return [_extraction(url, name, True) for (_, url), name in zip(items, names)]
+
+
+async def extract_from_page_async(
+    company: str,
+    designation: str,
+    url: str,
+    dedup: Optional[DedupIndex] = None,
+) -> Optional[Dict[str, Any]]:
+    text = await fetch_page_text_async(url)
+    if not text or _duplicate_page(url, text, dedup):
+        return None
+    name = await extract_name_with_groq_async(company, designation, text, source_hint=url)
+    return _extraction(url, name, False)
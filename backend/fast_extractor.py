@@ -0,0 +1,162 @@
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from backend.query_builder import DESIGNATION_ALIASES, normalize_designation
+
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+FAST_PATH_THRESHOLD = float(os.getenv("FAST_PATH_THRESHOLD", "0.75"))
+FAST_PATH_MIN_AGREEMENT = int(os.getenv("FAST_PATH_MIN_AGREEMENT", "2"))
+COMPANY_WINDOW = 80
+
+_NAME_TOKEN = r"[A-ZÀ-Ý][a-zà-ÿ'’\-]+"
+# Two or three Title-Case words (optionally with a middle initial), captured as the "name" group.
+NAME_PATTERN = rf"(?<![\w'’\-])(?P<name>{_NAME_TOKEN}(?:[^\S\n]+[A-Z]\.)?(?:[^\S\n]+{_NAME_TOKEN}){{1,2}})"
+_NOT_NAME_WORDS = {
+    "chief", "executive", "officer", "president", "vice", "senior", "founder", "director", "manager",
+    "head", "partner", "owner", "lead", "chairman", "chair", "board", "the", "and", "of", "at", "for",
+    "inc", "ltd", "llc", "corp", "corporation", "company", "group", "linkedin", "wikipedia", "news",
+    "about", "our", "team", "leadership", "meet", "new", "former", "interim", "acting", "global",
+}
+# Everyday words that turn up Title-Cased in headlines ("Microsoft CEO Steps Down").
+_COMMON_WORDS = {
+    "a", "an", "as", "by", "in", "is", "on", "to", "up", "out", "off", "over", "after", "before", "with",
+    "from", "into", "this", "that", "what", "who", "why", "how", "when", "where", "will", "has", "have",
+    "says", "said", "steps", "step", "down", "named", "names", "name", "appoints", "appointed", "announces",
+    "joins", "leaves", "resigns", "quits", "hires", "fired", "talks", "reveals", "lookup", "tool",
+    "search", "find", "list", "profile", "contact", "email", "phone", "net", "worth", "salary", "age",
+    "bio", "biography", "wife", "husband", "family", "home", "page", "official", "site", "report",
+    "interview", "video", "photos", "today", "latest", "update", "first", "last", "top", "next",
+}
+# A role held in the past or only temporarily does not answer "who is the CEO now".
+_PAST_QUALIFIERS = ("former", "ex", "outgoing", "late", "previous", "interim")
+
+
+def role_terms(designation: str) -> List[str]:
+    """Lower-case spellings of a designation and its aliases ("ceo", "chief executive officer"), longest first."""
+    designation = (designation or "").strip().lower()
+    parts = [designation] + [p.strip() for p in re.split(r"[,&|/]|\band\b", designation)]
+    terms = set()
+    for part in parts:
+        if not part:
+            continue
+        normalized = normalize_designation(part).lower()
+        terms.update((part, normalized))
+        for alias, expansion in DESIGNATION_ALIASES.items():
+            if expansion.lower() == normalized:
+                terms.update((alias, normalized))
+    return sorted(terms, key=len, reverse=True)
+
+
+def role_pattern(designation: str) -> str:
+    """Regex alternation of role_terms, tolerant of any whitespace between words; "" if there are none."""
+    return "|".join(re.escape(t).replace(r"\ ", r"\s+") for t in role_terms(designation))
+
+
+def company_pattern(company: str) -> str:
+    """Regex for the company's words in order, allowing punctuation between them ("AT&T", "at t")."""
+    words = re.findall(r"\w+", company or "")
+    return r"[\W_]*".join(re.escape(w) for w in words)
+
+
+@lru_cache(maxsize=512)
+def _compile_patterns(company: str, designation: str) -> Tuple[Tuple[Pattern, float, bool], ...]:
+    role = rf"(?P<role>(?i:(?:(?:co-?)?founder\s*(?:&|and)\s*)?(?:{role_pattern(designation)})))"
+    comp = company_pattern(company)
+    patterns: List[Tuple[str, float, bool]] = []
+    if comp:
+        comp = rf"(?i:{comp})"
+        patterns += [
+            (rf"{NAME_PATTERN},?\s+(?i:(?:the\s+)?(?:current\s+)?){role}\s+(?i:of|at)\s+{comp}", 0.9, False),
+            (rf"{NAME_PATTERN}\s+(?i:is|serves\s+as|has\s+been|became)\s+(?i:(?:the\s+)?(?:current\s+)?(?:new\s+)?){role}\s+(?i:of|at)\s+{comp}", 0.9, False),
+            (rf"{comp}(?:'s|’s)?\s+{role},?\s+{NAME_PATTERN}", 0.85, False),
+            (rf"{role}\s+(?i:of|at)\s+{comp},?\s+{NAME_PATTERN}", 0.85, False),
+            (rf"{NAME_PATTERN}\s+[-–|]\s+[^|\n]{{0,40}}?{role}[^|\n]{{0,20}}?\s+[-–|]\s+{comp}", 0.85, False),
+        ]
+    patterns += [
+        (rf"{NAME_PATTERN},?\s+(?i:(?:the\s+)?){role}\b", 0.6, True),
+        (rf"\b{role}\s+{NAME_PATTERN}", 0.6, True),
+    ]
+    return tuple((re.compile(p), score, needs_company) for p, score, needs_company in patterns)
+
+
+@lru_cache(maxsize=512)
+def _past_role_pattern(company: str) -> Pattern:
+    """Matches text ending in "former ", "ex-" or "former Acme's " right before a role mention."""
+    comp = company_pattern(company)
+    comp = rf"(?:{comp}(?:'s|’s)?\s+)?" if comp else ""
+    return re.compile(rf"\b(?:{'|'.join(_PAST_QUALIFIERS)})(?:\s*-\s*|\s+){comp}$", re.I)
+
+
+def split_name(name: str) -> Optional[Tuple[str, str]]:
+    """(first, last) for a NAME_PATTERN match, or None if it reads like a title or headline instead."""
+    tokens = [t for t in name.split() if not re.fullmatch(r"[A-Z]\.", t)]
+    if len(tokens) < 2:
+        return None
+    words = [t.lower().strip("'’-") for t in tokens]
+    if any(w in _NOT_NAME_WORDS or w in _COMMON_WORDS for w in words):
+        return None
+    return tokens[0], tokens[-1]
+
+
+def extract_candidates(company: str, designation: str, text: str) -> List[Dict[str, Any]]:
+    if not text or not company or not designation:
+        return []
+    company_words = {w.lower() for w in re.findall(r"\w+", company)}
+    company_re = re.compile(company_pattern(company), re.I) if company_words else None
+    past_role = _past_role_pattern(company)
+    best: Dict[str, Dict[str, Any]] = {}
+    for pattern, score, needs_company in _compile_patterns(company, designation):
+        for m in pattern.finditer(text):
+            if past_role.search(text, max(0, m.start("role") - COMPANY_WINDOW), m.start("role")):
+                continue
+            name = split_name(m.group("name"))
+            if not name or {name[0].lower(), name[1].lower()} & company_words:
+                continue
+            if needs_company:
+                window = text[max(0, m.start() - COMPANY_WINDOW) : m.end() + COMPANY_WINDOW]
+                if not company_re or not company_re.search(window):
+                    continue
+            key = f"{name[0]} {name[1]}".lower()
+            if key not in best or best[key]["score"] < score:
+                best[key] = {"first_name": name[0], "last_name": name[1], "score": score}
+    return sorted(best.values(), key=lambda c: c["score"], reverse=True)
+
+
+def fast_extract(
+    company: str,
+    designation: str,
+    results: List[Dict[str, Any]],
+    threshold: Optional[float] = None,
+    min_agreement: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    threshold = FAST_PATH_THRESHOLD if threshold is None else threshold
+    min_agreement = FAST_PATH_MIN_AGREEMENT if min_agreement is None else min_agreement
+    votes: Dict[str, Dict[str, Any]] = {}
+    for r in results:
+        url = (r.get("href") or "").strip()
+        text = f"{r.get('title') or ''}\n{r.get('body') or ''}"
+        candidates = extract_candidates(company, designation, text)
+        if not candidates:
+            continue
+        top = candidates[0]
+        key = f"{top['first_name']} {top['last_name']}".lower()
+        vote = votes.setdefault(key, {"first_name": top["first_name"], "last_name": top["last_name"], "scores": [], "sources": []})
+        vote["scores"].append(top["score"])
+        vote["sources"].append(url)
+    if not votes:
+        return None
+    ranked = sorted(votes.values(), key=lambda v: (len(v["sources"]), sum(v["scores"])), reverse=True)
+    winner = ranked[0]
+    if len(ranked) > 1 and len(ranked[1]["sources"]) >= len(winner["sources"]):
+        return None
+    confidence = sum(winner["scores"]) / len(winner["scores"])
+    if len(winner["sources"]) < min_agreement or confidence < threshold:
+        return None
+    return {
+        "first_name": winner["first_name"],
+        "last_name": winner["last_name"],
+        "confidence": round(confidence, 2),
+        "sources": winner["sources"],
+    }
@@ -0,0 +1,246 @@
+import os
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.deadline import check_deadline, time_left
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "8"))
+POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "64"))
+POOL_MAXSIZE_PER_HOST = int(os.getenv("HTTP_POOL_MAXSIZE_PER_HOST", "4"))
+MAX_CONCURRENCY_PER_HOST = int(os.getenv("HTTP_MAX_CONCURRENCY_PER_HOST", "4"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "16"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "8"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "30"))
+# requests and httpx reject a zero timeout; a nearly spent deadline still gets this much.
+MIN_TIMEOUT = 0.05
+
+_adapter: Optional[HTTPAdapter] = None
+_local = threading.local()
+_lock = threading.Lock()
+_host_slots: "OrderedDict[str, _HostSlot]" = OrderedDict()
+_groq_clients: Dict[str, Any] = {}
+_llm_requests = 0
+_loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _get_adapter() -> HTTPAdapter:
+    global _adapter
+    with _lock:
+        if _adapter is None:
+            _adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE_PER_HOST, pool_block=False)
+        return _adapter
+
+
+def get_http_session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        adapter = _get_adapter()
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _local.session = session
+    return session
+
+
+class _HostSlot:
+    """A host's concurrency cap; users counts holders and waiters, so only idle hosts are dropped."""
+
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, semaphore: Any):
+        self.semaphore = semaphore
+        self.users = 0
+
+
+def _checkout_slot(slots: "OrderedDict[str, _HostSlot]", host: str, make: Callable[[], Any]) -> _HostSlot:
+    """Caller serialises access to slots. Keeps at most POOL_HOSTS idle hosts, least recent first out."""
+    slot = slots.get(host)
+    if slot is None:
+        slot = slots[host] = _HostSlot(make())
+    else:
+        slots.move_to_end(host)
+    slot.users += 1
+    excess = len(slots) - POOL_HOSTS
+    if excess > 0:
+        for idle in [h for h, s in slots.items() if not s.users][:excess]:
+            del slots[idle]
+    return slot
+
+
+@contextmanager
+def host_slot(url: str) -> Iterator[None]:
+    host = urlparse(url).netloc.lower()
+    with _lock:
+        slot = _checkout_slot(_host_slots, host, lambda: threading.BoundedSemaphore(MAX_CONCURRENCY_PER_HOST))
+    try:
+        with slot.semaphore:
+            yield
+    finally:
+        with _lock:
+            slot.users -= 1
+
+
+def http_timeouts() -> Tuple[float, float]:
+    """(connect, read) timeouts, lowered to fit the current request deadline."""
+    return max(MIN_TIMEOUT, time_left(CONNECT_TIMEOUT)), max(MIN_TIMEOUT, time_left(READ_TIMEOUT))
+
+
+def http_get(url: str, timeout: Optional[Any] = None, **kwargs) -> requests.Response:
+    """Fetch the whole response body while holding the host's slot; use http_stream to read it incrementally."""
+    with host_slot(url):
+        check_deadline()
+        return get_http_session().get(url, timeout=timeout or http_timeouts(), stream=False, **kwargs)
+
+
+@contextmanager
+def http_stream(url: str, timeout: Optional[Any] = None, **kwargs) -> Iterator[requests.Response]:
+    """Streamed GET that keeps the host's slot until the body has been read and the response closed."""
+    with host_slot(url):
+        check_deadline()
+        resp = get_http_session().get(url, timeout=timeout or http_timeouts(), stream=True, **kwargs)
+        try:
+            yield resp
+        finally:
+            resp.close()
+
+
+def _count_llm_request(request) -> None:
+    global _llm_requests
+    with _lock:
+        _llm_requests += 1
+
+
+def httpx_module():
+    """The httpx package the openai SDK is built on: httpx2 from openai 3 on, httpx before that."""
+    try:
+        import httpx2 as httpx
+    except ImportError:
+        import httpx
+    return httpx
+
+
+def get_groq_client(api_key: str, base_url: str):
+    with _lock:
+        client = _groq_clients.get(api_key)
+        if client is None:
+            from openai import DefaultHttpxClient, OpenAI
+            httpx = httpx_module()
+            http_client = DefaultHttpxClient(
+                limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_KEEPALIVE),
+                timeout=httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+                event_hooks={"request": [_count_llm_request]},
+            )
+            client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+            _groq_clients[api_key] = client
+        return client
+
+
+def _get_loop_state() -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        state = _loop_state.get(loop)
+        if state is None:
+            state = {"http": None, "groq": {}, "slots": OrderedDict()}
+            _loop_state[loop] = state
+        return state
+
+
+def get_async_http_client():
+    httpx = httpx_module()
+    state = _get_loop_state()
+    client = state["http"]
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=POOL_HOSTS * POOL_MAXSIZE_PER_HOST, max_keepalive_connections=POOL_HOSTS),
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            follow_redirects=True,
+        )
+        state["http"] = client
+    return client
+
+
+def async_http_timeout():
+    connect, read = http_timeouts()
+    return httpx_module().Timeout(read, connect=connect)
+
+
+def get_async_groq_client(api_key: str, base_url: str):
+    state = _get_loop_state()
+    client = state["groq"].get(api_key)
+    if client is None:
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        httpx = httpx_module()
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_KEEPALIVE),
+            timeout=httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        )
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+        state["groq"][api_key] = client
+    return client
+
+
+@asynccontextmanager
+async def host_slot_async(url: str) -> AsyncIterator[None]:
+    host = urlparse(url).netloc.lower()
+    slot = _checkout_slot(_get_loop_state()["slots"], host, lambda: asyncio.Semaphore(MAX_CONCURRENCY_PER_HOST))
+    try:
+        async with slot.semaphore:
+            yield
+    finally:
+        slot.users -= 1
+
+
+def _llm_open_connections() -> Optional[int]:
+    total = 0
+    for client in list(_groq_clients.values()):
+        http_client = getattr(client, "_client", None)
+        pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return None
+        total += len(connections)
+    return total
+
+
+def pool_stats() -> Dict[str, Any]:
+    hosts = 0
+    connections_opened = 0
+    requests_sent = 0
+    idle_connections = 0
+    adapter = _adapter
+    if adapter is not None:
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts += 1
+            connections_opened += pool.num_connections
+            requests_sent += pool.num_requests
+            if pool.pool is not None:
+                idle_connections += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    reuse_rate = 1 - connections_opened / requests_sent if requests_sent else 0.0
+    return {
+        "pages": {
+            "hosts": hosts,
+            "requests": requests_sent,
+            "connections_opened": connections_opened,
+            "idle_connections": idle_connections,
+            "reuse_rate": round(max(0.0, reuse_rate), 3),
+        },
+        "llm": {
+            "clients": len(_groq_clients),
+            "requests": _llm_requests,
+            "open_connections": _llm_open_connections(),
+        },
+    }
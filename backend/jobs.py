@@ -0,0 +1,165 @@
+import os
+import math
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from backend.admission import AdmissionRejected
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_TTL = float(os.getenv("JOB_TTL", "3600"))
+MAX_JOBS = int(os.getenv("MAX_JOBS", "1000"))
+MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", "200"))
+MAX_QUEUED_JOBS_PER_CLIENT = int(os.getenv("MAX_QUEUED_JOBS_PER_CLIENT", "50"))
+TERMINAL_STAGES = ("result", "error")
+
+JobFunction = Callable[[str, str, Callable[[str, Dict[str, Any]], None]], Dict[str, Any]]
+
+
+class Job:
+    def __init__(self, company: str, designation: str, client: str = ""):
+        self.id = uuid.uuid4().hex
+        self.company = company
+        self.designation = designation
+        self.client = client
+        self.status = "queued"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.events: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+
+    def _append(self, stage: str, data: Dict[str, Any]) -> None:
+        self.events.append({"seq": len(self.events) + 1, "stage": stage, "data": data, "ts": time.time()})
+        self._cond.notify_all()
+
+    def add_event(self, stage: str, data: Dict[str, Any]) -> None:
+        with self._cond:
+            self._append(stage, data)
+
+    def start(self) -> None:
+        with self._cond:
+            self.status = "running"
+            self._append("started", {})
+
+    def finish(self, status: str, result: Dict[str, Any]) -> None:
+        """Mark the job finished and append its terminal event in one step, so a finished job
+        always ends with a "result" or "error" event."""
+        with self._cond:
+            self.status = status
+            self.result = result
+            self.finished_at = time.time()
+            self._append("result" if status == "done" else "error", result)
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def wait_events(self, after_seq: int, timeout: float) -> List[Dict[str, Any]]:
+        with self._cond:
+            if len(self.events) <= after_seq and not self.finished:
+                self._cond.wait(timeout)
+            return self.events[after_seq:]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "job_id": self.id,
+                "company": self.company,
+                "designation": self.designation,
+                "status": self.status,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+                "events": list(self.events),
+                "result": self.result,
+            }
+
+
+class JobManager:
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_queued: int = MAX_QUEUED_JOBS,
+        max_queued_per_client: int = MAX_QUEUED_JOBS_PER_CLIENT,
+    ):
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        self.max_queued_per_client = max(1, max_queued_per_client)
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="lookup-job")
+        self._jobs: Dict[str, Job] = {}
+        self._queued: Dict[str, int] = {}
+        self._durations: Deque[float] = deque(maxlen=100)
+        self._lock = threading.Lock()
+
+    def _retry_after(self) -> int:
+        duration = sum(self._durations) / len(self._durations) if self._durations else 5.0
+        return max(1, math.ceil(duration * (sum(self._queued.values()) + 1) / self.workers))
+
+    def submit(self, company: str, designation: str, fn: JobFunction, client: str = "") -> Job:
+        """Queue a lookup; AdmissionRejected (503 overall, 429 for this client) when the queue is full."""
+        job = Job(company, designation, client)
+        with self._lock:
+            if sum(self._queued.values()) >= self.max_queued:
+                self.rejected += 1
+                raise AdmissionRejected(503, "Too many queued jobs, try again shortly", self._retry_after())
+            if self._queued.get(client, 0) >= self.max_queued_per_client:
+                self.rejected += 1
+                raise AdmissionRejected(429, "Too many queued jobs for this client", self._retry_after())
+            self._queued[client] = self._queued.get(client, 0) + 1
+            self._prune()
+            self._jobs[job.id] = job
+        job.add_event("queued", {"company": company, "designation": designation})
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn: JobFunction) -> None:
+        with self._lock:
+            left = self._queued.get(job.client, 0) - 1
+            if left > 0:
+                self._queued[job.client] = left
+            else:
+                self._queued.pop(job.client, None)
+        job.start()
+        started = time.monotonic()
+        try:
+            result = fn(job.company, job.designation, job.add_event)
+        except Exception as e:
+            logger.exception("Lookup job %s failed", job.id)
+            job.finish("failed", {"found": False, "error": str(e)})
+            return
+        finally:
+            with self._lock:
+                self._durations.append(time.monotonic() - started)
+        job.finish("done", result)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [jid for jid, job in self._jobs.items() if job.finished and now - job.finished_at > JOB_TTL]
+        for jid in expired:
+            del self._jobs[jid]
+        if len(self._jobs) >= MAX_JOBS:
+            finished = sorted((job for job in self._jobs.values() if job.finished), key=lambda j: j.finished_at)
+            for job in finished[: len(self._jobs) - MAX_JOBS + 1]:
+                del self._jobs[job.id]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            "tracked": len(jobs),
+            "queued": sum(1 for j in jobs if j.status == "queued"),
+            "running": sum(1 for j in jobs if j.status == "running"),
+            "max_queued": self.max_queued,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,289 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import heapq
+import sqlite3
+import logging
+import argparse
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.cache import CACHE_DIR
+from backend.search_client import MAX_RESULTS_PER_QUERY, normalize_result
+
+logger = logging.getLogger(__name__)
+
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", str(CACHE_DIR / "local_index.sqlite3"))
+LOCAL_INDEX_CACHE_TERMS = int(os.getenv("LOCAL_INDEX_CACHE_TERMS", "100000"))
+LOCAL_MIN_MATCH = float(os.getenv("LOCAL_MIN_MATCH", "0.66"))
+LOCAL_BODY_CHARS = 2000
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+# Terms in more than this share of documents only re-score documents that rarer terms already matched.
+COMMON_DF_FRACTION = 0.05
+INDEX_FORMAT_VERSION = "1"
+
+STOPWORDS = frozenset("a an and at by for from in is of on or the to who what name".split())
+_TOKEN_RE = re.compile(r"\w+")
+_OPERATOR_RE = re.compile(r"\b\w+:\S+")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").casefold()) if t not in STOPWORDS]
+
+
+def corpus_item(record: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """A search-result dict for one corpus record, or None when it has no URL.
+
+    Records may be result-shaped (title/href/body, or url/snippet/text) or structured leadership
+    rows (company, designation or role, name or first_name/last_name, source_url); the latter
+    get a synthetic "<name> - <role> - <company>" title and a one-sentence body.
+    """
+    item = normalize_result({**record, "href": record.get("href") or record.get("url") or record.get("source_url")})
+    if not item["body"]:
+        item["body"] = str(record.get("text") or record.get("content") or "")
+    person = record.get("name") or " ".join(p for p in (record.get("first_name"), record.get("last_name")) if p)
+    role = record.get("designation") or record.get("role") or record.get("position")
+    company = record.get("company")
+    if person and role and company:
+        item["title"] = item["title"] or f"{person} - {role} - {company}"
+        item["body"] = item["body"] or f"{person} is the {role} of {company}."
+    if not item["href"] or not (item["title"] or item["body"]):
+        return None
+    return item
+
+
+def iter_corpus(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    for path in paths:
+        with open(path, encoding="utf-8") as fp:
+            for n, line in enumerate(fp, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("%s:%d: not valid JSON, skipped", path, n)
+                    continue
+                if isinstance(record, dict):
+                    yield record
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    return sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+
+
+def build_index(paths: Iterable[str], out_path: str = LOCAL_INDEX_PATH) -> Dict[str, Any]:
+    """Index JSONL corpora into a fresh SQLite file and swap it in place of out_path.
+
+    Layout: docs(id, href, title, body, length) with ids 0..N-1, terms(term, df, postings)
+    where postings is df uint32 doc ids (ascending) followed by df uint16 term frequencies in
+    native byte order, and meta(key, value) holding version, doc_count, avg_length and byteorder.
+    """
+    started = time.perf_counter()
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{out_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = _connect(tmp_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    conn.execute("CREATE TABLE docs (id INTEGER PRIMARY KEY, href TEXT NOT NULL, title TEXT NOT NULL, body TEXT NOT NULL, length INTEGER NOT NULL)")
+    conn.execute("CREATE TABLE terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL, postings BLOB NOT NULL) WITHOUT ROWID")
+    postings: Dict[str, Tuple[array, array]] = {}
+    rows: List[Tuple[int, str, str, str, int]] = []
+    doc_id = skipped = total_length = 0
+    conn.execute("BEGIN")
+    for record in iter_corpus(paths):
+        item = corpus_item(record)
+        if item is None:
+            skipped += 1
+            continue
+        counts: Dict[str, int] = {}
+        for token in tokenize(item["title"]):
+            counts[token] = counts.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(item["body"]):
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            entry = postings.get(token)
+            if entry is None:
+                entry = postings[token] = (array("I"), array("H"))
+            entry[0].append(doc_id)
+            entry[1].append(min(tf, 65535))
+        length = sum(counts.values())
+        total_length += length
+        rows.append((doc_id, item["href"], item["title"], item["body"][:LOCAL_BODY_CHARS], length))
+        doc_id += 1
+        if len(rows) >= 10000:
+            conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?, ?)", rows)
+            rows.clear()
+    conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?, ?)", rows)
+    conn.executemany(
+        "INSERT INTO terms VALUES (?, ?, ?)",
+        ((term, len(ids), ids.tobytes() + tfs.tobytes()) for term, (ids, tfs) in postings.items()),
+    )
+    meta = {
+        "version": INDEX_FORMAT_VERSION,
+        "doc_count": doc_id,
+        "avg_length": total_length / doc_id if doc_id else 0.0,
+        "byteorder": sys.byteorder,
+        "built_at": time.time(),
+    }
+    conn.executemany("INSERT INTO meta VALUES (?, ?)", ((k, json.dumps(v)) for k, v in meta.items()))
+    conn.execute("COMMIT")
+    conn.close()
+    os.replace(tmp_path, out_path)
+    return {"docs": doc_id, "terms": len(postings), "skipped": skipped, "seconds": round(time.perf_counter() - started, 2)}
+
+
+class LocalIndex:
+    """Read side of a built index: BM25 over postings loaded lazily into an LRU of decoded arrays."""
+
+    def __init__(self, path: str = LOCAL_INDEX_PATH, cache_terms: int = LOCAL_INDEX_CACHE_TERMS):
+        self.path = str(path)
+        self.cache_terms = cache_terms
+        self.queries = 0
+        self._conn = _connect(f"file:{self.path}?mode=ro")
+        self._lock = threading.Lock()
+        self._postings: "OrderedDict[str, Optional[Tuple[array, array]]]" = OrderedDict()
+        meta = {k: json.loads(v) for k, v in self._conn.execute("SELECT key, value FROM meta")}
+        if meta.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"{self.path}: unsupported index format {meta.get('version')!r}, rebuild it")
+        self.doc_count = int(meta["doc_count"])
+        self.avg_length = float(meta["avg_length"]) or 1.0
+        self._swap = meta.get("byteorder") != sys.byteorder
+        self._norms = array("d", (
+            BM25_K1 * (1 - BM25_B + BM25_B * length / self.avg_length)
+            for (length,) in self._conn.execute("SELECT length FROM docs ORDER BY id")
+        ))
+
+    def _load_postings(self, term: str) -> Optional[Tuple[array, array]]:
+        with self._lock:
+            if term in self._postings:
+                self._postings.move_to_end(term)
+                return self._postings[term]
+            row = self._conn.execute("SELECT df, postings FROM terms WHERE term = ?", (term,)).fetchone()
+            entry = None
+            if row is not None:
+                df, blob = row
+                ids, tfs = array("I"), array("H")
+                ids.frombytes(blob[: 4 * df])
+                tfs.frombytes(blob[4 * df :])
+                if self._swap:
+                    ids.byteswap()
+                    tfs.byteswap()
+                entry = (ids, tfs)
+            self._postings[term] = entry
+            if len(self._postings) > self.cache_terms:
+                self._postings.popitem(last=False)
+            return entry
+
+    def _idf(self, df: int) -> float:
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, max_results: int = MAX_RESULTS_PER_QUERY) -> List[Dict[str, str]]:
+        """Top BM25 matches that contain at least LOCAL_MIN_MATCH of the query's terms."""
+        self.queries += 1
+        terms = list(dict.fromkeys(tokenize(_OPERATOR_RE.sub(" ", query))))
+        if not terms or not self.doc_count:
+            return []
+        lists = sorted(
+            ((term, entry) for term in terms for entry in (self._load_postings(term),) if entry is not None),
+            key=lambda te: len(te[1][0]),
+        )
+        required = max(1, math.ceil(len(terms) * LOCAL_MIN_MATCH))
+        if len(lists) < required:
+            return []
+        common_df = self.doc_count * COMMON_DF_FRACTION
+        norms = self._norms
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for n, (_, (ids, tfs)) in enumerate(lists):
+            idf = self._idf(len(ids))
+            if n == 0 or len(ids) <= common_df:
+                for doc, tf in zip(ids, tfs):
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norms[doc])
+                    matched[doc] = matched.get(doc, 0) + 1
+            else:
+                for doc in list(scores):
+                    i = bisect_left(ids, doc)
+                    if i < len(ids) and ids[i] == doc:
+                        tf = tfs[i]
+                        scores[doc] += idf * tf * (BM25_K1 + 1) / (tf + norms[doc])
+                        matched[doc] += 1
+        eligible = ((score, doc) for doc, score in scores.items() if matched[doc] >= required)
+        top = heapq.nlargest(max_results, eligible)
+        if not top:
+            return []
+        with self._lock:
+            rows = {
+                row[0]: row[1:]
+                for row in self._conn.execute(
+                    f"SELECT id, href, title, body FROM docs WHERE id IN ({','.join('?' * len(top))})",
+                    [doc for _, doc in top],
+                )
+            }
+        return [{"title": rows[doc][1], "href": rows[doc][0], "body": rows[doc][2]} for _, doc in top]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cached = len(self._postings)
+        return {"path": self.path, "docs": self.doc_count, "queries": self.queries, "cached_terms": cached}
+
+
+_index: Optional[LocalIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_local_index(path: Optional[str] = None) -> Optional[LocalIndex]:
+    """The index at LOCAL_INDEX_PATH, or None if it has not been built."""
+    global _index
+    path = path or LOCAL_INDEX_PATH
+    with _index_lock:
+        if _index is None or _index.path != path:
+            if not os.path.exists(path):
+                return None
+            _index = LocalIndex(path)
+        return _index
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or query the local BM25 search index.")
+    parser.add_argument("--index", default=LOCAL_INDEX_PATH, help=f"Index file (default: {LOCAL_INDEX_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Index one or more JSONL corpus files, replacing the existing index")
+    build.add_argument("corpus", nargs="+")
+    find = sub.add_parser("search", help="Run one query")
+    find.add_argument("query")
+    find.add_argument("-n", "--max-results", type=int, default=MAX_RESULTS_PER_QUERY)
+    sub.add_parser("stats", help="Show index size")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        print(json.dumps(build_index(args.corpus, args.index)))
+        return 0
+    index = get_local_index(args.index)
+    if index is None:
+        print(f"No index at {args.index}; run the build command first", file=sys.stderr)
+        return 1
+    if args.command == "search":
+        started = time.perf_counter()
+        results = index.search(args.query, args.max_results)
+        print(json.dumps(results, indent=2))
+        print(f"{len(results)} results in {(time.perf_counter() - started) * 1000:.2f} ms", file=sys.stderr)
+    else:
+        print(json.dumps(index.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import time
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+METRIC_PREFIX = "person_finder_"
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> LabelSet:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: LabelSet, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+        self._histograms: Dict[str, Dict[LabelSet, _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram()
+            histogram.observe(value)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = METRIC_PREFIX + name
+                lines.append(f"# TYPE {full} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{full}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                full = METRIC_PREFIX + name
+                lines.append(f"# TYPE {full} histogram")
+                for labels, h in sorted(series.items()):
+                    for bound, count in zip(DURATION_BUCKETS, h.buckets):
+                        lines.append(f"{full}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {count}")
+                    lines.append(f"{full}_bucket{_format_labels(labels, ('le', '+Inf'))} {h.count}")
+                    lines.append(f"{full}_sum{_format_labels(labels)} {h.sum:.6f}")
+                    lines.append(f"{full}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += seconds * 1000
+            entry["max_ms"] = max(entry["max_ms"], seconds * 1000)
+
+    def add(self, name: str, value: float) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0.0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                stage: {"count": int(e["count"]), "total_ms": round(e["total_ms"], 1), "max_ms": round(e["max_ms"], 1)}
+                for stage, e in self._stages.items()
+            }
+            counters = {name: int(v) if float(v).is_integer() else round(v, 3) for name, v in self._counters.items()}
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "stages": stages,
+            "counters": counters,
+        }
+
+
+REGISTRY = MetricsRegistry()
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    REGISTRY.inc(name, value, **labels)
+    timings = _current.get()
+    if timings is not None:
+        suffix = ".".join(str(v) for _, v in _labels(labels))
+        timings.add(f"{name}.{suffix}" if suffix else name, value)
+
+
+def observe_span(stage: str, seconds: float, **labels) -> None:
+    REGISTRY.observe("stage_duration_seconds", seconds, stage=stage, **labels)
+    timings = _current.get()
+    if timings is not None:
+        timings.add_span(stage, seconds)
+
+
+@contextmanager
+def span(stage: str, **labels) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        inc("errors_total", stage=stage)
+        raise
+    finally:
+        observe_span(stage, time.perf_counter() - start, **labels)
+
+
+@contextmanager
+def collect_timings() -> Iterator[RequestTimings]:
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Carry the caller's timing context into a worker thread."""
+    ctx = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render()
@@ -1,34 +1,120 @@
-import time
+import os
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
 
-from backend.query_builder import build_queries
-from backend.search_client import search_multiple_queries
-from backend.extractor import extract_from_snippet, extract_from_page
+from backend.query_builder import iter_query_tiers
+from backend.search_client import recording_search_failures
+from backend.search_providers import search_available, search_multiple_queries
+from backend.extractor import extract_from_snippets, extract_from_page, llm_available
+from backend.fast_extractor import FAST_PATH_ENABLED, fast_extract
+from backend.deadline import (
+    DEADLINE_ERROR,
+    PARTIAL_CONFIDENCE_FACTOR,
+    Deadline,
+    current_deadline,
+    deadline_expired,
+    deadline_scope,
+    stage_budget,
+    time_left,
+)
+from backend.dedup import DedupIndex
+from backend.metrics import bind, inc, span
+from backend.ranking import rank_results, source_credibility_score
 
 logger = logging.getLogger(__name__)
 
-CREDIBLE_DOMAINS = ("linkedin.com", "wikipedia.org", "crunchbase.com", "bloomberg.com", "reuters.com", "forbes.com")
-SNIPPET_DELAY = 0.5
-PAGE_FETCH_DELAY = 1.0
+EXTRACTION_WORKERS = 4
+SNIPPET_BATCH_SIZE = int(os.getenv("SNIPPET_BATCH_SIZE", "8"))
+SEARCH_UNAVAILABLE_ERROR = "Search provider unavailable, try again shortly"
+LLM_UNAVAILABLE_ERROR = "Name extraction unavailable, try again shortly"
+CONSENSUS_THRESHOLD = int(os.getenv("CONSENSUS_THRESHOLD", "3"))
+# Cap on extractions per lookup when sources keep disagreeing; never below what consensus needs.
+MAX_EXTRACTIONS = max(CONSENSUS_THRESHOLD, int(os.getenv("MAX_EXTRACTIONS", "3")))
+ESCALATION_CONFIDENCE = float(os.getenv("ESCALATION_CONFIDENCE", "0.9"))
 
+EventCallback = Callable[[str, Dict[str, Any]], None]
 
-def _source_credibility_score(url: str) -> int:
-    url_lower = url.lower()
-    for i, d in enumerate(CREDIBLE_DOMAINS):
-        if d in url_lower:
-            return 10 - i
-    return 0
 
-
-def _normalize_name(first: str, last: str) -> str:
+def normalize_name(first: str, last: str) -> str:
     return f"{(first or '').strip()} {(last or '').strip()}".strip().lower()
 
 
-def run_pipeline(company: str, designation: str) -> Dict[str, Any]:
-    company = (company or "").strip()
-    designation = (designation or "").strip()
-    empty_result = {
+def _name_groups(extractions: List[Dict[str, Any]]) -> Dict[str, List[Dict]]:
+    name_counts: Dict[str, List[Dict]] = {}
+    for e in extractions:
+        key = normalize_name(e.get("first_name", ""), e.get("last_name", ""))
+        if key and len(key) > 1:
+            name_counts.setdefault(key, []).append(e)
+    return name_counts
+
+
+def _agreement(extractions: List[Dict[str, Any]]) -> int:
+    return max((len(arr) for arr in _name_groups(extractions).values()), default=0)
+
+
+def _confidence(n_agree: int) -> float:
+    if n_agree >= 2:
+        return min(0.95, 0.6 + 0.15 * n_agree)
+    return 0.5
+
+
+def has_enough_extractions(extractions: List[Dict[str, Any]]) -> bool:
+    return len(extractions) >= MAX_EXTRACTIONS or _agreement(extractions) >= CONSENSUS_THRESHOLD
+
+
+def emit_event(on_event: Optional[EventCallback], stage: str, data: Dict[str, Any]) -> None:
+    if on_event is None:
+        return
+    try:
+        on_event(stage, data)
+    except Exception:
+        logger.exception("Pipeline event handler failed")
+
+
+def _snippet_task(company: str, designation: str, items: List[Dict[str, Any]]) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    urls = [(item.get("href") or "").strip() for item in items]
+    return list(zip(urls, extract_from_snippets(company, designation, items)))
+
+
+def _page_task(company: str, designation: str, url: str, dedup: Optional[DedupIndex] = None) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    return [(url, extract_from_page(company, designation, url, dedup=dedup))]
+
+
+def _extract_concurrently(
+    tasks: List[Callable[[], List[Tuple[str, Optional[Dict[str, Any]]]]]],
+    extractions: List[Dict[str, Any]],
+    sources_checked: List[str],
+    on_event: Optional[EventCallback] = None,
+) -> bool:
+    """Run tasks and collect their extractions in order; True if the deadline cut the stage short."""
+    if not tasks or has_enough_extractions(extractions):
+        return False
+    if deadline_expired():
+        return True
+    executor = ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS)
+    try:
+        futures = [executor.submit(bind(fn)) for fn in tasks]
+        for future in futures:
+            try:
+                batch = future.result(timeout=time_left())
+            except FutureTimeoutError:
+                return True
+            for url, out in batch:
+                sources_checked.append(url)
+                if out:
+                    extractions.append(out)
+                    emit_event(on_event, "extraction", out)
+                    if has_enough_extractions(extractions):
+                        return False
+        return False
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def empty_result(designation: str, error: Optional[str] = None) -> Dict[str, Any]:
+    return {
         "first_name": "",
         "last_name": "",
         "current_title": designation,
@@ -36,85 +122,215 @@ def run_pipeline(company: str, designation: str) -> Dict[str, Any]:
         "confidence_score": 0.0,
         "sources_checked": [],
         "found": False,
+        "error": error,
+    }
+
+
+def unique_results(
+    results: List[Dict[str, Any]],
+    dedup: Optional[DedupIndex] = None,
+    tier: int = 0,
+    on_event: Optional[EventCallback] = None,
+) -> List[Dict[str, Any]]:
+    dedup = DedupIndex() if dedup is None else dedup
+    with span("dedup"):
+        unique, dropped = dedup.filter_results(results)
+    if dropped:
+        inc("dedup_dropped_total", dropped, kind="snippet")
+        emit_event(on_event, "dedup", {"dropped": dropped, "tier": tier})
+    return unique
+
+
+def snippet_batches(items: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    batch_size = max(1, SNIPPET_BATCH_SIZE)
+    return [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def page_urls(results: List[Dict[str, Any]], extractions: List[Dict[str, Any]], sources_checked: List[str]) -> List[str]:
+    urls = []
+    for item in results:
+        url = (item.get("href") or "").strip()
+        if not url or url in sources_checked or url in urls:
+            continue
+        if any(e.get("source_url") == url for e in extractions):
+            continue
+        urls.append(url)
+    return urls
+
+
+def local_extractions(
+    company: str,
+    designation: str,
+    snippet_items: List[Dict[str, Any]],
+    on_event: Optional[EventCallback] = None,
+) -> Optional[Tuple[List[Dict[str, Any]], List[str]]]:
+    if not FAST_PATH_ENABLED:
+        return None
+    with span("fast_path"):
+        local = fast_extract(company, designation, snippet_items)
+    if not local:
+        return None
+    extractions = []
+    for url in local["sources"][:MAX_EXTRACTIONS]:
+        out = {
+            "first_name": local["first_name"],
+            "last_name": local["last_name"],
+            "source_url": url,
+            "from_snippet": True,
+        }
+        extractions.append(out)
+        emit_event(on_event, "extraction", out)
+    return extractions, [(item.get("href") or "").strip() for item in snippet_items]
+
+
+def build_result(
+    designation: str,
+    extractions: List[Dict[str, Any]],
+    sources_checked: List[str],
+    timed_out: bool = False,
+) -> Dict[str, Any]:
+    if not extractions:
+        if timed_out:
+            error = DEADLINE_ERROR
+        elif not llm_available():
+            error = LLM_UNAVAILABLE_ERROR
+        else:
+            error = "Could not extract a name from any source"
+        result = empty_result(designation, error)
+        result["sources_checked"] = sources_checked
+        if timed_out:
+            result["partial"] = True
+        return result
+    name_counts = _name_groups(extractions)
+    best_key = None
+    best_count = 0
+    for k, arr in name_counts.items():
+        if len(arr) > best_count:
+            best_count = len(arr)
+            best_key = k
+    if not best_key:
+        chosen = extractions[0]
+    else:
+        candidates = name_counts[best_key]
+        chosen = max(candidates, key=lambda x: source_credibility_score(x.get("source_url", "")))
+    n_agree = len(name_counts.get(best_key, []))
+    confidence = _confidence(n_agree)
+    if timed_out:
+        confidence *= PARTIAL_CONFIDENCE_FACTOR
+    result = {
+        "first_name": chosen.get("first_name", ""),
+        "last_name": chosen.get("last_name", ""),
+        "current_title": designation,
+        "source_url": chosen.get("source_url", ""),
+        "confidence_score": round(confidence, 2),
+        "sources_checked": sources_checked,
+        "found": True,
         "error": None,
     }
+    if timed_out:
+        result["partial"] = True
+    return result
+
+
+def rank_candidates(
+    company: str,
+    designation: str,
+    items: List[Dict[str, Any]],
+    tier: int,
+    on_event: Optional[EventCallback] = None,
+) -> List[Dict[str, Any]]:
+    with span("ranking"):
+        kept, dropped = rank_results(company, designation, items)
+    if dropped:
+        inc("ranking_dropped_total", len(dropped))
+    emit_event(on_event, "ranking", {"kept": len(kept), "dropped": len(dropped), "tier": tier})
+    return kept
+
+
+def should_escalate(extractions: List[Dict[str, Any]]) -> bool:
+    if has_enough_extractions(extractions):
+        return False
+    return not extractions or _confidence(_agreement(extractions)) < ESCALATION_CONFIDENCE
+
+
+def next_query_tier(tiers: Iterator[Tuple[int, List[str]]]) -> Optional[Tuple[int, List[str]]]:
+    """Build the next tier's queries only when the pipeline escalates to it."""
+    with span("query_build"):
+        return next(tiers, None)
+
+
+def run_pipeline(
+    company: str,
+    designation: str,
+    on_event: Optional[EventCallback] = None,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
+    """Look up who holds designation at company.
+
+    With a deadline (passed in, or set by the caller via deadline_scope) every stage gets a
+    share of the time left, and once it runs out the best candidate so far is returned with
+    partial=True and a reduced confidence_score.
+    """
+    with span("pipeline"), deadline_scope(deadline or current_deadline()), recording_search_failures() as failed_searches:
+        return _run_pipeline(company, designation, on_event, failed_searches)
+
+
+def no_results_error(failed_searches: List[str]) -> str:
+    """"No search results found" (cached as a definitive miss) only when every search was answered."""
+    return "No search results found" if search_available() and not failed_searches else SEARCH_UNAVAILABLE_ERROR
+
+
+def _run_pipeline(company: str, designation: str, on_event: Optional[EventCallback], failed_searches: List[str]) -> Dict[str, Any]:
+    company = (company or "").strip()
+    designation = (designation or "").strip()
     if not company or not designation:
-        empty_result["error"] = "Company and designation are required"
-        return empty_result
+        return empty_result(designation, "Company and designation are required")
     try:
-        queries = build_queries(company, designation)
-        if not queries:
-            empty_result["error"] = "Could not build search queries"
-            return empty_result
-        results = search_multiple_queries(queries)
-        if not results:
-            empty_result["error"] = "No search results found"
-            return empty_result
+        results: List[Dict[str, Any]] = []
         extractions: List[Dict[str, Any]] = []
-        sources_checked = []
-        for item in results:
-            url = (item.get("href") or "").strip()
-            if not url or url in sources_checked:
-                continue
-            title = item.get("title") or ""
-            body = item.get("body") or ""
-            time.sleep(SNIPPET_DELAY)
-            out = extract_from_snippet(company, designation, title, body, url)
-            sources_checked.append(url)
-            if out:
-                extractions.append(out)
-                if len(extractions) >= 3:
-                    break
-        for item in results:
-            if len(extractions) >= 3:
+        sources_checked: List[str] = []
+        candidates: List[Dict[str, Any]] = []
+        dedup = DedupIndex()
+        built_queries = False
+        timed_out = False
+        tiers = iter_query_tiers(company, designation)
+        while not built_queries or should_escalate(extractions):
+            if deadline_expired():
+                timed_out = True
                 break
-            url = (item.get("href") or "").strip()
-            if not url or url in sources_checked:
-                continue
-            if any(e.get("source_url") == url for e in extractions):
+            next_tier = next_query_tier(tiers)
+            if next_tier is None:
+                break
+            tier, queries = next_tier
+            built_queries = True
+            emit_event(on_event, "queries", {"queries": queries, "tier": tier})
+            with stage_budget("search") as budget:
+                found = search_multiple_queries(queries)
+            timed_out = timed_out or (budget is not None and budget.expired)
+            new_items = unique_results(found, dedup, tier, on_event)
+            results.extend(new_items)
+            emit_event(on_event, "search_results", {"count": len(results), "tier": tier})
+            if not new_items:
                 continue
-            time.sleep(PAGE_FETCH_DELAY)
-            out = extract_from_page(company, designation, url)
-            sources_checked.append(url)
-            if out:
-                extractions.append(out)
-        if not extractions:
-            empty_result["current_title"] = designation
-            empty_result["sources_checked"] = sources_checked
-            empty_result["error"] = "Could not extract a name from any source"
-            return empty_result
-        name_counts: Dict[str, List[Dict]] = {}
-        for e in extractions:
-            key = _normalize_name(e.get("first_name", ""), e.get("last_name", ""))
-            if key and len(key) > 1:
-                name_counts.setdefault(key, []).append(e)
-        best_key = None
-        best_count = 0
-        for k, arr in name_counts.items():
-            if len(arr) > best_count:
-                best_count = len(arr)
-                best_key = k
-        if not best_key:
-            chosen = extractions[0]
-        else:
-            candidates = name_counts[best_key]
-            chosen = max(candidates, key=lambda x: _source_credibility_score(x.get("source_url", "")))
-        n_agree = len(name_counts.get(best_key, []))
-        if n_agree >= 2:
-            confidence = min(0.95, 0.6 + 0.15 * n_agree)
-        else:
-            confidence = 0.5
-        return {
-            "first_name": chosen.get("first_name", ""),
-            "last_name": chosen.get("last_name", ""),
-            "current_title": designation,
-            "source_url": chosen.get("source_url", ""),
-            "confidence_score": round(confidence, 2),
-            "sources_checked": sources_checked,
-            "found": True,
-            "error": None,
-        }
+            if not extractions:
+                local = local_extractions(company, designation, results, on_event)
+                if local:
+                    return build_result(designation, *local, timed_out)
+            kept = rank_candidates(company, designation, new_items, tier, on_event)
+            candidates.extend(kept)
+            snippet_tasks = [partial(_snippet_task, company, designation, batch) for batch in snippet_batches(kept)]
+            with span("snippet_extraction"), stage_budget("snippet_extraction"):
+                timed_out = _extract_concurrently(snippet_tasks, extractions, sources_checked, on_event) or timed_out
+        if not built_queries and not timed_out:
+            return empty_result(designation, "Could not build search queries")
+        if not results and not timed_out:
+            return empty_result(designation, no_results_error(failed_searches))
+        page_tasks = [partial(_page_task, company, designation, url, dedup) for url in page_urls(candidates, extractions, sources_checked)]
+        with span("page_extraction"), stage_budget("page_extraction"):
+            timed_out = _extract_concurrently(page_tasks, extractions, sources_checked, on_event) or timed_out
+        if timed_out:
+            emit_event(on_event, "deadline", {"extractions": len(extractions)})
+        return build_result(designation, extractions, sources_checked, timed_out)
     except Exception as e:
         logger.exception("Pipeline error")
-        empty_result["error"] = str(e)
-        return empty_result
+        return empty_result(designation, str(e))
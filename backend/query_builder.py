@@ -1,4 +1,6 @@
-from typing import List
+import re
+from itertools import groupby
+from typing import Iterator, List, Tuple
 
 DESIGNATION_ALIASES = {
     "ceo": "Chief Executive Officer",
@@ -36,22 +38,32 @@ def normalize_designation(designation: str) -> str:
     return d
 
 
-def build_queries(company: str, designation: str) -> List[str]:
+def normalize_company(company: str) -> str:
+    if not company or not company.strip():
+        return ""
+    return re.sub(r"[^\w&]+", " ", company.casefold()).strip()
+
+
+def iter_queries(company: str, designation: str) -> Iterator[Tuple[int, str]]:
     company = (company or "").strip()
     designation = (designation or "").strip()
     if not company or not designation:
-        return []
+        return
     normalized = normalize_designation(designation)
-    variants = list({designation, normalized})
-    queries = []
-    for d in variants[:2]:
+    seen = set()
+    for d in (designation, normalized):
         q = f"{company} {d} name"
-        if q not in queries:
-            queries.append(q)
-    q2 = f"who is {designation} of {company}"
-    if q2 not in queries:
-        queries.append(q2)
-    q3 = f"{company} {designation} LinkedIn"
-    if q3 not in queries and len(queries) < 4:
-        queries.append(q3)
-    return queries[:2] if len(queries) < 2 else queries[:3]
+        if q not in seen:
+            seen.add(q)
+            yield 0, q
+    yield 1, f"who is {designation} of {company}"
+    yield 2, f"{company} {designation} LinkedIn"
+
+
+def iter_query_tiers(company: str, designation: str) -> Iterator[Tuple[int, List[str]]]:
+    for tier, group in groupby(iter_queries(company, designation), key=lambda tq: tq[0]):
+        yield tier, [q for _, q in group]
+
+
+def build_queries(company: str, designation: str) -> List[str]:
+    return [q for _, q in iter_queries(company, designation)][:3]
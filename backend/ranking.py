@@ -0,0 +1,85 @@
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.fast_extractor import NAME_PATTERN, extract_candidates, role_terms, split_name
+from backend.query_builder import normalize_company
+
+CREDIBLE_DOMAINS = ("linkedin.com", "wikipedia.org", "crunchbase.com", "bloomberg.com", "reuters.com", "forbes.com")
+RANKING_ENABLED = os.getenv("RANKING_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+RANKING_TOP_K = int(os.getenv("RANKING_TOP_K", "6"))
+RANKING_MIN_SCORE = float(os.getenv("RANKING_MIN_SCORE", "2.0"))
+
+PROFILE_URL_RE = re.compile(r"linkedin\.com/in/|/(?:people|person|profile)/", re.I)
+TEAM_URL_RE = re.compile(r"/(?:about|team|leadership|management|executives?|board|our-people|who-we-are)\b", re.I)
+NOISE_URL_RE = re.compile(r"/(?:jobs?|careers?|job-listings?|vacancies)\b|indeed\.com|glassdoor\.|/tag/|/search\?", re.I)
+_NAME_RE = re.compile(NAME_PATTERN)
+
+
+def source_credibility_score(url: str) -> int:
+    url_lower = (url or "").lower()
+    for i, d in enumerate(CREDIBLE_DOMAINS):
+        if d in url_lower:
+            return 10 - i
+    return 0
+
+
+def _company_match(words: List[str], text: str) -> float:
+    if not words:
+        return 0.0
+    found = sum(1 for w in words if re.search(rf"\b{re.escape(w)}\b", text))
+    return found / len(words)
+
+
+def _role_match(terms: List[str], text: str) -> bool:
+    return any(re.search(rf"\b{re.escape(t)}\b", text) for t in terms)
+
+
+def _has_person_name(text: str) -> bool:
+    return any(split_name(m.group("name")) for m in _NAME_RE.finditer(text))
+
+
+def score_result(company: str, designation: str, result: Dict[str, Any]) -> float:
+    title = result.get("title") or ""
+    body = result.get("body") or ""
+    url = (result.get("href") or "").strip()
+    words = normalize_company(company).split()
+    terms = role_terms(designation)
+    title_lower, body_lower = title.casefold(), body.casefold()
+
+    score = max(3.0 * _company_match(words, title_lower), 2.0 * _company_match(words, body_lower))
+    if _role_match(terms, title_lower):
+        score += 2.0
+    elif _role_match(terms, body_lower):
+        score += 1.5
+    score += source_credibility_score(url) / 5.0
+    if _has_person_name(f"{title}\n{body}"):
+        score += 1.0
+    if extract_candidates(company, designation, f"{title}\n{body}"):
+        score += 2.0
+    if PROFILE_URL_RE.search(url):
+        score += 1.5
+    elif TEAM_URL_RE.search(url):
+        score += 1.0
+    if NOISE_URL_RE.search(url):
+        score -= 1.5
+    return round(score, 2)
+
+
+def rank_results(
+    company: str,
+    designation: str,
+    results: List[Dict[str, Any]],
+    top_k: Optional[int] = None,
+    min_score: Optional[float] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Return (kept, dropped): the top-K results at or above min_score, best first, and the rest."""
+    if not RANKING_ENABLED:
+        return list(results), []
+    top_k = RANKING_TOP_K if top_k is None else top_k
+    min_score = RANKING_MIN_SCORE if min_score is None else min_score
+    scored = [(score_result(company, designation, r), i, r) for i, r in enumerate(results)]
+    scored.sort(key=lambda s: (-s[0], s[1]))
+    kept = [r for score, _, r in scored if score >= min_score][: max(0, top_k)]
+    kept_ids = {id(r) for r in kept}
+    return kept, [r for _, _, r in scored if id(r) not in kept_ids]
@@ -0,0 +1,130 @@
+import os
+import asyncio
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+PROVIDER_LIMITS = {
+    "ddg": (2.0, 2),
+    "groq": (4.0, 4),
+    "page": (1.0, 2),
+}
+DEFAULT_LIMIT = (1.0, 1)
+MIN_RATE_FRACTION = 0.125
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "2048"))
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = float(rate)
+        self.base_rate = self.rate
+        self.capacity = max(1.0, float(capacity))
+        self.throttled = 0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._backoffs = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def throttle(self, retry_after: Optional[float] = None) -> float:
+        """The provider pushed back: halve the rate and pause for retry_after, or a jittered backoff."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate / 2)
+            self._backoffs += 1
+            self.throttled += 1
+            if retry_after is None:
+                retry_after = random.uniform(0.5, 1.0) * min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self._backoffs - 1))
+            self._paused_until = max(self._paused_until, now + retry_after)
+            self._tokens = 0.0
+            return retry_after
+
+    def relax(self) -> None:
+        """A call went through: win back a tenth of the configured rate."""
+        with self._lock:
+            self._backoffs = 0
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * 0.1)
+
+    def paused_for(self) -> float:
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            if self.rate <= 0:
+                return float("inf")
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or wait > remaining:
+                    return False
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or wait > remaining:
+                    return False
+            await asyncio.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_keyed: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+_buckets_lock = threading.Lock()
+
+
+def _new_bucket(provider: str) -> TokenBucket:
+    rate, capacity = PROVIDER_LIMITS.get(provider, DEFAULT_LIMIT)
+    override = os.getenv(f"{provider.upper()}_MAX_RPS", "").strip()
+    if override:
+        rate = float(override)
+        capacity = max(1.0, rate)
+    return TokenBucket(rate, capacity)
+
+
+def get_rate_limiter(provider: str, key: str = "") -> TokenBucket:
+    """The provider's bucket, or one per key (page host); only the RATE_LIMIT_MAX_KEYS most recent keys are kept."""
+    with _buckets_lock:
+        if not key:
+            bucket = _buckets.get(provider)
+            if bucket is None:
+                bucket = _buckets[provider] = _new_bucket(provider)
+            return bucket
+        bucket = _keyed.get((provider, key))
+        if bucket is None:
+            bucket = _keyed[(provider, key)] = _new_bucket(provider)
+            while len(_keyed) > RATE_LIMIT_MAX_KEYS:
+                _keyed.popitem(last=False)
+        else:
+            _keyed.move_to_end((provider, key))
+        return bucket
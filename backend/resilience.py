@@ -0,0 +1,249 @@
+import os
+import random
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
+
+import requests
+
+from backend.deadline import DeadlineExceeded
+from backend.metrics import inc
+from backend.rate_limiter import TokenBucket
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+BREAKER_MAX_RESET_TIMEOUT = float(os.getenv("BREAKER_MAX_RESET_TIMEOUT", "300"))
+HOST_FAILURE_THRESHOLD = int(os.getenv("HOST_FAILURE_THRESHOLD", "2"))
+HOST_PENALTY_SECONDS = float(os.getenv("HOST_PENALTY_SECONDS", "60"))
+HOST_PENALTY_MAX_HOSTS = int(os.getenv("HOST_PENALTY_MAX_HOSTS", "2048"))
+MAX_RETRY_AFTER = 600.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Status codes that mean the dependency is pushing back; the limiter slows down, the breaker is not charged.
+THROTTLE_STATUSES = (429, 503)
+
+# (module, exception names) raised when a dependency cannot be reached or does not answer in time.
+NETWORK_ERRORS = (
+    ("openai", ("APIConnectionError",)),
+    ("httpx2", ("TransportError",)),
+    ("httpx", ("TransportError",)),
+    ("ddgs.exceptions", ("TimeoutException",)),
+)
+
+
+class CircuitOpen(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} unavailable, retrying in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Closed until failure_threshold calls fail in a row, then open (failing fast) for a
+    jittered reset timeout that doubles each time the half-open probe fails again."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        max_reset_timeout: float = BREAKER_MAX_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max(reset_timeout, max_reset_timeout)
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            inc("breaker_transitions_total", breaker=self.name.split(":", 1)[0], state=state)
+
+    def retry_after(self) -> float:
+        return max(0.0, self._open_until - time.monotonic())
+
+    @property
+    def available(self) -> bool:
+        """True unless open with time left; does not claim the half-open probe."""
+        return self.state != OPEN or time.monotonic() >= self._open_until
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN and time.monotonic() >= self._open_until:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self._probing):
+                self._probing = self.state == HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trips = 0
+            self._probing = False
+            self._transition(CLOSED)
+
+    def record_neutral(self) -> None:
+        """The call ended without saying anything about the dependency; free the probe slot."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state != HALF_OPEN and self.failures < self.failure_threshold:
+                return
+            backoff = min(self.max_reset_timeout, self.reset_timeout * 2 ** self._trips) * random.uniform(0.8, 1.2)
+            self._open_until = time.monotonic() + max(backoff, retry_after or 0.0)
+            self._trips += 1
+            self.opened += 1
+            self._transition(OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_after_s": round(self.retry_after(), 1) if self.state == OPEN else 0.0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_hosts: "OrderedDict[str, CircuitBreaker]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def get_host_breaker(host: str) -> CircuitBreaker:
+    """Per-host penalty box: a couple of timeouts in a row and the host is skipped for a while."""
+    with _lock:
+        breaker = _hosts.get(host)
+        if breaker is None:
+            breaker = _hosts[host] = CircuitBreaker(
+                f"host:{host}", HOST_FAILURE_THRESHOLD, HOST_PENALTY_SECONDS, HOST_PENALTY_SECONDS * 8
+            )
+            while len(_hosts) > HOST_PENALTY_MAX_HOSTS:
+                _hosts.popitem(last=False)
+        else:
+            _hosts.move_to_end(host)
+        return breaker
+
+
+def _parse_retry_after(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(MAX_RETRY_AFTER, max(0.0, seconds))
+
+
+def _retry_after_header(headers: Any) -> Optional[float]:
+    if not headers:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms is not None:
+        try:
+            return min(MAX_RETRY_AFTER, max(0.0, float(ms) / 1000.0))
+        except ValueError:
+            return None
+    return _parse_retry_after(headers.get("retry-after"))
+
+
+@lru_cache(maxsize=None)
+def _network_errors() -> Tuple[Type[BaseException], ...]:
+    errors = [ConnectionError, TimeoutError, requests.ConnectionError, requests.Timeout]
+    for module, names in NETWORK_ERRORS:
+        try:
+            mod = importlib.import_module(module)
+        except ImportError:
+            continue
+        errors.extend(getattr(mod, name) for name in names if hasattr(mod, name))
+    return tuple(errors)
+
+
+def classify(error: BaseException) -> Tuple[bool, bool, Optional[float]]:
+    """(failure, throttled, retry_after) for an exception raised by a requests, httpx, openai or ddgs call.
+
+    Only connection errors, timeouts (including 408) and 5xx count against the dependency.
+    429/503 and DuckDuckGo rate limits throttle the limiter; anything else, such as a 404,
+    a bad request, our own deadline or a bug on this side, says nothing about its health.
+    """
+    if isinstance(error, (DeadlineExceeded, CircuitOpen)):
+        return False, False, None
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if isinstance(status, int):
+        retry_after = _retry_after_header(getattr(response, "headers", None))
+        throttled = status in THROTTLE_STATUSES
+        return not throttled and (status >= 500 or status == 408), throttled, retry_after
+    if "ratelimit" in type(error).__name__.lower():
+        return False, True, None
+    return isinstance(error, _network_errors()), False, None
+
+
+@contextmanager
+def guarded(breaker: CircuitBreaker, limiter: Optional[TokenBucket] = None) -> Iterator[None]:
+    """Fail fast with CircuitOpen while breaker is open; otherwise feed the call's outcome back
+    into the breaker. When the dependency pushes back (429/503, DDG rate limit) limiter is
+    slowed down and paused for Retry-After, or a jittered backoff, so queued callers wait it out."""
+    if not breaker.allow():
+        inc("breaker_rejected_total", breaker=breaker.name.split(":", 1)[0])
+        raise CircuitOpen(breaker.name, breaker.retry_after())
+    try:
+        yield
+    except BaseException as e:
+        failure, throttled, retry_after = classify(e) if isinstance(e, Exception) else (False, False, None)
+        if throttled and limiter is not None:
+            retry_after = limiter.throttle(retry_after)
+        if failure:
+            breaker.record_failure(retry_after)
+        else:
+            breaker.record_neutral()
+        raise
+    breaker.record_success()
+    if limiter is not None:
+        limiter.relax()
+
+
+def breaker_stats() -> Dict[str, Any]:
+    with _lock:
+        breakers = list(_breakers.values())
+        hosts = list(_hosts.items())
+    penalized = sorted(host for host, b in hosts if not b.available)
+    return {
+        **{b.name: b.stats() for b in breakers},
+        "hosts": {"tracked": len(hosts), "penalized": len(penalized), "penalized_hosts": penalized[:20]},
+    }
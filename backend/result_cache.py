@@ -0,0 +1,153 @@
+import os
+import copy
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from backend.blocking import run_blocking
+from backend.cache import CACHE_DIR, SQLiteCache
+from backend.deadline import DEADLINE_ERROR, DeadlineExceeded, deadline_expired
+from backend.entity_index import remember, resolve
+from backend.query_builder import normalize_company, normalize_designation
+from backend.singleflight import get_singleflight
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", str(CACHE_DIR / "results.sqlite3"))
+RESULT_CACHE_TTL_FOUND = float(os.getenv("RESULT_CACHE_TTL_FOUND", str(7 * 24 * 3600)))
+RESULT_CACHE_TTL_NOT_FOUND = float(os.getenv("RESULT_CACHE_TTL_NOT_FOUND", "3600"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "5000"))
+
+NOT_FOUND_ERRORS = (
+    "No search results found",
+    "Could not extract a name from any source",
+)
+
+_cache: Optional[SQLiteCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> SQLiteCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SQLiteCache(RESULT_CACHE_PATH, table="lookup_results", max_entries=RESULT_CACHE_MAX_ENTRIES)
+        return _cache
+
+
+def lookup_key(company: str, designation: str) -> str:
+    return f"{normalize_company(company)}|{normalize_designation(designation).lower()}"
+
+
+def is_definitive(result: Dict[str, Any]) -> bool:
+    """True for a complete found or not-found answer; False for partial results and transient errors."""
+    if result.get("partial"):
+        return False
+    return bool(result.get("found")) or not result.get("error") or result.get("error") in NOT_FOUND_ERRORS
+
+
+def _ttl_for(result: Dict[str, Any]) -> float:
+    if not is_definitive(result):
+        return 0
+    return RESULT_CACHE_TTL_FOUND if result.get("found") else RESULT_CACHE_TTL_NOT_FOUND
+
+
+def _deadline_result(designation: str) -> Dict[str, Any]:
+    return {
+        "first_name": "",
+        "last_name": "",
+        "current_title": designation,
+        "source_url": "",
+        "confidence_score": 0.0,
+        "sources_checked": [],
+        "found": False,
+        "error": DEADLINE_ERROR,
+        "partial": True,
+    }
+
+
+def _cache_get(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        return get_result_cache().get(key)
+    except Exception as e:
+        logger.warning("Result cache read failed: %s", e)
+        return None
+
+
+def _cache_set(key: str, result: Dict[str, Any]) -> None:
+    try:
+        get_result_cache().set(key, result, _ttl_for(result))
+    except Exception as e:
+        logger.warning("Result cache write failed: %s", e)
+
+
+def cached_lookup(
+    company: str,
+    designation: str,
+    compute: Callable[[str, str], Dict[str, Any]],
+) -> Tuple[Dict[str, Any], bool]:
+    key = lookup_key(company, designation)
+    if RESULT_CACHE_ENABLED:
+        cached = _cache_get(key)
+        if cached is not None:
+            cached["current_title"] = designation
+            return cached, True
+    resolved = resolve(company, designation)
+    if resolved is not None:
+        return resolved, True
+
+    def compute_and_store() -> Dict[str, Any]:
+        result = compute(company, designation)
+        if RESULT_CACHE_ENABLED:
+            _cache_set(key, result)
+        remember(company, designation, result)
+        return result
+
+    lookups = get_singleflight("lookup")
+    try:
+        result, coalesced = lookups.do(key, compute_and_store)
+        if coalesced and result.get("partial") and not deadline_expired():
+            # The lookup we joined ran out of its own, tighter deadline; ours still has time.
+            result, coalesced = lookups.do(key, compute_and_store)
+    except DeadlineExceeded:
+        return _deadline_result(designation), False
+    result = copy.deepcopy(result)
+    if coalesced:
+        result["current_title"] = designation
+    return result, False
+
+
+async def cached_lookup_async(
+    company: str,
+    designation: str,
+    compute: Callable[[str, str], Awaitable[Dict[str, Any]]],
+) -> Tuple[Dict[str, Any], bool]:
+    key = lookup_key(company, designation)
+    if RESULT_CACHE_ENABLED:
+        cached = await run_blocking(_cache_get, key)
+        if cached is not None:
+            cached["current_title"] = designation
+            return cached, True
+    resolved = await run_blocking(resolve, company, designation)
+    if resolved is not None:
+        return resolved, True
+
+    async def compute_and_store() -> Dict[str, Any]:
+        result = await compute(company, designation)
+        if RESULT_CACHE_ENABLED:
+            await run_blocking(_cache_set, key, result)
+        await run_blocking(remember, company, designation, result)
+        return result
+
+    lookups = get_singleflight("lookup")
+    try:
+        result, coalesced = await lookups.do_async(key, compute_and_store)
+        if coalesced and result.get("partial") and not deadline_expired():
+            result, coalesced = await lookups.do_async(key, compute_and_store)
+    except DeadlineExceeded:
+        return _deadline_result(designation), False
+    result = copy.deepcopy(result)
+    if coalesced:
+        result["current_title"] = designation
+    return result, False
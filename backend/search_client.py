@@ -1,16 +1,42 @@
+import os
 import time
+import asyncio
 import logging
+import contextvars
 import warnings
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional
+
+from backend.blocking import run_blocking
+from backend.cache import CACHE_DIR, SQLiteCache
+from backend.deadline import DeadlineExceeded, deadline_expired, time_left
+from backend.metrics import bind, inc, span
+from backend.rate_limiter import get_rate_limiter
+from backend.resilience import CircuitOpen, get_breaker, guarded
+from backend.singleflight import get_singleflight
 
 logger = logging.getLogger(__name__)
 warnings.filterwarnings("ignore", message=".*duckduckgo_search.*renamed.*ddgs.*")
 
 RATE_LIMIT_DELAY = 1.0
 MAX_RESULTS_PER_QUERY = 8
+DDG_TIMEOUT = float(os.getenv("DDG_TIMEOUT", "5"))
+SEARCH_PARALLEL = os.getenv("SEARCH_PARALLEL", "1").strip().lower() in ("1", "true", "yes")
+SEARCH_WORKERS = 3
+SEARCH_SESSIONS = int(os.getenv("SEARCH_SESSIONS", "8"))
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", str(CACHE_DIR / "search.sqlite3"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(6 * 3600)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "20000"))
+
+_search_cache: Optional[SQLiteCache] = None
+_failed_queries: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar("failed_search_queries", default=None)
+_search_cache_lock = threading.Lock()
 
 
-def _normalize_result(r: dict) -> dict:
+def normalize_result(r: dict) -> dict:
     return {
         "title": r.get("title", "") or "",
         "href": r.get("href", r.get("url", r.get("link", ""))) or "",
@@ -18,24 +44,254 @@ def _normalize_result(r: dict) -> dict:
     }
 
 
-def _ddg_search(query: str) -> List[Dict[str, Any]]:
+def search_available() -> bool:
+    return get_breaker("ddg").available
+
+
+def _ddg_search(query: str, session=None) -> Optional[List[Dict[str, Any]]]:
+    """Results for query, [] when DuckDuckGo has none, None when it could not be asked or failed."""
     try:
-        from ddgs import DDGS
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=MAX_RESULTS_PER_QUERY))
-        return [_normalize_result(r) for r in results]
+        with guarded(get_breaker("ddg"), get_rate_limiter("ddg")), span("search"):
+            if session is not None:
+                results = list(session.text(query, max_results=MAX_RESULTS_PER_QUERY))
+            else:
+                from ddgs import DDGS
+                with DDGS(timeout=_ddg_timeout()) as ddgs:
+                    results = list(ddgs.text(query, max_results=MAX_RESULTS_PER_QUERY))
+        inc("search_requests_total")
+        return [normalize_result(r) for r in results]
+    except CircuitOpen as e:
+        logger.info("Skipping search for %s: %s", query, e)
+        return None
     except Exception as e:
         logger.warning("DuckDuckGo search failed for %s: %s", query, e)
+        return None
+
+
+def _get_search_cache() -> SQLiteCache:
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SQLiteCache(SEARCH_CACHE_PATH, table="search_results", max_entries=SEARCH_CACHE_MAX_ENTRIES)
+        return _search_cache
+
+
+def _search_cache_key(query: str) -> str:
+    return f"{' '.join(query.casefold().split())}|{MAX_RESULTS_PER_QUERY}"
+
+
+def _cache_lookup(query: str) -> Optional[List[Dict[str, Any]]]:
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    try:
+        return _get_search_cache().get(_search_cache_key(query))
+    except Exception as e:
+        logger.warning("Search cache read failed: %s", e)
+        return None
+
+
+def _cache_store(query: str, items: Optional[List[Dict[str, Any]]]) -> None:
+    if not SEARCH_CACHE_ENABLED or not items:
+        return
+    try:
+        _get_search_cache().set(_search_cache_key(query), items, SEARCH_CACHE_TTL)
+    except Exception as e:
+        logger.warning("Search cache write failed: %s", e)
+
+
+def search_cache_stats() -> Optional[Dict[str, Any]]:
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    return _get_search_cache().stats()
+
+
+def _ddg_timeout() -> int:
+    return max(1, int(time_left(DDG_TIMEOUT)))
+
+
+def _open_session():
+    try:
+        from ddgs import DDGS
+        return DDGS(timeout=max(1, int(DDG_TIMEOUT)))
+    except Exception as e:
+        logger.warning("Could not open DuckDuckGo session: %s", e)
+        return None
+
+
+def _close_session(session) -> None:
+    if hasattr(session, "__exit__"):
+        try:
+            session.__exit__(None, None, None)
+        except Exception as e:
+            logger.debug("Closing DuckDuckGo session failed: %s", e)
+
+
+class _SessionPool:
+    """Process-wide pool of DDGS sessions, reused across queries and requests.
+
+    DDGS makes no thread-safety promises, so a session is checked out by one search at a time
+    and handed back when that search returns, even if the caller stopped waiting for it at its
+    deadline. Sessions beyond max_idle are closed on return, never while a search is using them.
+    """
+
+    def __init__(self, max_idle: int = SEARCH_SESSIONS):
+        self.max_idle = max(0, max_idle)
+        self.opened = 0
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def session(self) -> Iterator[Any]:
+        with self._lock:
+            session = self._idle.pop() if self._idle else None
+        if session is None:
+            session = _open_session()
+            if session is not None:
+                with self._lock:
+                    self.opened += 1
+        try:
+            yield session
+        finally:
+            if session is not None:
+                with self._lock:
+                    keep = len(self._idle) < self.max_idle
+                    if keep:
+                        self._idle.append(session)
+                if not keep:
+                    _close_session(session)
+
+
+_sessions = _SessionPool()
+
+
+@contextmanager
+def recording_search_failures() -> Iterator[List[str]]:
+    """Collect the queries in this block that got no answer from DuckDuckGo (an error, an open
+    breaker, no rate-limit token or no time left), as opposed to an answer with no results."""
+    failed: List[str] = []
+    token = _failed_queries.set(failed)
+    try:
+        yield failed
+    finally:
+        _failed_queries.reset(token)
+
+
+def _search_failed(query: str) -> List[Dict[str, Any]]:
+    failed = _failed_queries.get()
+    if failed is not None:
+        failed.append(query)
+    return []
+
+
+def _search_and_store(query: str, limited: bool = True) -> Optional[List[Dict[str, Any]]]:
+    if not search_available():
+        return None
+    if limited:
+        with span("rate_limit_wait", provider="ddg"):
+            acquired = get_rate_limiter("ddg").acquire(timeout=time_left())
+        if not acquired:
+            return None
+    if deadline_expired():
+        return None
+    with _sessions.session() as session:
+        items = _ddg_search(query, session)
+    _cache_store(query, items)
+    return items
+
+
+def _coalesced_search(query: str, limited: bool = True) -> List[Dict[str, Any]]:
+    try:
+        items, _ = get_singleflight("search").do(
+            _search_cache_key(query),
+            lambda: _search_and_store(query, limited),
+        )
+    except DeadlineExceeded:
+        return _search_failed(query)
+    if items is None:
+        return _search_failed(query)
+    return list(items)
+
+
+def _limited_search(query: str) -> List[Dict[str, Any]]:
+    cached = _cache_lookup(query)
+    if cached is not None:
+        return cached
+    return _coalesced_search(query)
+
+
+def iter_search_results(queries: List[str]) -> Iterator[Dict[str, Any]]:
+    if not queries:
+        return
+    seen_urls = set()
+    executor = ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(queries)))
+    try:
+        futures = [executor.submit(bind(_limited_search), q) for q in queries]
+        for n, future in enumerate(futures):
+            try:
+                items = future.result(timeout=time_left())
+            except FutureTimeoutError:
+                logger.warning("Search stopped at the request deadline")
+                for query in queries[n:]:
+                    _search_failed(query)
+                return
+            for item in items:
+                url = (item.get("href") or "").strip()
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    yield item
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _search_async(query: str) -> List[Dict[str, Any]]:
+    cached = await run_blocking(_cache_lookup, query)
+    if cached is not None:
+        return cached
+    if not search_available():
+        return _search_failed(query)
+    with span("rate_limit_wait", provider="ddg"):
+        acquired = await get_rate_limiter("ddg").acquire_async(timeout=time_left())
+    if not acquired:
+        return _search_failed(query)
+    return await run_blocking(_coalesced_search, query, False)
+
+
+async def search_multiple_queries_async(queries: List[str]) -> List[Dict[str, Any]]:
+    if not queries:
         return []
+    tasks = [asyncio.ensure_future(_search_async(q)) for q in queries]
+    seen_urls = set()
+    combined = []
+    try:
+        for task in tasks:
+            for item in await task:
+                url = (item.get("href") or "").strip()
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    combined.append(item)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+    return combined
 
 
-def search_multiple_queries(queries: List[str]) -> List[Dict[str, Any]]:
+def search_multiple_queries(queries: List[str], parallel: Optional[bool] = None) -> List[Dict[str, Any]]:
+    if SEARCH_PARALLEL if parallel is None else parallel:
+        return list(iter_search_results(queries))
     seen_urls = set()
     combined = []
-    for i, q in enumerate(queries):
-        if i > 0:
-            time.sleep(RATE_LIMIT_DELAY)
-        items = _ddg_search(q)
+    searched = False
+    for q in queries:
+        items = _cache_lookup(q)
+        if items is None:
+            if searched:
+                if time_left(RATE_LIMIT_DELAY) < RATE_LIMIT_DELAY:
+                    break
+                with span("search_delay"):
+                    time.sleep(RATE_LIMIT_DELAY)
+            items = _coalesced_search(q, limited=False)
+            searched = True
         for item in items:
             url = (item.get("href") or "").strip()
             if url and url not in seen_urls:
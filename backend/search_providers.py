@@ -0,0 +1,163 @@
+import os
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from backend import search_client
+from backend.blocking import run_blocking
+from backend.local_index import LOCAL_INDEX_PATH, LocalIndex, get_local_index
+from backend.metrics import bind, inc, span
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PROVIDERS = [p.strip().lower() for p in os.getenv("SEARCH_PROVIDERS", "ddg").split(",") if p.strip()]
+SEARCH_STRATEGY = os.getenv("SEARCH_STRATEGY", "fallback").strip().lower()
+
+
+class SearchProvider(ABC):
+    """One search backend. search_many returns deduplicated normalize_result dicts
+    (title, href, body) for a list of queries, in the order the queries were given."""
+
+    name: str
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def search_many(self, queries: List[str]) -> List[Dict[str, Any]]:
+        ...
+
+    async def search_many_async(self, queries: List[str]) -> List[Dict[str, Any]]:
+        return await run_blocking(self.search_many, queries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"available": self.available()}
+
+
+class DDGProvider(SearchProvider):
+    name = "ddg"
+
+    def available(self) -> bool:
+        return search_client.search_available()
+
+    def search_many(self, queries: List[str]) -> List[Dict[str, Any]]:
+        return search_client.search_multiple_queries(queries)
+
+    async def search_many_async(self, queries: List[str]) -> List[Dict[str, Any]]:
+        return await search_client.search_multiple_queries_async(queries)
+
+
+class LocalIndexProvider(SearchProvider):
+    """BM25 over a corpus indexed offline with `python -m backend.local_index build`."""
+
+    name = "local"
+
+    def __init__(self, index: LocalIndex):
+        self.index = index
+
+    def search_many(self, queries: List[str]) -> List[Dict[str, Any]]:
+        return _merge([self.index.search(q) for q in queries])
+
+    async def search_many_async(self, queries: List[str]) -> List[Dict[str, Any]]:
+        # Sub-millisecond per query; a thread hop would cost more than the lookup.
+        return self.search_many(queries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"available": True, **self.index.stats()}
+
+
+def _merge(result_lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Interleave result lists round-robin, keeping the first occurrence of each URL."""
+    seen_urls = set()
+    merged = []
+    for rank in range(max((len(results) for results in result_lists), default=0)):
+        for results in result_lists:
+            if rank < len(results):
+                url = (results[rank].get("href") or "").strip()
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    merged.append(results[rank])
+    return merged
+
+
+_providers: Optional[List[SearchProvider]] = None
+_providers_lock = threading.Lock()
+
+
+def _build_provider(name: str) -> Optional[SearchProvider]:
+    if name == "ddg":
+        return DDGProvider()
+    if name == "local":
+        index = get_local_index()
+        if index is None:
+            logger.warning("SEARCH_PROVIDERS includes local but %s does not exist; skipping it", LOCAL_INDEX_PATH)
+            return None
+        return LocalIndexProvider(index)
+    logger.warning("Unknown search provider %r in SEARCH_PROVIDERS", name)
+    return None
+
+
+def get_providers() -> List[SearchProvider]:
+    global _providers
+    with _providers_lock:
+        if _providers is None:
+            _providers = [p for p in map(_build_provider, SEARCH_PROVIDERS) if p is not None] or [DDGProvider()]
+        return _providers
+
+
+def _run(provider: SearchProvider, queries: List[str]) -> List[Dict[str, Any]]:
+    with span("search_provider", provider=provider.name):
+        results = provider.search_many(queries)
+    inc("search_provider_results_total", len(results), provider=provider.name)
+    return results
+
+
+async def _run_async(provider: SearchProvider, queries: List[str]) -> List[Dict[str, Any]]:
+    with span("search_provider", provider=provider.name):
+        results = await provider.search_many_async(queries)
+    inc("search_provider_results_total", len(results), provider=provider.name)
+    return results
+
+
+def search_multiple_queries(queries: List[str]) -> List[Dict[str, Any]]:
+    """Search with the configured providers. "fallback" asks them in order and stops at the
+    first that returns anything; "fanout" asks all of them at once and interleaves the results."""
+    providers = [p for p in get_providers() if p.available()]
+    if not queries or not providers:
+        return []
+    if SEARCH_STRATEGY == "fanout" and len(providers) > 1:
+        with ThreadPoolExecutor(max_workers=len(providers)) as executor:
+            futures = [executor.submit(bind(_run), p, queries) for p in providers]
+            return _merge([f.result() for f in futures])
+    for provider in providers:
+        results = _run(provider, queries)
+        if results:
+            return results
+    return []
+
+
+async def search_multiple_queries_async(queries: List[str]) -> List[Dict[str, Any]]:
+    providers = [p for p in get_providers() if p.available()]
+    if not queries or not providers:
+        return []
+    if SEARCH_STRATEGY == "fanout" and len(providers) > 1:
+        return _merge(await asyncio.gather(*(_run_async(p, queries) for p in providers)))
+    for provider in providers:
+        results = await _run_async(provider, queries)
+        if results:
+            return results
+    return []
+
+
+def search_available() -> bool:
+    return any(p.available() for p in get_providers())
+
+
+def provider_stats() -> Dict[str, Any]:
+    return {
+        "strategy": SEARCH_STRATEGY,
+        "providers": {p.name: p.stats() for p in get_providers()},
+    }
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from backend.deadline import DeadlineExceeded, time_left
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self.executed = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(fn's result, coalesced). Callers that join an in-flight call wait for it only until
+        their own deadline and raise DeadlineExceeded if it has not finished by then."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+        if not leader:
+            if not call.done.wait(time_left()):
+                raise DeadlineExceeded(f"deadline passed while waiting for a shared {self.name} call")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """do() for coroutines: callers on the same event loop share one in-flight await of fn."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            shared = self._async_calls.get(key)
+            leader = shared is None or shared.get_loop() is not loop
+            if leader:
+                shared = self._async_calls[key] = loop.create_future()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            try:
+                return await asyncio.wait_for(asyncio.shield(shared), time_left()), True
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"deadline passed while waiting for a shared {self.name} call") from None
+            except asyncio.CancelledError:
+                if not shared.cancelled():
+                    raise
+            # The leader was cancelled (its client went away); run it ourselves.
+            return await fn(), False
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except BaseException as e:
+            shared.set_exception(e)
+            shared.exception()  # followers re-raise it; without any, do not log "never retrieved"
+            raise
+        else:
+            shared.set_result(result)
+        finally:
+            with self._lock:
+                if self._async_calls.get(key) is shared:
+                    del self._async_calls[key]
+        return result, False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            inflight = len(self._calls) + len(self._async_calls)
+        return {"executed": self.executed, "coalesced": self.coalesced, "inflight": inflight}
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = SingleFlight(name)
+            _groups[name] = group
+        return group
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {g.name: g.stats() for g in groups}
@@ -0,0 +1,80 @@
+import os
+import re
+from typing import List, Optional, Tuple
+
+from backend.fast_extractor import company_pattern, role_pattern
+
+COMPACTION_ENABLED = os.getenv("COMPACTION_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+COMPACTION_TOKEN_BUDGET = int(os.getenv("COMPACTION_TOKEN_BUDGET", "600"))
+COMPACTION_WINDOW_CHARS = int(os.getenv("COMPACTION_WINDOW_CHARS", "300"))
+CHARS_PER_TOKEN = 4
+SEPARATOR = " … "
+
+
+def _hits(pattern: str, text: str) -> List[int]:
+    if not pattern:
+        return []
+    return [m.start() for m in re.finditer(pattern, text, re.I)]
+
+
+def _snap(text: str, start: int, end: int) -> Tuple[int, int]:
+    if start > 0:
+        space = text.rfind(" ", 0, start)
+        start = space + 1 if space >= 0 else 0
+    if end < len(text):
+        space = text.find(" ", end)
+        end = space if space >= 0 else len(text)
+    return start, end
+
+
+def _windows(text: str, company: str, designation: str, window: int) -> List[Tuple[int, int, int, int]]:
+    """Candidate (priority, start, end, hit) windows; role mentions near the company rank first."""
+    role = role_pattern(designation)
+    role_hits = _hits(rf"\b(?:{role})\b", text) if role else []
+    company_hits = _hits(company_pattern(company), text)
+    windows = []
+    for pos in role_hits:
+        near_company = any(abs(pos - c) <= window for c in company_hits)
+        windows.append((0 if near_company else 1, pos - window, pos + window, pos))
+    for pos in company_hits:
+        windows.append((2, pos - window // 2, pos + window // 2, pos))
+    return sorted(windows, key=lambda w: (w[0], w[1]))
+
+
+def _merge(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compact_text(
+    text: str,
+    company: str,
+    designation: str,
+    budget_tokens: Optional[int] = None,
+    window_chars: Optional[int] = None,
+) -> str:
+    """Keep only the passages around company and role mentions, within roughly budget_tokens."""
+    budget = (COMPACTION_TOKEN_BUDGET if budget_tokens is None else budget_tokens) * CHARS_PER_TOKEN
+    window = COMPACTION_WINDOW_CHARS if window_chars is None else window_chars
+    if not COMPACTION_ENABLED or not text or budget <= 0 or len(text) <= budget:
+        return text
+    chosen: List[Tuple[int, int]] = []
+    used = 0
+    for _, start, end, hit in _windows(text, company, designation, window):
+        start, end = _snap(text, max(0, start), min(len(text), end))
+        merged = _merge(chosen + [(start, end)])
+        size = sum(e - s for s, e in merged) + len(SEPARATOR) * (len(merged) - 1)
+        if size > budget:
+            if used:
+                continue
+            start = max(0, hit - budget // 2)
+            merged, size = [(start, start + budget)], budget
+        chosen, used = merged, size
+    if not chosen:
+        return text[:budget]
+    return SEPARATOR.join(text[s:e].strip() for s, e in chosen)
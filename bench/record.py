@@ -0,0 +1,55 @@
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from bench.replay import FIXTURES_PATH, page_name
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record live search results and pages as benchmark fixtures.")
+    parser.add_argument("input", help="CSV or XLSX file with company and designation/title columns (and optional answer column)")
+    parser.add_argument("-o", "--output", default=str(FIXTURES_PATH))
+    parser.add_argument("--pages", type=int, default=2, help="Pages to record per lookup")
+    args = parser.parse_args(argv)
+
+    from backend.batch import iter_input_rows
+    from backend.http_transport import http_get
+    from backend.query_builder import iter_queries
+    from backend.search_client import _ddg_search
+
+    lookups = []
+    pages = {}
+    for _, company, designation in iter_input_rows(args.input):
+        searches = {}
+        for _, query in iter_queries(company, designation):
+            searches[query] = _ddg_search(query)
+        urls = list(dict.fromkeys(r["href"] for results in searches.values() for r in results if r.get("href")))
+        for url in urls[: args.pages]:
+            try:
+                resp = http_get(url)
+                resp.raise_for_status()
+            except Exception as e:
+                logging.warning("Could not record %s: %s", url, e)
+                continue
+            name = page_name(url)
+            pages[name] = resp.text
+            for results in searches.values():
+                for r in results:
+                    if r.get("href") == url:
+                        r["href"] = "{pages}/" + name
+        lookups.append({"company": company, "designation": designation, "answer": "", "searches": searches})
+        logging.info("Recorded %s / %s", company, designation)
+
+    with open(args.output, "w", encoding="utf-8") as fp:
+        json.dump({"lookups": lookups, "pages": pages}, fp, indent=2)
+    print(f"Wrote {len(lookups)} lookups and {len(pages)} pages to {args.output}; fill in 'answer' for each lookup.")
+    return 0
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
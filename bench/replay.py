@@ -0,0 +1,55 @@
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+FIXTURES_PATH = Path(__file__).resolve().parent / "fixtures" / "recorded.json"
+
+
+def _query_key(query: str) -> str:
+    return " ".join((query or "").casefold().split())
+
+
+class Fixtures:
+    def __init__(self, path: str = str(FIXTURES_PATH)):
+        with open(path, encoding="utf-8") as fp:
+            data = json.load(fp)
+        self.lookups: List[Dict[str, Any]] = data.get("lookups", [])
+        self.pages: Dict[str, str] = data.get("pages", {})
+        self.searches: Dict[str, List[Dict[str, Any]]] = {}
+        for lookup in self.lookups:
+            for query, results in lookup.get("searches", {}).items():
+                self.searches[_query_key(query)] = results
+
+    def answers(self) -> Dict[str, str]:
+        return {
+            f"{l['company'].strip().lower()}|{l['designation'].strip().lower()}": l["answer"]
+            for l in self.lookups
+            if l.get("answer")
+        }
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        return [(l["company"], l["designation"]) for l in self.lookups]
+
+    def search(self, query: str, page_base: str) -> List[Dict[str, Any]]:
+        results = self.searches.get(_query_key(query), [])
+        return [{k: (v.replace("{pages}", page_base) if isinstance(v, str) else v) for k, v in r.items()} for r in results]
+
+
+def install(fixtures: Fixtures, page_base: str, search_latency: float) -> None:
+    """Route DuckDuckGo searches to the fixtures; pages and Groq go to the stub server."""
+    from backend import search_client
+    from backend.metrics import span
+
+    def replay_search(query: str, session=None) -> List[Dict[str, Any]]:
+        with span("search"):
+            time.sleep(search_latency)
+        return [search_client.normalize_result(r) for r in fixtures.search(query, page_base)]
+
+    search_client._ddg_search = replay_search
+    search_client._open_session = lambda: None
+
+
+def page_name(url: str) -> str:
+    return re.sub(r"[^\w.\-]+", "-", url.split("://", 1)[-1]).strip("-")[:120] + ".html"
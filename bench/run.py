@@ -0,0 +1,216 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bench.replay import Fixtures, FIXTURES_PATH, install
+from bench.stub_server import StubState, start_stub_server
+
+TARGETS = ("pipeline", "crew", "http")
+LOWER_IS_BETTER = ("latency_ms.p50", "latency_ms.p95", "latency_ms.p99", "llm_calls_per_lookup", "peak_memory_mb")
+HIGHER_IS_BETTER = ("lookups_per_sec", "correct_rate")
+# Explicit path settings (e.g. from .env) would otherwise win over CACHE_DIR.
+CACHE_FILES = {
+    "RESULT_CACHE_PATH": "results.sqlite3",
+    "SEARCH_CACHE_PATH": "search.sqlite3",
+    "LLM_CACHE_PATH": "llm.sqlite3",
+    "ENTITY_INDEX_PATH": "entities.sqlite3",
+}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Nearest rank: the smallest value with at least pct% of the samples at or below it.
+    rank = min(len(ordered), max(1, math.ceil(pct * len(ordered) / 100.0)))
+    return ordered[rank - 1]
+
+
+def _configure_env(args: argparse.Namespace, stub_url: str) -> None:
+    os.environ["GROQ_API_KEY"] = "bench"
+    os.environ["GROQ_API_BASE"] = stub_url
+    # Never touch the developer's .cache: a bench run must not seed (or be answered from) real caches.
+    cache_dir = tempfile.mkdtemp(prefix="bench-cache-")
+    os.environ["CACHE_DIR"] = cache_dir
+    for name, filename in CACHE_FILES.items():
+        os.environ[name] = os.path.join(cache_dir, filename)
+    if not args.caches:
+        for name in ("RESULT_CACHE_ENABLED", "SEARCH_CACHE_ENABLED", "LLM_CACHE_ENABLED", "ENTITY_INDEX_ENABLED"):
+            os.environ[name] = "0"
+    if args.unthrottled:
+        for provider in ("DDG", "GROQ", "PAGE"):
+            os.environ[f"{provider}_MAX_RPS"] = "1000"
+
+
+def _make_lookup(target: str, url: Optional[str]) -> Callable[[str, str], Dict[str, Any]]:
+    if target == "pipeline":
+        from backend.pipeline import run_pipeline
+        return run_pipeline
+    if target == "crew":
+        from backend.crew_pipeline import run_crew_pipeline
+        return run_crew_pipeline
+    if url:
+        from backend.http_transport import get_http_session
+
+        def http_lookup(company: str, designation: str) -> Dict[str, Any]:
+            resp = get_http_session().post(f"{url.rstrip('/')}/api/search", json={"company": company, "designation": designation}, timeout=300)
+            return resp.json()
+        return http_lookup
+
+    from app import app
+
+    def flask_lookup(company: str, designation: str) -> Dict[str, Any]:
+        with app.test_client() as client:
+            return client.post("/api/search", json={"company": company, "designation": designation}).get_json()
+    return flask_lookup
+
+
+def _timed(lookup: Callable[[str, str], Dict[str, Any]], pair: Tuple[str, str]) -> Tuple[float, Dict[str, Any]]:
+    start = time.perf_counter()
+    try:
+        result = lookup(*pair)
+    except Exception as e:
+        result = {"found": False, "error": str(e)}
+    return time.perf_counter() - start, result
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    fixtures = Fixtures(args.fixtures)
+    state = StubState(fixtures.answers(), fixtures.pages, args.llm_latency, args.page_latency)
+    server = start_stub_server(state)
+    stub_url = f"http://127.0.0.1:{server.server_address[1]}"
+    _configure_env(args, stub_url)
+
+    from backend import extractor
+    extractor.GROQ_BASE_URL = stub_url
+    install(fixtures, f"{stub_url}/pages", args.search_latency)
+    lookup = _make_lookup(args.target, args.url)
+
+    pairs = fixtures.pairs()
+    answers = fixtures.answers()
+    work = [pairs[i % len(pairs)] for i in range(args.lookups)]
+    for pair in pairs[: args.warmup]:
+        _timed(lookup, pair)
+    state.llm_calls = state.page_requests = state.prompt_tokens = 0
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        timings = list(executor.map(lambda pair: _timed(lookup, pair), work))
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    server.shutdown()
+
+    latencies = [t for t, _ in timings]
+    found = correct = errors = 0
+    for pair, (_, result) in zip(work, timings):
+        result = result or {}
+        name = f"{result.get('first_name', '')} {result.get('last_name', '')}".strip().lower()
+        expected = answers.get(f"{pair[0].strip().lower()}|{pair[1].strip().lower()}", "").lower()
+        found += bool(result.get("found"))
+        correct += name == expected
+        errors += bool(result.get("error")) and bool(expected)
+    n = len(work) or 1
+    report = {
+        "target": args.target,
+        "concurrency": args.concurrency,
+        "lookups": len(work),
+        "config": {
+            "search_latency": args.search_latency,
+            "llm_latency": args.llm_latency,
+            "page_latency": args.page_latency,
+            "caches": args.caches,
+            "unthrottled": args.unthrottled,
+        },
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 1),
+            "p95": round(_percentile(latencies, 95) * 1000, 1),
+            "p99": round(_percentile(latencies, 99) * 1000, 1),
+            "mean": round(sum(latencies) / n * 1000, 1),
+            "max": round(max(latencies, default=0) * 1000, 1),
+        },
+        "lookups_per_sec": round(len(work) / wall, 3) if wall else 0.0,
+        "llm_calls_per_lookup": round(state.llm_calls / n, 2),
+        "prompt_tokens_per_lookup": round(state.prompt_tokens / n, 1),
+        "page_fetches_per_lookup": round(state.page_requests / n, 2),
+        "found_rate": round(found / n, 3),
+        "correct_rate": round(correct / n, 3),
+        "errors": errors,
+        "peak_memory_mb": round(peak / 1e6, 2),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+    }
+    try:
+        import resource
+        report["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    except ImportError:
+        pass
+    return report
+
+
+def _metric(report: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = report
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return float(value)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for path in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+        old, new = _metric(baseline, path), _metric(current, path)
+        if old is None or new is None:
+            continue
+        delta = (new - old) / old * 100 if old else 0.0
+        worse = delta > tolerance if path in LOWER_IS_BETTER else delta < -tolerance
+        print(f"{path:24} {old:>12.3f} -> {new:>12.3f}  {delta:+7.1f}%{'  REGRESSION' if worse else ''}")
+        if worse:
+            regressions.append(path)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark lookups offline against recorded fixtures.")
+    parser.add_argument("-t", "--target", choices=TARGETS, default="pipeline")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("-n", "--lookups", type=int, default=40)
+    parser.add_argument("--warmup", type=int, default=0, help="Untimed lookups to run first")
+    parser.add_argument("--fixtures", default=str(FIXTURES_PATH))
+    parser.add_argument("--search-latency", type=float, default=0.4, help="Seconds per replayed search")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Seconds per stub LLM completion")
+    parser.add_argument("--page-latency", type=float, default=0.2, help="Seconds per stub page fetch")
+    parser.add_argument("--caches", action="store_true", help="Keep result/search/LLM caches on (in a temp dir)")
+    parser.add_argument("--unthrottled", action="store_true", help="Lift the per-provider rate limits")
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process Flask app (http target)")
+    parser.add_argument("--save", help="Write the report to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="Allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args)
+    print(json.dumps(report, indent=2))
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        if compare(baseline, report, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+_BLOCK_RE = re.compile(r"^\[(\d+)\] Source: .*?$(.*?)(?=^\[\d+\] Source: |\Z)", re.M | re.S)
+_COMPANY_RE = re.compile(r"^Company: (.*)$", re.M)
+_ROLE_RE = re.compile(r"^Role/Designation: (.*)$", re.M)
+
+
+class StubState:
+    def __init__(self, answers: Dict[str, str], pages: Dict[str, str], llm_latency: float, page_latency: float):
+        self.answers = answers
+        self.pages = pages
+        self.llm_latency = llm_latency
+        self.page_latency = page_latency
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.page_requests = 0
+        self._lock = threading.Lock()
+
+    def answer_for(self, prompt: str) -> Optional[str]:
+        company = _COMPANY_RE.search(prompt)
+        role = _ROLE_RE.search(prompt)
+        if company and role:
+            return self.answers.get(f"{company.group(1).strip().lower()}|{role.group(1).strip().lower()}")
+        for key, name in self.answers.items():
+            company_name, role_name = key.split("|", 1)
+            if company_name in prompt.lower() and role_name in prompt.lower():
+                return name
+        return None
+
+    def complete(self, prompt: str) -> str:
+        name = self.answer_for(prompt)
+        if "numbered texts" in prompt:
+            lines = []
+            for m in _BLOCK_RE.finditer(prompt):
+                found = name and name.split()[-1].lower() in m.group(2).lower()
+                lines.append(f"[{m.group(1)}] {name if found else 'NONE'}")
+            return "\n".join(lines)
+        if "Text to analyze:" in prompt:
+            text = prompt.split("Text to analyze:", 1)[1]
+            return name if name and name.split()[-1].lower() in text.lower() else "NONE"
+        first, _, last = (name or "").partition(" ")
+        payload = {
+            "first_name": first,
+            "last_name": last,
+            "current_title": "",
+            "source_url": "",
+            "confidence_score": 0.8 if name else 0,
+        }
+        return "Thought: I now know the final answer\nFinal Answer: " + json.dumps(payload)
+
+
+def _make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            name = self.path.rsplit("/", 1)[-1]
+            with state._lock:
+                state.page_requests += 1
+            time.sleep(state.page_latency)
+            html = state.pages.get(name)
+            if html is None:
+                self._send(404, b"not found", "text/plain")
+            else:
+                self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            data: Dict[str, Any] = json.loads(self.rfile.read(length) or b"{}")
+            prompt = "\n".join(str(m.get("content") or "") for m in data.get("messages", []))
+            time.sleep(state.llm_latency)
+            content = state.complete(prompt)
+            prompt_tokens = len(prompt) // 4
+            with state._lock:
+                state.llm_calls += 1
+                state.prompt_tokens += prompt_tokens
+            body = {
+                "id": f"stub-{state.llm_calls}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": data.get("model", "stub"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": prompt_tokens + len(content) // 4,
+                },
+            }
+            self._send(200, json.dumps(body).encode("utf-8"), "application/json")
+
+    return Handler
+
+
+def start_stub_server(state: StubState) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
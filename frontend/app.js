@@ -6,6 +6,9 @@
   const loadingEl = document.getElementById("loading");
   const resultEl = document.getElementById("result");
   const errorEl = document.getElementById("error");
+  const loadingText = document.getElementById("loadingText");
+  const candidatesEl = document.getElementById("candidates");
+  let activeStream = null;
 
   function hideAll() {
     loadingEl.classList.add("hidden");
@@ -15,10 +18,30 @@
 
   function showLoading() {
     hideAll();
+    loadingText.textContent = "Searching and validating sources…";
+    candidatesEl.innerHTML = "";
+    candidatesEl.classList.add("hidden");
     loadingEl.classList.remove("hidden");
     submitBtn.disabled = true;
   }
 
+  function showProgress(stage, data) {
+    if (stage === "queries") {
+      loadingText.textContent = "Searching the web (" + data.queries.length + " queries)…";
+    } else if (stage === "search_results") {
+      loadingText.textContent = "Found " + data.count + " result(s). Extracting names…";
+    } else if (stage === "extraction") {
+      const name = ((data.first_name || "") + " " + (data.last_name || "")).trim();
+      const li = document.createElement("li");
+      li.innerHTML = "<strong>" + escapeHtml(name || "—") + "</strong>" +
+        (data.source_url ? " <span>" + escapeHtml(data.source_url) + "</span>" : "");
+      candidatesEl.appendChild(li);
+      candidatesEl.classList.remove("hidden");
+    } else if (stage === "crew_task") {
+      loadingText.textContent = (data.agent || "Agent") + " finished. Working…";
+    }
+  }
+
   function showResult(data) {
     hideAll();
     submitBtn.disabled = false;
@@ -64,6 +87,77 @@
     return escapeHtml(s).replace(/"/g, "&quot;");
   }
 
+  function closeStream() {
+    if (activeStream) {
+      activeStream.close();
+      activeStream = null;
+    }
+  }
+
+  function searchDirect(company, designation) {
+    fetch("/api/search", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ company: company, designation: designation }),
+    })
+      .then(function (res) {
+        return res.json().then(function (data) {
+          showResult(data);
+        });
+      })
+      .catch(function () {
+        showError("Network error. Is the server running on port 5000?");
+      });
+  }
+
+  function pollJob(statusUrl) {
+    fetch(statusUrl)
+      .then(function (res) {
+        return res.json();
+      })
+      .then(function (job) {
+        if (job.result) {
+          showResult(job.result);
+        } else if (job.job_id) {
+          setTimeout(function () {
+            pollJob(statusUrl);
+          }, 1000);
+        } else {
+          showError(job.error);
+        }
+      })
+      .catch(function () {
+        showError("Network error. Is the server running on port 5000?");
+      });
+  }
+
+  function followJob(job) {
+    if (!window.EventSource) {
+      pollJob(job.status_url);
+      return;
+    }
+    closeStream();
+    const stream = new EventSource(job.events_url);
+    activeStream = stream;
+    ["queries", "search_results", "extraction", "crew_task"].forEach(function (stage) {
+      stream.addEventListener(stage, function (e) {
+        showProgress(stage, JSON.parse(e.data));
+      });
+    });
+    stream.addEventListener("result", function (e) {
+      closeStream();
+      showResult(JSON.parse(e.data));
+    });
+    stream.addEventListener("error", function (e) {
+      closeStream();
+      if (e.data) {
+        showResult(JSON.parse(e.data));
+      } else {
+        pollJob(job.status_url);
+      }
+    });
+  }
+
   form.addEventListener("submit", function (e) {
     e.preventDefault();
     const company = companyInput.value.trim();
@@ -71,15 +165,19 @@
     if (!company || !designation) return;
 
     showLoading();
-    fetch("/api/search", {
+    fetch("/api/jobs", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ company: company, designation: designation }),
     })
       .then(function (res) {
+        if (res.status === 404 || res.status === 405) {
+          searchDirect(company, designation);
+          return;
+        }
         return res.json().then(function (data) {
           if (res.ok) {
-            showResult(data);
+            followJob(data);
           } else {
             showResult(data);
           }
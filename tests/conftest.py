@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Keep the suite's caches and indexes away from the developer's .cache.
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="person-finder-tests-"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
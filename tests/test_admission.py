@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.admission import AdmissionController, AdmissionRejected
+
+
+def test_free_slot_is_granted_immediately():
+    admission = AdmissionController(max_active=1)
+    with admission.slot("a") as waited:
+        assert waited == 0.0
+        assert admission.stats()["active"] == 1
+    assert admission.stats()["active"] == 0
+
+
+def test_bounded_waiters_are_rejected_when_queues_are_full():
+    admission = AdmissionController(max_active=1, max_queue=2, max_queue_per_client=1, queue_timeout=5)
+    admission.acquire("a")
+    waiter = threading.Thread(target=admission.acquire, args=("b",))
+    waiter.start()
+    while admission.stats()["queued"] < 1:
+        time.sleep(0.01)
+    with pytest.raises(AdmissionRejected) as per_client:
+        admission.acquire("b")
+    other = threading.Thread(target=admission.acquire, args=("c",))
+    other.start()
+    while admission.stats()["queued"] < 2:
+        time.sleep(0.01)
+    with pytest.raises(AdmissionRejected) as overall:
+        admission.acquire("d")
+    assert (per_client.value.status, overall.value.status) == (429, 503)
+    assert overall.value.retry_after >= 1
+    admission.release()
+    admission.release()
+    waiter.join()
+    other.join()
+
+
+def test_bounded_waiter_times_out_with_503():
+    admission = AdmissionController(max_active=1, queue_timeout=0.05)
+    admission.acquire("a")
+    with pytest.raises(AdmissionRejected) as rejected:
+        admission.acquire("b")
+    assert rejected.value.status == 503
+    assert admission.stats()["queued"] == 0 and admission.timeouts == 1
+
+
+def test_clients_are_served_round_robin():
+    admission = AdmissionController(max_active=1, max_queue_per_client=10)
+    admission.acquire("busy")
+    order = []
+    threads = []
+    for client in ("busy", "busy", "busy", "other"):
+        t = threading.Thread(target=lambda c=client: (admission.acquire(c, bounded=False), order.append(c), admission.release()))
+        t.start()
+        threads.append(t)
+        while admission.stats()["queued"] < len(threads):
+            time.sleep(0.01)
+    admission.release()
+    for t in threads:
+        t.join()
+    assert order.index("other") <= 1
+
+
+def test_batch_slots_are_capped_per_client_and_overall():
+    admission = AdmissionController(max_batches=2, max_batches_per_client=1)
+    admission.acquire_batch("a")
+    with pytest.raises(AdmissionRejected) as per_client:
+        admission.acquire_batch("a")
+    admission.acquire_batch("b")
+    with pytest.raises(AdmissionRejected) as overall:
+        admission.acquire_batch("c")
+    assert (per_client.value.status, overall.value.status) == (429, 503)
+    admission.release_batch("a")
+    admission.acquire_batch("c")
+    assert admission.stats()["batches"] == 2
+
+
+def test_async_waiters_do_not_hold_threads():
+    admission = AdmissionController(max_active=1, max_queue=100, max_queue_per_client=100)
+
+    async def main():
+        async def lookup():
+            async with admission.slot_async("a"):
+                await asyncio.sleep(0.001)
+
+        before = threading.active_count()
+        tasks = [asyncio.ensure_future(lookup()) for _ in range(50)]
+        await asyncio.sleep(0.01)
+        assert threading.active_count() == before
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    stats = admission.stats()
+    assert stats["admitted"] == 50 and stats["active"] == 0 and stats["queued"] == 0
+
+
+def test_async_waiter_is_woken_by_a_release_from_another_thread():
+    admission = AdmissionController(max_active=1)
+    admission.acquire("flask")
+
+    async def main():
+        threading.Timer(0.05, admission.release).start()
+        async with admission.slot_async("asgi") as waited:
+            return waited
+
+    assert asyncio.run(main()) >= 0.04
+    assert admission.stats()["active"] == 0
+
+
+def test_cancelled_async_waiter_leaves_no_slot_or_ticket_behind():
+    admission = AdmissionController(max_active=1)
+
+    async def main():
+        admission.acquire("a")
+        task = asyncio.ensure_future(admission.acquire_async("b"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert admission.stats()["queued"] == 0
+        admission.release()
+
+    asyncio.run(main())
+    assert admission.stats()["active"] == 0
+
+
+def test_async_bounded_waiter_times_out_with_503():
+    admission = AdmissionController(max_active=1, queue_timeout=0.05)
+    admission.acquire("a")
+    with pytest.raises(AdmissionRejected) as rejected:
+        asyncio.run(admission.acquire_async("b"))
+    assert rejected.value.status == 503
+    assert admission.stats()["queued"] == 0
@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import pytest
+
+import asgi
+
+
+def _call(body_chunks, path="/api/search", method="POST"):
+    messages = [{"type": "http.request", "body": chunk, "more_body": i < len(body_chunks) - 1} for i, chunk in enumerate(body_chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.app({"type": "http", "path": path, "method": method, "headers": [], "client": ("127.0.0.1", 1)}, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+
+    async def cached_lookup_async(company, designation, compute):
+        calls.append((company, designation))
+        return {"first_name": "Jane", "last_name": "Doe", "found": True, "error": None}, False
+
+    monkeypatch.setattr(asgi, "cached_lookup_async", cached_lookup_async)
+    return calls
+
+
+def test_oversized_body_is_rejected_with_413(lookups, monkeypatch):
+    monkeypatch.setattr(asgi, "MAX_BODY_BYTES", 64)
+    body = json.dumps({"company": "Acme", "designation": "CTO", "padding": "x" * 100}).encode()
+    status, payload = _call([body[:40], body[40:]])
+    assert status == 413
+    assert "64 bytes" in payload["error"]
+    assert not lookups
+
+
+def test_missing_fields_are_a_400(lookups):
+    status, payload = _call([b'{"company": "Acme"}'])
+    assert status == 400
+    assert payload["error"] == "Missing company or designation"
+
+
+def test_invalid_json_is_a_400(lookups):
+    status, _ = _call([b"not json"])
+    assert status == 400
+
+
+def test_lookup_returns_the_result_and_cache_state(lookups):
+    status, payload = _call([b'{"company": "Acme", ', b'"designation": "CTO"}'])
+    assert status == 200
+    assert payload["first_name"] == "Jane" and payload["cache"] == "miss"
+    assert lookups == [("Acme", "CTO")]
+
+
+def test_unknown_paths_are_404():
+    assert _call([b""], path="/nope", method="GET")[0] == 404
@@ -0,0 +1,83 @@
+import asyncio
+
+from backend import async_pipeline, pipeline
+
+WORDS = ["alpha beta gamma", "delta epsilon zeta", "eta theta iota"]
+
+
+def _fake_lookup(monkeypatch, names, search_delay=0.0):
+    built = []
+
+    def tiers(company, designation):
+        for tier in range(3):
+            built.append(tier)
+            yield tier, [f"{company} tier {tier}"]
+
+    async def search(queries):
+        await asyncio.sleep(search_delay)
+        return [
+            {"title": f"{q} {WORDS[i]}", "href": f"https://{q.replace(' ', '-')}-{i}.example/", "body": f"{WORDS[i]} {q}"}
+            for q in queries
+            for i in range(3)
+        ]
+
+    async def extract(company, designation, items):
+        return [{"first_name": names.pop(0), "last_name": "Doe", "source_url": item["href"]} if names else None for item in items]
+
+    async def no_page(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(async_pipeline, "iter_query_tiers", tiers)
+    monkeypatch.setattr(async_pipeline, "search_multiple_queries_async", search)
+    monkeypatch.setattr(async_pipeline, "local_extractions", lambda *a, **k: None)
+    monkeypatch.setattr(async_pipeline, "rank_candidates", lambda company, designation, items, *a: items)
+    monkeypatch.setattr(async_pipeline, "extract_from_snippets_async", extract)
+    monkeypatch.setattr(async_pipeline, "extract_from_page_async", no_page)
+    return built
+
+
+def test_async_lookup_stops_at_consensus_without_building_later_tiers(monkeypatch):
+    built = _fake_lookup(monkeypatch, ["Jane", "Jane", "Jane"])
+    result = asyncio.run(async_pipeline.run_pipeline_async("Acme", "CTO"))
+    assert (result["first_name"], result["found"]) == ("Jane", True)
+    assert built == [0]
+
+
+def test_async_search_timeout_is_not_reported_as_no_results(monkeypatch):
+    _fake_lookup(monkeypatch, [], search_delay=1.0)
+    monkeypatch.setattr(async_pipeline, "SEARCH_STAGE_TIMEOUT", 0.02)
+    monkeypatch.setattr(pipeline, "search_available", lambda: True)
+    result = asyncio.run(async_pipeline.run_pipeline_async("Acme", "CTO"))
+    assert result["found"] is False
+    assert result["error"] == pipeline.SEARCH_UNAVAILABLE_ERROR
+
+
+def test_missing_input_is_rejected_without_searching(monkeypatch):
+    built = _fake_lookup(monkeypatch, [])
+    result = asyncio.run(async_pipeline.run_pipeline_async("", "CTO"))
+    assert result["error"] == "Company and designation are required"
+    assert built == []
+
+
+def test_extract_in_order_cancels_the_rest_once_sources_agree(monkeypatch):
+    monkeypatch.setattr(pipeline, "CONSENSUS_THRESHOLD", 2)
+    cancelled = []
+
+    async def task(n, delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return [(f"u{n}", {"first_name": "Jane", "last_name": "Doe", "source_url": f"u{n}"})]
+
+    async def main():
+        extractions, sources = [], []
+        cut = await async_pipeline._extract_in_order("Snippet", [task(0, 0.01), task(1, 0.0), task(2, 1.0)], extractions, sources, 5.0)
+        await asyncio.sleep(0)
+        return cut, sources
+
+    cut, sources = asyncio.run(main())
+    assert not cut
+    assert sources == ["u0", "u1"]
+    assert cancelled == [2]
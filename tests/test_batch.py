@@ -0,0 +1,80 @@
+import io
+import json
+
+from backend.batch import iter_csv_rows, load_checkpoint, run_batch
+from backend.deadline import DEADLINE_ERROR
+from backend.pipeline import SEARCH_UNAVAILABLE_ERROR
+
+CSV = "company,designation\nAcme,CEO\nGlobex,CTO\nInitech,CFO\nUmbrella,COO\nAcme,CEO\n"
+
+
+def _found(first, last):
+    return {"first_name": first, "last_name": last, "current_title": "", "source_url": "", "confidence_score": 0.9,
+            "sources_checked": [], "found": True, "error": None}
+
+
+def _not_found(error, **extra):
+    return dict({"first_name": "", "last_name": "", "current_title": "", "source_url": "", "confidence_score": 0.0,
+                 "sources_checked": [], "found": False, "error": error}, **extra)
+
+
+RESULTS = {
+    "Acme": _found("Jane", "Doe"),
+    "Globex": _not_found("Could not extract a name from any source"),
+    "Initech": _not_found(DEADLINE_ERROR, partial=True),
+    "Umbrella": _not_found(SEARCH_UNAVAILABLE_ERROR),
+}
+
+
+def _rows():
+    return iter_csv_rows(io.StringIO(CSV))
+
+
+def test_duplicate_rows_are_looked_up_once():
+    calls = []
+
+    def lookup(company, designation):
+        calls.append(company)
+        return dict(RESULTS[company])
+
+    records = list(run_batch(_rows(), lookup=lookup, workers=2))
+    assert sorted(r["row"] for r in records) == [2, 3, 4, 5, 6]
+    assert sorted(calls) == ["Acme", "Globex", "Initech", "Umbrella"]
+
+
+def test_checkpoint_keeps_only_definitive_results(tmp_path):
+    checkpoint = str(tmp_path / "out.checkpoint")
+    list(run_batch(_rows(), lookup=lambda c, d: dict(RESULTS[c]), workers=2, checkpoint_path=checkpoint))
+    saved = [json.loads(line)["result"] for line in open(checkpoint)]
+    assert sorted(r.get("error") or "found" for r in saved) == ["Could not extract a name from any source", "found"]
+
+
+def test_resume_retries_partial_and_transient_rows(tmp_path):
+    checkpoint = str(tmp_path / "out.checkpoint")
+    list(run_batch(_rows(), lookup=lambda c, d: dict(RESULTS[c]), workers=2, checkpoint_path=checkpoint))
+    calls = []
+
+    def lookup(company, designation):
+        calls.append(company)
+        return _found("Ann", company)
+
+    records = {r["row"]: r for r in run_batch(_rows(), lookup=lookup, workers=2, checkpoint_path=checkpoint)}
+    assert sorted(calls) == ["Initech", "Umbrella"]
+    assert records[2]["cache"] == "checkpoint" and records[2]["first_name"] == "Jane"
+    assert records[4]["found"] and records[5]["found"]
+
+
+def test_load_checkpoint_ignores_partial_entries_from_older_runs(tmp_path):
+    path = tmp_path / "old.checkpoint"
+    path.write_text(
+        json.dumps({"key": "a|ceo", "result": _not_found(DEADLINE_ERROR, partial=True)}) + "\n"
+        + json.dumps({"key": "b|ceo", "result": _found("Jane", "Doe")}) + "\n"
+        + "not json\n"
+    )
+    assert list(load_checkpoint(str(path))) == ["b|ceo"]
+
+
+def test_max_rows_stops_with_an_error_record():
+    records = list(run_batch(_rows(), lookup=lambda c, d: dict(RESULTS[c]), workers=1, max_rows=2))
+    assert len(records) == 3
+    assert "Batch limit of 2 rows" in records[-1]["error"]
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+
+import pytest
+
+from bench.replay import Fixtures
+from bench.run import CACHE_FILES, _configure_env, _percentile, compare
+from bench.stub_server import StubState
+
+
+@pytest.fixture
+def environ():
+    saved = dict(os.environ)
+    yield os.environ
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+@pytest.mark.parametrize("caches", [False, True])
+def test_caches_always_live_in_a_temporary_dir(environ, caches):
+    environ["RESULT_CACHE_PATH"] = "/should/not/be/used.sqlite3"
+    _configure_env(argparse.Namespace(caches=caches, unthrottled=False), "http://127.0.0.1:1")
+    cache_dir = environ["CACHE_DIR"]
+    assert os.path.basename(cache_dir).startswith("bench-cache-")
+    for name in CACHE_FILES:
+        assert environ[name].startswith(cache_dir)
+
+
+def test_no_cache_mode_also_disables_the_entity_index(environ):
+    _configure_env(argparse.Namespace(caches=False, unthrottled=False), "http://127.0.0.1:1")
+    for name in ("RESULT_CACHE_ENABLED", "SEARCH_CACHE_ENABLED", "LLM_CACHE_ENABLED", "ENTITY_INDEX_ENABLED"):
+        assert environ[name] == "0"
+
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert _percentile(values, 50) == 50
+    assert _percentile(values, 99) == 99
+    assert _percentile(values, 99.5) == 100
+    assert _percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert _percentile([1.0, 2.0, 3.0, 4.0], 95) == 4.0
+    assert _percentile(values, 0) == 1
+    assert _percentile([7.0], 95) == 7.0
+    assert _percentile([], 50) == 0.0
+
+
+def test_compare_flags_regressions_in_either_direction(capsys):
+    baseline = {"latency_ms": {"p50": 100.0, "p95": 200.0}, "correct_rate": 1.0, "lookups_per_sec": 10.0}
+    current = {"latency_ms": {"p50": 104.0, "p95": 260.0}, "correct_rate": 0.9, "lookups_per_sec": 12.0}
+    assert compare(baseline, current, tolerance=5.0) == ["latency_ms.p95", "correct_rate"]
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+def test_compare_skips_metrics_missing_from_either_report():
+    assert compare({"latency_ms": {"p50": 1.0}}, {"peak_memory_mb": 5.0}, tolerance=0.0) == []
+
+
+def test_fixtures_replay_searches_by_normalized_query(tmp_path):
+    path = tmp_path / "recorded.json"
+    path.write_text(json.dumps({
+        "lookups": [{
+            "company": "Acme", "designation": "CEO", "answer": "Jane Doe",
+            "searches": {"Acme CEO name": [{"title": "t", "href": "{pages}/acme", "body": "b"}]},
+        }],
+        "pages": {},
+    }))
+    fixtures = Fixtures(str(path))
+    assert fixtures.pairs() == [("Acme", "CEO")]
+    assert fixtures.answers() == {"acme|ceo": "Jane Doe"}
+    assert fixtures.search("  acme ceo NAME", "http://127.0.0.1:9") == [{"title": "t", "href": "http://127.0.0.1:9/acme", "body": "b"}]
+    assert fixtures.search("unknown", "x") == []
+
+
+def test_stub_answers_batch_prompts_per_block():
+    state = StubState({"acme|ceo": "Jane Doe"}, {}, 0.0, 0.0)
+    prompt = (
+        "Company: Acme\nRole/Designation: CEO\nnumbered texts\n\n"
+        "[1] Source: a\nJane Doe leads Acme.\n\n[2] Source: b\nAcme makes widgets."
+    )
+    assert state.complete(prompt) == "[1] Jane Doe\n[2] NONE"
@@ -0,0 +1,40 @@
+import time
+
+from backend.cache import SQLiteCache
+
+
+def test_values_round_trip_and_count_hits():
+    cache = SQLiteCache(":memory:")
+    cache.set("k", {"found": True, "sources": ["a"]}, ttl=60)
+    assert cache.get("k") == {"found": True, "sources": ["a"]}
+    assert cache.get("missing") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "max_entries": 10000}
+
+
+def test_expired_entries_are_misses_and_zero_ttl_is_not_stored():
+    cache = SQLiteCache(":memory:")
+    cache.set("short", 1, ttl=0.01)
+    cache.set("never", 1, ttl=0)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    assert cache.get("never") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = SQLiteCache(":memory:", max_entries=2)
+    cache.set("a", 1, ttl=60)
+    time.sleep(0.01)
+    cache.set("b", 2, ttl=60)
+    time.sleep(0.01)
+    assert cache.get("a") == 1
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    SQLiteCache(str(path), table="results").set("k", "v", ttl=60)
+    assert SQLiteCache(str(path), table="results").get("k") == "v"
+    assert SQLiteCache(str(path), table="other").get("k") is None
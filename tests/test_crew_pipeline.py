@@ -0,0 +1,111 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from backend import crew_pipeline, crew_tools
+from backend.deadline import DEADLINE_ERROR, Deadline, DeadlineExceeded, deadline_scope
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    built = []
+    monkeypatch.setattr(crew_pipeline, "_agent_pool", queue.LifoQueue())
+    monkeypatch.setattr(crew_pipeline, "_agents_created", 0)
+    monkeypatch.setattr(crew_pipeline, "CREW_POOL_SIZE", 1)
+    monkeypatch.setattr(crew_pipeline, "CREW_POOL_TIMEOUT", 0.05)
+    monkeypatch.setattr(crew_pipeline, "_build_agents", lambda: built.append(object()) or built[-1])
+    return built
+
+
+def _hold_the_only_crew():
+    held = threading.Event()
+    done = threading.Event()
+
+    def hold():
+        with crew_pipeline._checkout_agents():
+            held.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait(5)
+    return done, thread
+
+
+def test_agent_sets_are_reused(pool):
+    for _ in range(3):
+        with crew_pipeline._checkout_agents() as agents:
+            assert agents is pool[0]
+    assert len(pool) == 1
+
+
+def test_waiting_for_a_busy_pool_is_bounded(pool):
+    done, thread = _hold_the_only_crew()
+    try:
+        with pytest.raises(crew_pipeline.CrewBusy):
+            with crew_pipeline._checkout_agents():
+                pass
+        with deadline_scope(Deadline(0.01)):
+            with pytest.raises(DeadlineExceeded):
+                with crew_pipeline._checkout_agents():
+                    pass
+    finally:
+        done.set()
+        thread.join()
+
+
+def test_full_mode_answers_busy_or_deadline_instead_of_hanging(pool, monkeypatch):
+    monkeypatch.setattr(crew_pipeline, "_make_crew", lambda *a: None)
+    monkeypatch.setattr(crew_pipeline, "_kickoff", lambda crew, designation: {"found": True})
+    done, thread = _hold_the_only_crew()
+    try:
+        busy = crew_pipeline.run_crew_pipeline("Acme", "CEO", mode="full")
+        with deadline_scope(Deadline(0.01)):
+            late = crew_pipeline.run_crew_pipeline("Acme", "CEO", mode="full")
+    finally:
+        done.set()
+        thread.join()
+    assert busy["error"] == crew_pipeline.CREW_BUSY_ERROR and not busy["found"]
+    assert late["error"] == DEADLINE_ERROR and late["partial"]
+
+
+def test_full_mode_reports_tool_progress(pool, monkeypatch):
+    events = []
+    monkeypatch.setattr("backend.search_providers.search_multiple_queries", lambda queries: [{"title": "t", "href": "u", "body": "b"}])
+    monkeypatch.setattr("backend.extractor.extract_names_batch", lambda company, designation, items: [("Jane", "Doe")])
+
+    def kickoff(crew, designation):
+        crew_tools._search_impl("Acme", "CEO")
+        crew_tools._extract_batch_impl("Acme", "CEO", [{"text": "Jane Doe is CEO of Acme", "source_url": "u"}])
+        return {"found": True}
+
+    monkeypatch.setattr(crew_pipeline, "_make_crew", lambda *a: None)
+    monkeypatch.setattr(crew_pipeline, "_kickoff", kickoff)
+    crew_pipeline.run_crew_pipeline("Acme", "CEO", on_event=lambda stage, data: events.append(stage), mode="full")
+    assert events == ["queries", "search_results", "extraction"]
+    crew_tools._search_impl("Acme", "CEO")
+    assert len(events) == 3
+
+
+def test_hybrid_review_keeps_partial_and_reduced_confidence(monkeypatch):
+    def pipeline(company, designation, on_event=None):
+        on_event("extraction", {"first_name": "Jane", "last_name": "Doe"})
+        on_event("extraction", {"first_name": "John", "last_name": "Roe"})
+        return {"first_name": "John", "last_name": "Roe", "confidence_score": 0.42, "found": True, "partial": True,
+                "sources_checked": ["u"], "error": None}
+
+    @contextmanager
+    def agents():
+        yield None
+
+    monkeypatch.setattr(crew_pipeline, "run_pipeline", pipeline)
+    monkeypatch.setattr(crew_pipeline, "_checkout_agents", agents)
+    monkeypatch.setattr(crew_pipeline, "_make_review_crew", lambda *a: None)
+    monkeypatch.setattr(crew_pipeline, "_kickoff", lambda crew, designation: {
+        "first_name": "Jane", "last_name": "Doe", "confidence_score": 0.9, "found": True, "error": None})
+    result = crew_pipeline.run_hybrid_pipeline("Acme", "CEO")
+    assert result["first_name"] == "Jane" and result["partial"]
+    assert result["confidence_score"] == round(0.9 * crew_pipeline.PARTIAL_CONFIDENCE_FACTOR, 2)
+    assert result["sources_checked"] == ["u"]
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from backend import deadline
+from backend.deadline import Deadline, deadline_expired, deadline_scope, parse_deadline, stage_budget, time_left
+
+
+@pytest.fixture(autouse=True)
+def no_default_deadline(monkeypatch):
+    monkeypatch.setattr(deadline, "REQUEST_DEADLINE_MS", 0)
+
+
+def test_parse_deadline_uses_the_client_budget_capped_at_the_maximum(monkeypatch):
+    monkeypatch.setattr(deadline, "MAX_DEADLINE_MS", 2000)
+    assert 0.4 < parse_deadline("500").remaining() <= 0.5
+    assert 1.9 < parse_deadline(10_000).remaining() <= 2.0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "nan", float("nan"), "inf", "-inf", float("inf")])
+def test_parse_deadline_falls_back_to_the_default_for_unusable_values(value, monkeypatch):
+    assert parse_deadline(value) is None
+    monkeypatch.setattr(deadline, "REQUEST_DEADLINE_MS", 1000)
+    assert 0.9 < parse_deadline(value).remaining() <= 1.0
+
+
+def test_parse_deadline_treats_zero_or_less_as_no_deadline(monkeypatch):
+    monkeypatch.setattr(deadline, "REQUEST_DEADLINE_MS", 1000)
+    assert parse_deadline("0") is None
+    assert parse_deadline(-5) is None
+
+
+def test_time_left_is_capped_by_the_current_deadline():
+    assert time_left(3.0) == 3.0
+    with deadline_scope(Deadline(0.5)):
+        assert time_left(3.0) <= 0.5
+        assert time_left() <= 0.5
+        assert not deadline_expired()
+
+
+def test_stage_budget_takes_a_share_of_the_time_left(monkeypatch):
+    monkeypatch.setitem(deadline.STAGE_BUDGETS, "search", 0.5)
+    with deadline_scope(Deadline(1.0)):
+        with stage_budget("search") as budget:
+            assert budget.remaining() <= 0.5
+        assert time_left() > 0.9
+    with stage_budget("search") as budget:
+        assert budget is None
+
+
+def test_expired_deadline_raises_on_check():
+    with deadline_scope(Deadline(0.0)):
+        time.sleep(0.001)
+        assert deadline_expired()
+        with pytest.raises(deadline.DeadlineExceeded):
+            deadline.check_deadline()
@@ -0,0 +1,68 @@
+import pytest
+
+from backend.dedup import DedupIndex, canonical_url, hamming, simhash
+
+BIO = "Jane Doe is the chief executive officer of Acme Corp and previously led its European operations for a decade."
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.acme.com/team/?utm_source=x&utm_medium=y",
+        "http://m.acme.com/team#leadership",
+        "https://acme.com/team/amp",
+        "https://www.google.com/amp/s/acme.com/team",
+    ],
+)
+def test_canonical_url_collapses_mirrors(url):
+    assert canonical_url(url) == "acme.com/team"
+
+
+def test_canonical_url_keeps_meaningful_query_params():
+    assert canonical_url("https://acme.com/p?id=2&utm_source=x&a=1") == "acme.com/p?a=1&id=2"
+    assert canonical_url("https://de.linkedin.com/in/jane") == "linkedin.com/in/jane"
+
+
+def test_simhash_is_close_for_near_identical_texts():
+    edited = BIO.replace("a decade", "ten years")
+    assert hamming(simhash(BIO), simhash(edited)) < hamming(simhash(BIO), simhash("Completely unrelated text about weather in the alps today."))
+
+
+def test_filter_results_drops_url_and_snippet_mirrors():
+    index = DedupIndex()
+    results = [
+        {"href": "https://acme.com/team", "title": "Leadership", "body": BIO},
+        {"href": "https://www.acme.com/team?utm_source=feed", "title": "Leadership", "body": "other"},
+        {"href": "https://news.example/acme-ceo", "title": "Leadership", "body": BIO + " Read more."},
+        {"href": "https://other.example/bio", "title": "Bio", "body": BIO.replace("Jane Doe", "John Roe").replace("European", "Asian")},
+    ]
+    unique, dropped = index.filter_results(results)
+    assert [r["href"] for r in unique] == ["https://acme.com/team", "https://other.example/bio"]
+    assert dropped == 2
+    assert index.duplicates["https://news.example/acme-ceo"] == "https://acme.com/team"
+
+
+def test_sources_seen_in_an_earlier_tier_are_skipped_without_counting():
+    index = DedupIndex()
+    index.filter_results([{"href": "https://acme.com/team", "title": "t", "body": BIO}])
+    unique, dropped = index.filter_results([{"href": "https://acme.com/team", "title": "t", "body": BIO}])
+    assert unique == [] and dropped == 0
+
+
+def test_short_snippets_only_collapse_on_exact_match():
+    index = DedupIndex()
+    results = [
+        {"href": "https://a.example", "title": "Jane Doe CEO", "body": ""},
+        {"href": "https://b.example", "title": "John Roe CEO", "body": ""},
+        {"href": "https://c.example", "title": "jane doe, CEO!", "body": ""},
+    ]
+    unique, dropped = index.filter_results(results)
+    assert [r["href"] for r in unique] == ["https://a.example", "https://b.example"]
+    assert dropped == 1
+
+
+def test_seen_text_matches_pages_by_fingerprint():
+    index = DedupIndex()
+    page = BIO * 5
+    assert index.seen_text("https://a.example", page) is None
+    assert index.seen_text("https://b.example", page + " Footer links.") == "https://a.example"
@@ -0,0 +1,69 @@
+import pytest
+
+from backend.entity_index import EntityIndex, canonical_company
+
+
+def _person(first, last, confidence=0.9):
+    return {"first_name": first, "last_name": last, "source_url": f"https://{first}.example", "confidence_score": confidence}
+
+
+@pytest.fixture
+def index():
+    return EntityIndex(":memory:", threshold=0.8, ttl=0)
+
+
+def test_canonical_company_drops_articles_and_legal_suffixes():
+    assert canonical_company("The Acme Widgets, Inc.") == "acme widgets"
+    assert canonical_company("Co") == "co"
+
+
+def test_exact_and_fuzzy_matches_scale_confidence(index):
+    index.add("Acme Widgets Inc", "CEO", _person("Jane", "Doe"))
+    exact = index.lookup("acme widgets", "Chief Executive Officer")
+    assert exact["first_name"] == "Jane" and exact["match_score"] == 1.0
+    fuzzy = index.lookup("Acme Widget", "CEO")
+    assert fuzzy is not None and fuzzy["match_score"] < 1.0
+    assert fuzzy["confidence_score"] < exact["confidence_score"]
+    assert index.lookup("Acme Widgets", "CFO") is None
+    assert index.stats()["fuzzy_hits"] == 1
+
+
+def test_aliases_resolve_to_the_company(index):
+    index.add("International Business Machines", "CEO", _person("Ann", "Lee"))
+    assert index.add_alias("IBM", "International Business Machines")
+    assert index.lookup("IBM", "CEO")["matched_company"] == "International Business Machines"
+    assert not index.add_alias("IBM", "Unknown Corp")
+
+
+def test_records_survive_a_reload(tmp_path):
+    path = tmp_path / "entities.sqlite3"
+    EntityIndex(str(path)).import_records([{"company": "Acme", "designation": "CTO", **_person("Jane", "Doe"), "aliases": ["Acme Labs"]}])
+    reloaded = EntityIndex(str(path))
+    assert reloaded.lookup("Acme Labs", "CTO")["first_name"] == "Jane"
+    assert [r["aliases"] for r in reloaded.export_records()] == [["acme labs"]]
+
+
+def test_failed_import_leaves_memory_and_sqlite_unchanged(tmp_path):
+    path = tmp_path / "entities.sqlite3"
+    index = EntityIndex(str(path))
+    index.add("Acme", "CTO", _person("Jane", "Doe"))
+
+    def records():
+        yield {"company": "Acme", "designation": "CTO", **_person("John", "Roe")}
+        yield {"company": "Globex", "designation": "CEO", **_person("Hank", "Scorpio"), "aliases": ["Globex Corporation"]}
+        raise ValueError("bad line")
+
+    with pytest.raises(ValueError):
+        index.import_records(records())
+    assert index.lookup("Acme", "CTO")["first_name"] == "Jane"
+    assert index.lookup("Globex", "CEO") is None
+    assert index.stats()["companies"] == 1
+    assert EntityIndex(str(path)).lookup("Globex", "CEO") is None
+    assert index.import_records([{"company": "Globex", "designation": "CEO", **_person("Hank", "Scorpio")}]) == 1
+    assert index.lookup("Globex Corp", "CEO")["first_name"] == "Hank"
+
+
+def test_expired_records_are_misses():
+    index = EntityIndex(":memory:", ttl=60)
+    index.add("Acme", "CTO", _person("Jane", "Doe"), updated_at=0)
+    assert index.lookup("Acme", "CTO") is None
@@ -0,0 +1,108 @@
+import pytest
+
+from backend import extractor
+from backend.cache import SQLiteCache
+
+SNIPPETS = [
+    ("Jane Doe is the chief executive officer of Acme Corp, the company said on Monday.", "https://a.example/1"),
+    ("Acme Corp announced record revenue this quarter, according to its annual report.", "https://b.example/2"),
+]
+
+
+@pytest.fixture
+def chat(monkeypatch):
+    calls = []
+
+    def fake_chat(messages, max_tokens, kind="single"):
+        calls.append(kind)
+        if kind == "batch":
+            return "[1] Jane Doe\n[2] NONE"
+        return "Jane Doe"
+
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    monkeypatch.setattr(extractor, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(extractor, "_llm_cache", SQLiteCache(":memory:", table="llm_responses"))
+    monkeypatch.setattr(extractor, "_chat", fake_chat)
+    return calls
+
+
+def test_single_answers_are_cached(chat):
+    text, url = SNIPPETS[0]
+    assert extractor.extract_name_with_groq("Acme Corp", "CEO", text, url) == ("Jane", "Doe")
+    assert extractor.extract_name_with_groq("Acme Corp", "CEO", text, url) == ("Jane", "Doe")
+    assert chat == ["single"]
+
+
+def test_batch_answers_are_cached_per_item(chat):
+    first = extractor.extract_names_batch("Acme Corp", "CEO", SNIPPETS)
+    again = extractor.extract_names_batch("Acme Corp", "CEO", list(reversed(SNIPPETS)))
+    assert first == [("Jane", "Doe"), None]
+    assert again == [None, ("Jane", "Doe")]
+    assert chat == ["batch"]
+
+
+def test_batch_answers_are_not_served_to_single_prompts(chat):
+    extractor.extract_names_batch("Acme Corp", "CEO", SNIPPETS)
+    text, url = SNIPPETS[0]
+    extractor.extract_name_with_groq("Acme Corp", "CEO", text, url)
+    assert chat == ["batch", "single"]
+    assert extractor._batch_cache_key("Acme Corp", "CEO", text) != extractor._llm_cache_key("Acme Corp", "CEO", text)
+
+
+def test_batch_key_covers_only_the_text_the_batch_prompt_sees():
+    text = "x" * extractor.BATCH_ITEM_CHARS
+    assert extractor._batch_cache_key("Acme", "CEO", text) == extractor._batch_cache_key("Acme", "CEO", text + " more text")
+    assert extractor._batch_cache_key("Acme", "CEO", text) != extractor._batch_cache_key("Acme", "CTO", text)
+
+
+def test_parse_batch_response_accepts_common_line_formats():
+    content = "[1] Jane Doe\n2. NONE\n3) -> John Smith\n[3] Ignored Duplicate\n[9] Out Of Range\nchatter"
+    assert extractor._parse_batch_response(content, 3) == {1: ("Jane", "Doe"), 2: None, 3: ("John", "Smith")}
+
+
+@pytest.fixture
+def batch_chat(monkeypatch):
+    calls = []
+
+    def fake_chat(messages, max_tokens, kind="single"):
+        prompt = messages[-1]["content"]
+        calls.append((kind, prompt.count("Source:")))
+        if kind == "batch":
+            # Answers every item but the last, which must then be retried on its own.
+            count = prompt.count("Source:")
+            return "\n".join(f"[{n}] Person{n} Doe" for n in range(1, count))
+        return "Solo Doe"
+
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    monkeypatch.setattr(extractor, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(extractor, "_chat", fake_chat)
+    return calls
+
+
+def _items(n):
+    return [(f"Snippet number {i} about Acme Corp and its chief executive.", f"https://s{i}.example") for i in range(n)]
+
+
+def test_snippets_are_extracted_in_one_call_per_batch(batch_chat, monkeypatch):
+    monkeypatch.setattr(extractor, "BATCH_MAX_ITEMS", 4)
+    results = extractor.extract_names_batch("Acme Corp", "CEO", _items(6))
+    assert [kind for kind, _ in batch_chat] == ["batch", "single", "batch", "single"]
+    assert [count for kind, count in batch_chat if kind == "batch"] == [4, 2]
+    assert results == [("Person1", "Doe"), ("Person2", "Doe"), ("Person3", "Doe"), ("Solo", "Doe"), ("Person1", "Doe"), ("Solo", "Doe")]
+
+
+def test_a_single_snippet_skips_the_batch_prompt(batch_chat):
+    assert extractor.extract_names_batch("Acme Corp", "CEO", _items(1)) == [("Solo", "Doe")]
+    assert [kind for kind, _ in batch_chat] == ["single"]
+
+
+def test_failed_batch_call_falls_back_per_item(batch_chat, monkeypatch):
+    def failing_chat(messages, max_tokens, kind="single"):
+        batch_chat.append((kind, 0))
+        if kind == "batch":
+            raise RuntimeError("boom")
+        return "Solo Doe"
+
+    monkeypatch.setattr(extractor, "_chat", failing_chat)
+    assert extractor.extract_names_batch("Acme Corp", "CEO", _items(2)) == [("Solo", "Doe")] * 2
+    assert [kind for kind, _ in batch_chat] == ["batch", "single", "single"]
@@ -0,0 +1,63 @@
+import pytest
+
+from backend.fast_extractor import extract_candidates, fast_extract, role_terms, split_name
+
+
+def _names(company, designation, text):
+    return [(c["first_name"], c["last_name"]) for c in extract_candidates(company, designation, text)]
+
+
+def test_role_terms_include_aliases_and_expansions():
+    terms = role_terms("CEO")
+    assert "ceo" in terms and "chief executive officer" in terms
+    assert terms == sorted(terms, key=len, reverse=True)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Jane Doe, CEO of Acme Corp, said the company would expand.",
+        "Jane Doe is the Chief Executive Officer at Acme Corp.",
+        "Acme Corp's CEO Jane Doe announced the results.",
+        "Jane Doe - Chief Executive Officer - Acme Corp | LinkedIn",
+    ],
+)
+def test_common_phrasings_yield_the_name(text):
+    assert _names("Acme Corp", "CEO", text)[0] == ("Jane", "Doe")
+
+
+def test_past_roles_are_ignored():
+    assert _names("Acme", "CEO", "Former CEO of Acme John Smith spoke at the event.") == []
+    assert _names("Acme", "CEO", "John Smith, ex-CEO of Acme, now advises startups.") == []
+
+
+def test_headlines_and_company_names_are_not_names():
+    assert split_name("Steps Down") is None
+    assert split_name("Chief Executive") is None
+    assert _names("Acme", "CEO", "Acme Widgets, CEO of Acme, reported growth.") == []
+
+
+def test_loose_patterns_need_the_company_nearby():
+    assert _names("Acme", "CEO", "CEO Jane Doe spoke about the market.") == []
+    assert _names("Acme", "CEO", "At Acme this week, CEO Jane Doe spoke about the market.") == [("Jane", "Doe")]
+
+
+def _result(url, body):
+    return {"href": url, "title": "", "body": body}
+
+
+def test_fast_extract_needs_agreement_between_sources():
+    one = [_result("https://a.example", "Jane Doe, CEO of Acme, said.")]
+    assert fast_extract("Acme", "CEO", one, threshold=0.75, min_agreement=2) is None
+    two = one + [_result("https://b.example", "Acme's CEO Jane Doe announced.")]
+    answer = fast_extract("Acme", "CEO", two, threshold=0.75, min_agreement=2)
+    assert (answer["first_name"], answer["last_name"]) == ("Jane", "Doe")
+    assert answer["sources"] == ["https://a.example", "https://b.example"]
+
+
+def test_fast_extract_defers_to_the_llm_on_a_tie():
+    results = [
+        _result("https://a.example", "Jane Doe, CEO of Acme, said."),
+        _result("https://b.example", "John Roe, CEO of Acme, said."),
+    ]
+    assert fast_extract("Acme", "CEO", results, threshold=0.5, min_agreement=1) is None
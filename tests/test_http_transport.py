@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend import http_transport
+from backend.deadline import Deadline, deadline_scope
+
+
+@pytest.fixture(autouse=True)
+def fresh_slots(monkeypatch):
+    monkeypatch.setattr(http_transport, "_host_slots", http_transport.OrderedDict())
+    monkeypatch.setattr(http_transport, "POOL_HOSTS", 2)
+
+
+def test_host_slot_caps_concurrency_per_host(monkeypatch):
+    monkeypatch.setattr(http_transport, "MAX_CONCURRENCY_PER_HOST", 1)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with http_transport.host_slot("https://a.example/x"):
+            entered.set()
+            release.wait(1)
+
+    t = threading.Thread(target=hold)
+    t.start()
+    entered.wait(1)
+    slot = http_transport._host_slots["a.example"]
+    assert not slot.semaphore.acquire(blocking=False)
+    release.set()
+    t.join()
+    assert slot.users == 0
+
+
+def test_idle_hosts_are_evicted_least_recent_first():
+    for host in ("a", "b", "a", "c"):
+        with http_transport.host_slot(f"https://{host}.example/"):
+            pass
+    assert list(http_transport._host_slots) == ["a.example", "c.example"]
+
+
+def test_busy_hosts_are_never_evicted():
+    with http_transport.host_slot("https://busy.example/"):
+        busy = http_transport._host_slots["busy.example"]
+        for host in ("b", "c", "d"):
+            with http_transport.host_slot(f"https://{host}.example/"):
+                pass
+        assert http_transport._host_slots["busy.example"] is busy
+    assert len(http_transport._host_slots) <= 2
+
+
+def test_async_host_slots_are_bounded_per_loop():
+    async def visit():
+        for host in ("a", "b", "c", "d"):
+            async with http_transport.host_slot_async(f"https://{host}.example/"):
+                pass
+        return list(http_transport._get_loop_state()["slots"])
+
+    assert asyncio.run(visit()) == ["c.example", "d.example"]
+
+
+def test_timeouts_shrink_to_the_deadline():
+    with deadline_scope(Deadline(0.5)):
+        connect, read = http_transport.http_timeouts()
+    assert connect <= 0.5 and read <= 0.5
+    with deadline_scope(Deadline(0.0)):
+        assert http_transport.http_timeouts() == (http_transport.MIN_TIMEOUT, http_transport.MIN_TIMEOUT)
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from backend.jobs import TERMINAL_STAGES, Job, JobManager
+
+
+def _lookup(company, designation, on_event):
+    on_event("queries", {"queries": [f"{company} {designation}"]})
+    time.sleep(0.01)
+    return {"first_name": "Jane", "last_name": "Doe", "found": True, "error": None}
+
+
+def test_finished_job_always_ends_with_its_terminal_event():
+    for _ in range(200):
+        job = Job("Acme", "CEO")
+        seen = []
+
+        def watch():
+            while not job.finished:
+                pass
+            seen.append(job.events[-1]["stage"])
+
+        watcher = threading.Thread(target=watch)
+        watcher.start()
+        job.finish("done", {"found": True})
+        watcher.join()
+        assert seen == ["result"]
+
+
+def test_job_runs_and_records_events():
+    manager = JobManager(workers=1)
+    job = manager.submit("Acme", "CEO", _lookup)
+    events = []
+    while not events or events[-1]["stage"] not in TERMINAL_STAGES:
+        events += job.wait_events(len(events), 1.0)
+    assert [e["stage"] for e in events] == ["queued", "started", "queries", "result"]
+    assert job.status == "done" and job.result["found"]
+
+
+def test_failed_job_ends_with_an_error_event():
+    def boom(company, designation, on_event):
+        raise RuntimeError("boom")
+
+    manager = JobManager(workers=1)
+    job = manager.submit("Acme", "CEO", boom)
+    while not job.finished:
+        job.wait_events(len(job.events), 1.0)
+    assert job.status == "failed"
+    assert job.events[-1]["stage"] == "error" and job.events[-1]["data"]["error"] == "boom"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app_module, "jobs", JobManager(workers=2))
+    monkeypatch.setattr(app_module, "_cached_run_lookup", lambda company, designation, on_event=None, **kw: _lookup(company, designation, on_event))
+    return app_module.app.test_client()
+
+
+def _stages(body):
+    return [line.split(": ", 1)[1] for line in body.splitlines() if line.startswith("event: ")]
+
+
+def test_sse_stream_ends_with_the_result_event(client):
+    job_id = client.post("/api/jobs", json={"company": "Acme", "designation": "CEO"}).get_json()["job_id"]
+    body = client.get(f"/api/jobs/{job_id}/events").get_data(as_text=True)
+    assert _stages(body)[-1] == "result"
+    assert "queries" in _stages(body)
+
+
+def test_sse_resumed_past_the_end_repeats_the_terminal_event(client):
+    job_id = client.post("/api/jobs", json={"company": "Acme", "designation": "CEO"}).get_json()["job_id"]
+    client.get(f"/api/jobs/{job_id}/events").get_data()
+    last = len(app_module.jobs.get(job_id).events)
+    body = client.get(f"/api/jobs/{job_id}/events", headers={"Last-Event-ID": str(last)}).get_data(as_text=True)
+    assert _stages(body) == ["result"]
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/api/jobs/nope").status_code == 404
+    assert client.get("/api/jobs/nope/events").status_code == 404
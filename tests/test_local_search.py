@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+
+from backend import search_providers
+from backend.local_index import LocalIndex, build_index, corpus_item
+from backend.search_providers import LocalIndexProvider, SearchProvider
+
+
+@pytest.fixture
+def index(tmp_path):
+    corpus = tmp_path / "corpus.jsonl"
+    records = [
+        {"company": "Acme Corp", "designation": "CEO", "name": "Jane Doe", "source_url": "https://acme.example/team"},
+        {"url": "https://news.example/globex", "title": "Globex names new CFO", "snippet": "Hank Scorpio joins Globex as CFO."},
+        {"title": "Acme widgets catalogue", "href": "https://acme.example/widgets", "body": "Widgets and gadgets from Acme Corp."},
+        {"title": "No URL here", "body": "skipped"},
+    ]
+    corpus.write_text("\n".join(json.dumps(r) for r in records) + "\nnot json\n\n", encoding="utf-8")
+    out = tmp_path / "index.sqlite3"
+    stats = build_index([str(corpus)], str(out))
+    assert (stats["docs"], stats["skipped"]) == (3, 1)
+    return LocalIndex(str(out), cache_terms=4)
+
+
+def test_structured_rows_become_search_results():
+    item = corpus_item({"company": "Acme", "role": "CTO", "first_name": "Ann", "last_name": "Lee", "source_url": "https://a.example"})
+    assert item == {"title": "Ann Lee - CTO - Acme", "href": "https://a.example", "body": "Ann Lee is the CTO of Acme."}
+
+
+def test_search_ranks_the_matching_document_first(index):
+    results = index.search("Acme Corp CEO name")
+    assert results[0]["href"] == "https://acme.example/team"
+    assert results[0]["title"] == "Jane Doe - CEO - Acme Corp"
+
+
+def test_search_requires_most_query_terms(index):
+    assert index.search("Initech CTO LinkedIn") == []
+    assert index.search("site:linkedin.com Globex CFO")[0]["href"] == "https://news.example/globex"
+
+
+def test_decoded_postings_are_kept_in_a_bounded_lru(index):
+    for query in ("acme ceo", "globex cfo", "widgets gadgets"):
+        index.search(query)
+    assert index.stats()["cached_terms"] <= 4
+
+
+class FakeProvider(SearchProvider):
+    def __init__(self, name, results, up=True):
+        self.name = name
+        self.results = results
+        self.up = up
+        self.calls = 0
+
+    def available(self):
+        return self.up
+
+    def search_many(self, queries):
+        self.calls += 1
+        return list(self.results)
+
+
+def _hit(url):
+    return {"title": url, "href": url, "body": ""}
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    def use(*providers, strategy="fallback"):
+        monkeypatch.setattr(search_providers, "_providers", list(providers))
+        monkeypatch.setattr(search_providers, "SEARCH_STRATEGY", strategy)
+        return providers
+    return use
+
+
+def test_fallback_stops_at_the_first_provider_with_results(providers):
+    empty, local, ddg = providers(FakeProvider("a", []), FakeProvider("local", [_hit("l1")]), FakeProvider("ddg", [_hit("d1")]))
+    assert search_providers.search_multiple_queries(["q"]) == [_hit("l1")]
+    assert (empty.calls, local.calls, ddg.calls) == (1, 1, 0)
+
+
+def test_fanout_interleaves_and_dedups_by_url(providers):
+    providers(FakeProvider("local", [_hit("a"), _hit("b")]), FakeProvider("ddg", [_hit("a"), _hit("c")]), strategy="fanout")
+    assert [r["href"] for r in search_providers.search_multiple_queries(["q"])] == ["a", "b", "c"]
+    assert [r["href"] for r in asyncio.run(search_providers.search_multiple_queries_async(["q"]))] == ["a", "b", "c"]
+
+
+def test_unavailable_providers_are_skipped(providers):
+    down, up = providers(FakeProvider("ddg", [_hit("d")], up=False), FakeProvider("local", [_hit("l")]))
+    assert search_providers.search_multiple_queries(["q"]) == [_hit("l")]
+    assert down.calls == 0
+    assert search_providers.search_available()
+
+
+def test_local_provider_merges_queries(index):
+    provider = LocalIndexProvider(index)
+    results = provider.search_many(["Acme Corp CEO", "Globex CFO"])
+    assert [r["href"] for r in results] == ["https://acme.example/team", "https://news.example/globex"]
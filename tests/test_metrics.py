@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from backend import metrics
+from backend.metrics import MetricsRegistry, bind, collect_timings, inc, span
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    return registry
+
+
+def test_render_prometheus_counters_and_cumulative_buckets(registry):
+    registry.inc("lookups_total", result="hit")
+    registry.inc("lookups_total", 2, result="hit")
+    registry.observe("stage_duration_seconds", 0.03, stage="search")
+    registry.observe("stage_duration_seconds", 20.0, stage="search")
+    lines = registry.render().splitlines()
+    assert "# TYPE person_finder_lookups_total counter" in lines
+    assert 'person_finder_lookups_total{result="hit"} 3' in lines
+    assert 'person_finder_stage_duration_seconds_bucket{stage="search",le="0.025"} 0' in lines
+    assert 'person_finder_stage_duration_seconds_bucket{stage="search",le="0.05"} 1' in lines
+    assert 'person_finder_stage_duration_seconds_bucket{stage="search",le="+Inf"} 2' in lines
+    assert 'person_finder_stage_duration_seconds_count{stage="search"} 2' in lines
+
+
+def test_label_values_are_escaped(registry):
+    registry.inc("errors_total", stage='say "hi"\n')
+    assert 'person_finder_errors_total{stage="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_spans_and_counters_are_collected_per_request():
+    with collect_timings() as timings:
+        with span("search"):
+            pass
+        inc("cache_requests_total", cache="results", result="miss")
+    inc("cache_requests_total", cache="results", result="miss")
+    summary = timings.summary()
+    assert summary["stages"]["search"]["count"] == 1
+    assert summary["counters"] == {"cache_requests_total.results.miss": 1}
+
+
+def test_failed_spans_count_an_error(registry):
+    with pytest.raises(ValueError):
+        with span("page_fetch"):
+            raise ValueError
+    assert 'person_finder_errors_total{stage="page_fetch"} 1' in registry.render()
+
+
+def test_bind_carries_the_request_timings_into_worker_threads():
+    with collect_timings() as timings:
+        worker = threading.Thread(target=bind(lambda: inc("search_requests_total")))
+        worker.start()
+        worker.join()
+    assert timings.summary()["counters"] == {"search_requests_total": 1}
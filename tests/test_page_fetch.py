@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+
+import pytest
+
+from backend import extractor
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, headers=None, chunk=16):
+        self.headers = {"Content-Type": "text/html; charset=utf-8", **(headers or {})}
+        self._chunks = [body[i : i + chunk] for i in range(0, len(body), chunk)]
+        self.read = 0
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, size):
+        for chunk in self._chunks:
+            self.read += 1
+            yield chunk
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    responses = []
+
+    def use(body: bytes, headers=None, chunk=16):
+        responses.append(FakeResponse(body, headers, chunk))
+        return responses[-1]
+
+    @contextmanager
+    def http_stream(url, **kwargs):
+        yield responses[-1]
+
+    monkeypatch.setattr(extractor, "http_stream", http_stream)
+    return use
+
+
+def test_visible_text_skips_scripts_and_navigation(serve):
+    serve(b"<html><nav>Menu</nav><script>var x = 1;</script><p>Jane Doe, CEO</p><footer>c</footer></html>")
+    assert extractor._fetch_page_text_streaming("https://a.example", 1000) == "Jane Doe, CEO"
+
+
+def test_reading_stops_once_enough_text_is_parsed(serve):
+    response = serve(b"<p>" + b"word " * 2000 + b"</p>")
+    text = extractor._fetch_page_text_streaming("https://a.example", 50)
+    assert len(text) == 50
+    assert response.read < len(response._chunks) / 10
+
+
+def test_reading_stops_at_the_byte_cap(serve, monkeypatch):
+    monkeypatch.setattr(extractor, "MAX_PAGE_BYTES", 64)
+    response = serve(b"<p>" + b"x" * 1000 + b"</p>")
+    extractor._fetch_page_text_streaming("https://a.example", 10_000)
+    assert response.read == 4
+
+
+def test_declared_charset_is_used_across_chunk_boundaries(serve):
+    serve("<p>Zoë Müller</p>".encode("utf-8"), chunk=7)
+    assert extractor._fetch_page_text_streaming("https://a.example", 100) == "Zoë Müller"
+    serve("<p>Zoë Müller</p>".encode("latin-1"), {"Content-Type": "text/html; charset=ISO-8859-1"})
+    assert extractor._fetch_page_text_streaming("https://a.example", 100) == "Zoë Müller"
+
+
+@pytest.mark.parametrize("headers", [{"Content-Type": "application/pdf"}, {"Content-Length": str(extractor.MAX_PAGE_DECLARED_BYTES + 1)}])
+def test_unsuitable_pages_are_skipped_before_reading(serve, headers):
+    response = serve(b"<p>Jane Doe</p>", headers)
+    assert extractor._fetch_page_text_streaming("https://a.example", 100) == ""
+    assert response.read == 0
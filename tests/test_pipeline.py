@@ -0,0 +1,124 @@
+import threading
+import time
+
+from backend import pipeline
+from backend.deadline import Deadline, deadline_scope
+
+
+def _extraction(first, last, url):
+    return {"first_name": first, "last_name": last, "source_url": url}
+
+
+def test_normalize_name_ignores_case_and_padding():
+    assert pipeline.normalize_name(" Jane ", "DOE") == "jane doe"
+    assert pipeline.normalize_name("", "") == ""
+
+
+def test_build_result_picks_the_majority_name():
+    extractions = [
+        _extraction("Jane", "Doe", "https://a.example/1"),
+        _extraction("jane", "doe", "https://b.example/2"),
+        _extraction("John", "Roe", "https://c.example/3"),
+    ]
+    result = pipeline.build_result("CTO", extractions, ["u1", "u2", "u3"])
+    assert result["found"] is True
+    assert (result["first_name"].lower(), result["last_name"].lower()) == ("jane", "doe")
+    assert result["confidence_score"] == 0.9
+    assert result["current_title"] == "CTO"
+    assert "partial" not in result
+
+
+def test_build_result_marks_timed_out_answers_partial():
+    result = pipeline.build_result("CTO", [_extraction("Jane", "Doe", "https://a.example")], [], timed_out=True)
+    assert result["partial"] is True
+    assert result["confidence_score"] == round(0.5 * pipeline.PARTIAL_CONFIDENCE_FACTOR, 2)
+
+
+def test_build_result_without_extractions_is_empty(monkeypatch):
+    monkeypatch.setattr(pipeline, "llm_available", lambda: True)
+    result = pipeline.build_result("CTO", [], ["u1"])
+    assert result == {**pipeline.empty_result("CTO", "Could not extract a name from any source"), "sources_checked": ["u1"]}
+
+
+def test_has_enough_extractions_stops_at_consensus(monkeypatch):
+    monkeypatch.setattr(pipeline, "CONSENSUS_THRESHOLD", 2)
+    monkeypatch.setattr(pipeline, "MAX_EXTRACTIONS", 5)
+    assert not pipeline.has_enough_extractions([_extraction("Jane", "Doe", "a")])
+    assert pipeline.has_enough_extractions([_extraction("Jane", "Doe", "a"), _extraction("Jane", "Doe", "b")])
+
+
+def _fake_lookup(monkeypatch, names):
+    built = []
+
+    def tiers(company, designation):
+        for tier in range(3):
+            built.append(tier)
+            yield tier, [f"{company} tier {tier}"]
+
+    def search(queries):
+        words = ["alpha beta gamma", "delta epsilon zeta", "eta theta iota"]
+        return [
+            {"title": f"{q} {words[i]}", "href": f"https://{q.replace(' ', '-')}-{i}.example/", "body": f"{words[i]} {q}"}
+            for q in queries
+            for i in range(3)
+        ]
+
+    def extract(company, designation, items):
+        return [{"first_name": names.pop(0), "last_name": "Doe", "source_url": item["href"]} if names else None for item in items]
+
+    monkeypatch.setattr(pipeline, "iter_query_tiers", tiers)
+    monkeypatch.setattr(pipeline, "search_multiple_queries", search)
+    monkeypatch.setattr(pipeline, "local_extractions", lambda *a, **k: None)
+    monkeypatch.setattr(pipeline, "rank_candidates", lambda company, designation, items, *a: items)
+    monkeypatch.setattr(pipeline, "extract_from_snippets", extract)
+    monkeypatch.setattr(pipeline, "extract_from_page", lambda *a, **k: None)
+    return built
+
+
+def test_later_query_tiers_are_not_built_once_sources_agree(monkeypatch):
+    built = _fake_lookup(monkeypatch, ["Jane", "Jane", "Jane"])
+    result = pipeline.run_pipeline("Acme", "CTO")
+    assert result["found"] is True
+    assert built == [0]
+
+
+def test_query_tiers_are_built_one_at_a_time_while_escalating(monkeypatch):
+    built = _fake_lookup(monkeypatch, [])
+    events = []
+    pipeline.run_pipeline("Acme", "CTO", on_event=lambda stage, data: events.append((stage, data)))
+    assert built == [0, 1, 2]
+    assert [data["tier"] for stage, data in events if stage == "queries"] == [0, 1, 2]
+
+
+def test_extractions_run_concurrently_but_are_collected_in_order(monkeypatch):
+    monkeypatch.setattr(pipeline, "MAX_EXTRACTIONS", 10)
+    monkeypatch.setattr(pipeline, "CONSENSUS_THRESHOLD", 10)
+    barrier = threading.Barrier(3, timeout=1)
+
+    def task(n, delay):
+        def run():
+            barrier.wait()
+            time.sleep(delay)
+            return [(f"u{n}", _extraction(f"P{n}", "Doe", f"u{n}"))]
+        return run
+
+    extractions, sources = [], []
+    timed_out = pipeline._extract_concurrently([task(0, 0.05), task(1, 0.0), task(2, 0.02)], extractions, sources)
+    assert not timed_out
+    assert sources == ["u0", "u1", "u2"]
+    assert [e["first_name"] for e in extractions] == ["P0", "P1", "P2"]
+
+
+def test_extraction_stops_collecting_once_sources_agree(monkeypatch):
+    monkeypatch.setattr(pipeline, "CONSENSUS_THRESHOLD", 2)
+    tasks = [lambda n=n: [(f"u{n}", _extraction("Jane", "Doe", f"u{n}"))] for n in range(4)]
+    extractions, sources = [], []
+    assert not pipeline._extract_concurrently(tasks, extractions, sources)
+    assert sources == ["u0", "u1"]
+
+
+def test_extraction_reports_a_deadline_cut(monkeypatch):
+    with deadline_scope(Deadline(0.05)):
+        extractions, sources = [], []
+        assert pipeline._extract_concurrently([lambda: time.sleep(0.5) or []], extractions, sources)
+    assert not extractions
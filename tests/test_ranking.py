@@ -0,0 +1,39 @@
+from backend import ranking
+from backend.ranking import rank_results, score_result, source_credibility_score
+
+
+def _result(title, body="", href="https://example.com/page"):
+    return {"title": title, "body": body, "href": href}
+
+
+def test_credible_domains_score_in_order():
+    assert source_credibility_score("https://www.linkedin.com/in/jane") > source_credibility_score("https://en.wikipedia.org/wiki/Acme")
+    assert source_credibility_score("https://blog.example.com") == 0
+
+
+def test_answer_bearing_results_outscore_noise():
+    answer = _result("Jane Doe - CEO - Acme | LinkedIn", "Jane Doe is the CEO of Acme.", "https://www.linkedin.com/in/janedoe")
+    listing = _result("CEO jobs at Acme", "Apply now for open roles.", "https://www.indeed.com/jobs?q=acme")
+    unrelated = _result("Weather today", "Sunny with light winds.")
+    scores = [score_result("Acme", "CEO", r) for r in (answer, listing, unrelated)]
+    assert scores[0] > scores[1] > scores[2]
+
+
+def test_rank_results_keeps_the_top_k_above_the_floor_best_first():
+    results = [
+        _result("Weather today"),
+        _result("Acme CEO Jane Doe announced results", "Acme's CEO Jane Doe said"),
+        _result("Acme leadership team", href="https://acme.com/leadership"),
+        _result("Acme CEO", "The chief executive officer of Acme"),
+    ]
+    kept, dropped = rank_results("Acme", "CEO", results, top_k=2, min_score=2.0)
+    assert kept[0] is results[1]
+    assert len(kept) == 2
+    assert results[0] in dropped
+    assert len(kept) + len(dropped) == len(results)
+
+
+def test_disabled_ranking_keeps_everything_in_order(monkeypatch):
+    monkeypatch.setattr(ranking, "RANKING_ENABLED", False)
+    results = [_result("b"), _result("a")]
+    assert rank_results("Acme", "CEO", results) == (results, [])
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from backend import rate_limiter
+from backend.rate_limiter import TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def fresh_buckets(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_buckets", {})
+    monkeypatch.setattr(rate_limiter, "_keyed", rate_limiter.OrderedDict())
+
+
+def test_bucket_allows_a_burst_then_reports_the_wait():
+    bucket = TokenBucket(rate=10.0, capacity=2)
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    assert 0 < bucket.try_acquire() <= 0.1
+
+
+def test_acquire_gives_up_when_the_wait_exceeds_the_timeout():
+    bucket = TokenBucket(rate=0.5, capacity=1)
+    assert bucket.acquire(timeout=0.1)
+    assert not bucket.acquire(timeout=0.1)
+
+
+def test_acquire_async_waits_for_a_token():
+    bucket = TokenBucket(rate=50.0, capacity=1)
+    assert bucket.try_acquire() == 0.0
+    assert asyncio.run(bucket.acquire_async(timeout=1.0))
+
+
+def test_throttle_halves_the_rate_pauses_and_relax_recovers():
+    bucket = TokenBucket(rate=8.0, capacity=4)
+    assert bucket.throttle(retry_after=5.0) == 5.0
+    assert bucket.rate == 4.0
+    assert bucket.try_acquire() > 4.0
+    bucket.relax()
+    assert bucket.rate == pytest.approx(4.8)
+    for _ in range(10):
+        bucket.relax()
+    assert bucket.rate == 8.0
+
+
+def test_throttle_never_drops_below_the_minimum_rate():
+    bucket = TokenBucket(rate=8.0)
+    for _ in range(10):
+        bucket.throttle(retry_after=0.0)
+    assert bucket.rate == 8.0 * rate_limiter.MIN_RATE_FRACTION
+
+
+def test_provider_buckets_are_shared_and_honour_the_rps_override(monkeypatch):
+    monkeypatch.setenv("DDG_MAX_RPS", "5")
+    bucket = rate_limiter.get_rate_limiter("ddg")
+    assert bucket is rate_limiter.get_rate_limiter("ddg")
+    assert bucket.rate == 5.0
+    assert bucket.capacity == 5.0
+
+
+def test_keyed_buckets_keep_only_the_most_recently_used_keys(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_MAX_KEYS", 2)
+    a = rate_limiter.get_rate_limiter("page", "a.example")
+    rate_limiter.get_rate_limiter("page", "b.example")
+    assert rate_limiter.get_rate_limiter("page", "a.example") is a
+    rate_limiter.get_rate_limiter("page", "c.example")
+    assert list(rate_limiter._keyed) == [("page", "a.example"), ("page", "c.example")]
+    assert rate_limiter.get_rate_limiter("page", "a.example") is a
+    rate_limiter.get_rate_limiter("ddg")
+    assert len(rate_limiter._keyed) == 2
@@ -0,0 +1,80 @@
+import pytest
+import requests
+from ddgs.exceptions import RatelimitException, TimeoutException
+
+from backend.deadline import DeadlineExceeded
+from backend.rate_limiter import TokenBucket
+from backend.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen, classify, guarded
+
+
+def _http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status}", response=response)
+
+
+@pytest.mark.parametrize(
+    "error, failure, throttled",
+    [
+        (_http_error(500), True, False),
+        (_http_error(502), True, False),
+        (_http_error(408), True, False),
+        (_http_error(503), False, True),
+        (_http_error(429), False, True),
+        (_http_error(404), False, False),
+        (_http_error(400), False, False),
+        (requests.ConnectionError("refused"), True, False),
+        (requests.Timeout("slow"), True, False),
+        (TimeoutException("slow"), True, False),
+        (RatelimitException("202 Ratelimit"), False, True),
+        (DeadlineExceeded("ours"), False, False),
+        (CircuitOpen("ddg", 5), False, False),
+        (ValueError("bug on our side"), False, False),
+    ],
+)
+def test_classify(error, failure, throttled):
+    assert classify(error)[:2] == (failure, throttled)
+
+
+def test_classify_reads_retry_after():
+    assert classify(_http_error(503, {"Retry-After": "7"}))[2] == 7.0
+    assert classify(_http_error(429, {"retry-after-ms": "1500"}))[2] == 1.5
+
+
+def _fail(breaker, error, limiter=None):
+    with pytest.raises(type(error)):
+        with guarded(breaker, limiter):
+            raise error
+
+
+def test_503_throttles_the_limiter_without_opening_the_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    limiter = TokenBucket(4.0, 4)
+    for _ in range(5):
+        _fail(breaker, _http_error(503, {"Retry-After": "0"}), limiter)
+    assert breaker.state == CLOSED and breaker.failures == 0
+    assert limiter.throttled == 5 and limiter.rate < limiter.base_rate
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_once():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.01)
+    _fail(breaker, _http_error(500))
+    assert breaker.state == CLOSED
+    _fail(breaker, _http_error(500))
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        with guarded(breaker):
+            pass
+    breaker._open_until = 0.0
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_neutral_errors_do_not_count():
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    _fail(breaker, _http_error(404))
+    _fail(breaker, DeadlineExceeded("ours"))
+    assert breaker.state == CLOSED
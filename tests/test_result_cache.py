@@ -0,0 +1,102 @@
+import pytest
+
+from backend import result_cache, search_client
+from backend.cache import SQLiteCache
+from backend.deadline import DEADLINE_ERROR
+from backend.pipeline import LLM_UNAVAILABLE_ERROR, SEARCH_UNAVAILABLE_ERROR, run_pipeline
+from backend.rate_limiter import TokenBucket
+
+
+def _result(found=False, error=None, **extra):
+    return dict({"first_name": "Jane" if found else "", "last_name": "Doe" if found else "", "current_title": "CEO",
+                 "source_url": "", "confidence_score": 0.9 if found else 0.0, "sources_checked": [],
+                 "found": found, "error": error}, **extra)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_ENABLED", True)
+    monkeypatch.setattr(result_cache, "_cache", SQLiteCache(":memory:", table="lookup_results"))
+    monkeypatch.setattr(result_cache, "resolve", lambda company, designation: None)
+    monkeypatch.setattr(result_cache, "remember", lambda company, designation, result: None)
+    return result_cache._cache
+
+
+def _lookup_twice(result):
+    calls = []
+
+    def compute(company, designation):
+        calls.append(company)
+        return dict(result)
+
+    first, first_hit = result_cache.cached_lookup("Acme", "Chief Executive Officer", compute)
+    second, second_hit = result_cache.cached_lookup("  ACME ", "CEO", compute)
+    return calls, first_hit, second_hit, second
+
+
+def test_found_results_are_cached_under_the_normalized_key(cache):
+    calls, first_hit, second_hit, second = _lookup_twice(_result(found=True))
+    assert calls == ["Acme"] and (first_hit, second_hit) == (False, True)
+    assert second["current_title"] == "CEO"
+    assert cache.stats()["entries"] == 1
+
+
+def test_definitive_not_found_is_cached_with_the_short_ttl(cache):
+    assert result_cache._ttl_for(_result(error="No search results found")) == result_cache.RESULT_CACHE_TTL_NOT_FOUND
+    calls, _, second_hit, _ = _lookup_twice(_result(error="Could not extract a name from any source"))
+    assert calls == ["Acme"] and second_hit
+
+
+@pytest.mark.parametrize("result", [
+    _result(error=DEADLINE_ERROR, partial=True),
+    _result(found=True, partial=True),
+    _result(error=SEARCH_UNAVAILABLE_ERROR),
+    _result(error=LLM_UNAVAILABLE_ERROR),
+    _result(error="boom"),
+])
+def test_partial_and_transient_results_are_not_cached(cache, result):
+    calls, _, second_hit, _ = _lookup_twice(result)
+    assert len(calls) == 2 and not second_hit
+
+
+class _Session:
+    def __init__(self, fail):
+        self.fail = fail
+
+    def text(self, query, max_results=None):
+        if self.fail:
+            raise RuntimeError("DuckDuckGo hiccup")
+        return []
+
+
+@pytest.fixture
+def search(monkeypatch):
+    monkeypatch.setattr(search_client, "SEARCH_CACHE_ENABLED", False)
+    monkeypatch.setattr(search_client, "get_rate_limiter", lambda provider, key="": TokenBucket(1000, 1000))
+    monkeypatch.setattr(search_client, "_sessions", search_client._SessionPool())
+
+    def use(fail):
+        monkeypatch.setattr(search_client, "_open_session", lambda: _Session(fail))
+    return use
+
+
+def test_failed_search_is_a_transient_error_not_a_miss(search):
+    search(fail=True)
+    result = run_pipeline("Nowhere Widgets", "CEO")
+    assert result["error"] == SEARCH_UNAVAILABLE_ERROR
+    assert not result_cache.is_definitive(result)
+    assert search_client.get_breaker("ddg").state == "closed"
+
+
+def test_answered_search_without_results_is_a_definitive_miss(search):
+    search(fail=False)
+    result = run_pipeline("Nowhere Gadgets", "CEO")
+    assert result["error"] == "No search results found"
+    assert result_cache.is_definitive(result)
+
+
+def test_failures_are_recorded_for_coalesced_followers_too(search):
+    search(fail=True)
+    with search_client.recording_search_failures() as failed:
+        assert search_client.search_multiple_queries(["a query", "another query"], parallel=True) == []
+    assert sorted(failed) == ["a query", "another query"]
@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from backend import rate_limiter, search_client
+
+
+class FakeSession:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.closed = False
+        self.queries = []
+
+    def text(self, query, max_results=None):
+        assert not self.closed, "searched on a closed session"
+        time.sleep(self.delay)
+        self.queries.append(query)
+        return [{"title": query, "href": f"https://example.com/{query}", "body": ""}]
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch):
+    monkeypatch.setenv("DDG_MAX_RPS", "1000")
+    monkeypatch.setattr(rate_limiter, "_buckets", {})
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    opened = []
+
+    def open_session(delay=0.0):
+        opened.append(FakeSession(delay))
+        return opened[-1]
+
+    monkeypatch.setattr(search_client, "SEARCH_CACHE_ENABLED", False)
+    monkeypatch.setattr(search_client, "_sessions", search_client._SessionPool(max_idle=2))
+    monkeypatch.setattr(search_client, "_open_session", open_session)
+    monkeypatch.setattr(search_client, "search_available", lambda: True)
+    return opened
+
+
+def test_sessions_are_reused_across_searches(sessions):
+    first = search_client.search_multiple_queries(["a", "b", "c"], parallel=True)
+    opened = len(sessions)
+    second = search_client.search_multiple_queries(["d", "e", "f"], parallel=True)
+    assert len(first) == len(second) == 3
+    assert 1 <= opened <= search_client.SEARCH_WORKERS
+    # Two sessions were left idle, so three concurrent searches need at most one more.
+    assert len(sessions) - opened <= 1
+    assert sum(len(s.queries) for s in sessions) == 6
+    assert not any(s.closed for s in sessions[:2])
+
+
+def test_session_is_never_shared_between_concurrent_searches(sessions, monkeypatch):
+    users = {}
+    overlap = []
+    lock = threading.Lock()
+
+    def search(query, session=None):
+        with lock:
+            if users.get(id(session)):
+                overlap.append(query)
+            users[id(session)] = True
+        time.sleep(0.02)
+        with lock:
+            users[id(session)] = False
+        return [{"title": query, "href": f"https://example.com/{query}", "body": ""}]
+
+    monkeypatch.setattr(search_client, "_ddg_search", search)
+    threads = [threading.Thread(target=search_client._search_and_store, args=(f"q{i}", False)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not overlap
+
+
+def test_extra_sessions_are_closed_only_after_their_search_returns(sessions, monkeypatch):
+    pool = search_client._sessions
+    monkeypatch.setattr(search_client, "_open_session", lambda: sessions.append(FakeSession(0.05)) or sessions[-1])
+    threads = [threading.Thread(target=search_client._search_and_store, args=(f"q{i}", False)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert pool.opened == 4
+    assert sum(s.closed for s in sessions) == 2
+    assert all(len(s.queries) == 1 for s in sessions)
+
+
+@pytest.fixture
+def search_cache(monkeypatch):
+    searched = []
+
+    def ddg_search(query, session=None):
+        searched.append(query)
+        return [] if "nothing" in query else [{"title": query, "href": f"https://example.com/{len(searched)}", "body": ""}]
+
+    monkeypatch.setattr(search_client, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(search_client, "_search_cache", search_client.SQLiteCache(":memory:", table="search_results"))
+    monkeypatch.setattr(search_client, "_open_session", lambda: None)
+    monkeypatch.setattr(search_client, "search_available", lambda: True)
+    monkeypatch.setattr(search_client, "_ddg_search", ddg_search)
+    return searched
+
+
+def test_cached_queries_skip_duckduckgo(search_cache):
+    first = search_client.search_multiple_queries(["Acme CEO name"], parallel=True)
+    again = search_client.search_multiple_queries(["  acme   ceo NAME "], parallel=False)
+    assert first == again
+    assert search_cache == ["Acme CEO name"]
+
+
+def test_empty_and_failed_searches_are_not_cached(search_cache, monkeypatch):
+    search_client.search_multiple_queries(["nothing here"], parallel=True)
+    search_client.search_multiple_queries(["nothing here"], parallel=True)
+    assert search_cache == ["nothing here", "nothing here"]
+    monkeypatch.setattr(search_client, "_ddg_search", lambda query, session=None: search_cache.append(query))
+    search_client.search_multiple_queries(["broken"], parallel=True)
+    search_client.search_multiple_queries(["broken"], parallel=True)
+    assert search_cache.count("broken") == 2
+
+
+def test_cache_key_includes_the_result_count(monkeypatch):
+    key = search_client._search_cache_key("Acme  CEO")
+    monkeypatch.setattr(search_client, "MAX_RESULTS_PER_QUERY", 20)
+    assert search_client._search_cache_key("acme ceo") != key
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.deadline import Deadline, DeadlineExceeded, deadline_scope
+from backend.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test")
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(1)
+        return "answer"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", work)))
+    leader.start()
+    started.wait(1)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", work))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    while flight.stats()["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader, *followers]:
+        t.join()
+    assert calls == [1]
+    assert sorted(results) == [("answer", False)] + [("answer", True)] * 3
+    assert flight.stats() == {"executed": 1, "coalesced": 3, "inflight": 0}
+
+
+def test_errors_reach_every_caller_and_are_not_remembered():
+    flight = SingleFlight("test")
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flight.do("k", lambda: 1) == (1, False)
+
+
+def test_followers_stop_waiting_at_their_own_deadline():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=("k", lambda: release.wait(1)))
+    leader.start()
+    while flight.stats()["inflight"] == 0:
+        time.sleep(0.001)
+    with deadline_scope(Deadline(0.02)), pytest.raises(DeadlineExceeded):
+        flight.do("k", lambda: None)
+    release.set()
+    leader.join()
+
+
+def test_async_callers_share_one_await():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", work) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert sorted(coalesced for _, coalesced in results) == [False, True, True, True]
+
+
+def test_async_follower_takes_over_when_the_leader_is_cancelled():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("k", work))
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == (2, False)
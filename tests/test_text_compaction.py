@@ -0,0 +1,33 @@
+from backend import text_compaction
+from backend.text_compaction import SEPARATOR, compact_text
+
+FILLER = "Lorem ipsum dolor sit amet consectetur adipiscing elit. " * 40
+
+
+def test_short_text_is_left_alone():
+    assert compact_text("Jane Doe is the CEO of Acme.", "Acme", "CEO", budget_tokens=50) == "Jane Doe is the CEO of Acme."
+
+
+def test_passages_around_role_and_company_are_kept_within_budget():
+    text = FILLER + "Jane Doe is the CEO of Acme Corp since 2019. " + FILLER + "Acme Corp was founded in 1990. " + FILLER
+    out = compact_text(text, "Acme Corp", "CEO", budget_tokens=60, window_chars=60)
+    assert "Jane Doe is the CEO of Acme Corp" in out
+    assert len(out) <= 60 * text_compaction.CHARS_PER_TOKEN + len(SEPARATOR)
+    assert not out.startswith("Lorem ipsum dolor sit amet consectetur adipiscing elit. Lorem")
+
+
+def test_windows_end_on_word_boundaries():
+    text = FILLER + "Jane Doe is the CEO of Acme. " + FILLER
+    out = compact_text(text, "Acme", "CEO", budget_tokens=40, window_chars=40)
+    for passage in out.split(SEPARATOR):
+        words = passage.split()
+        assert all(w in text.split() for w in (words[0], words[-1]))
+
+
+def test_text_without_mentions_is_truncated_to_the_budget():
+    assert compact_text(FILLER, "Acme", "CEO", budget_tokens=10) == FILLER[:40]
+
+
+def test_disabled_compaction_returns_the_text(monkeypatch):
+    monkeypatch.setattr(text_compaction, "COMPACTION_ENABLED", False)
+    assert compact_text(FILLER, "Acme", "CEO", budget_tokens=10) == FILLER